@@ -1,17 +1,24 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import PDFSearchTool
 from crewai_tools import FileReadTool
 
+from automated_business_to_business_sales_podcast_crew_orchestration.tools.custom_tool import PDFCorpusSearchTool
+
 @CrewBase
 class AutomatedBusinessToBusinessSalesPodcastCrewOrchestrationCrew():
     """AutomatedBusinessToBusinessSalesPodcastCrewOrchestration crew"""
 
+    def pdf_search_tool(self) -> PDFCorpusSearchTool:
+        # One instance for the agent and its task, so the index is opened once per run
+        if getattr(self, '_pdf_search_tool', None) is None:
+            self._pdf_search_tool = PDFCorpusSearchTool()
+        return self._pdf_search_tool
+
     @agent
     def content_curator(self) -> Agent:
         return Agent(
             config=self.agents_config['content_curator'],
-            tools=[PDFSearchTool(), FileReadTool()],
+            tools=[self.pdf_search_tool(), FileReadTool()],
         )
 
     @agent
@@ -40,7 +47,7 @@ class AutomatedBusinessToBusinessSalesPodcastCrewOrchestrationCrew():
     def content_identification_task(self) -> Task:
         return Task(
             config=self.tasks_config['content_identification_task'],
-            tools=[PDFSearchTool(), FileReadTool()],
+            tools=[self.pdf_search_tool(), FileReadTool()],
         )
 
     @task
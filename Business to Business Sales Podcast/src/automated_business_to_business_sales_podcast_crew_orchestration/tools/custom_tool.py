@@ -1,7 +1,11 @@
+import os
+from typing import Any, Optional, Type
+
 from crewai.tools import BaseTool
-from typing import Type
 from pydantic import BaseModel, Field
 
+from .vector_index import VectorIndex
+
 
 class MyCustomToolInput(BaseModel):
     """Input schema for MyCustomTool."""
@@ -17,3 +21,35 @@ class MyCustomTool(BaseTool):
     def _run(self, argument: str) -> str:
         # Implementation goes here
         return "this is an example of a tool output, ignore it and move along."
+
+
+class PDFCorpusSearchToolInput(BaseModel):
+    """Input schema for PDFCorpusSearchTool."""
+    query: str = Field(..., description="What to look for in the books.")
+    pdf: Optional[str] = Field(default=None, description="Path to a PDF to add to the corpus and search; omit to search every indexed book.")
+
+
+class PDFCorpusSearchTool(BaseTool):
+    name: str = "Search PDF corpus"
+    description: str = (
+        "Semantic search over the indexed B2B sales books. Returns the most relevant passages with their source and page. "
+        "Pass a PDF path to index that book first and search only it."
+    )
+    args_schema: Type[BaseModel] = PDFCorpusSearchToolInput
+    top_k: int = Field(default=5, description="Passages returned per query.")
+    index: Any = Field(default=None, exclude=True, description="Shared VectorIndex; built on first use when not given.")
+
+    def _run(self, query: str, pdf: Optional[str] = None) -> str:
+        try:
+            if self.index is None:
+                self.index = VectorIndex()
+            keys = [self.index.add_document(pdf)] if pdf else None
+            results = self.index.search(query, top_k=self.top_k, keys=keys)
+            if not results:
+                return "No indexed passages found. Pass a PDF path to index a book first."
+            return "\n\n".join(
+                f"[{os.path.basename(result.source)}, page {result.page}, score {result.score:.2f}]\n{result.text}"
+                for result in results
+            )
+        except Exception as e:
+            return f"Error searching PDF corpus: {str(e)}"
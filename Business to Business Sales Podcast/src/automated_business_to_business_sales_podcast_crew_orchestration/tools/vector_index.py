@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import NamedTuple, Optional, Protocol
+
+import numpy as np
+from PyPDF2 import PdfReader
+
+INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'data', 'pdf_index')
+
+CHUNK_CHARS = 1500
+CHUNK_OVERLAP = 200
+EMBED_BATCH_SIZE = 64
+HASHING_DIM = 512
+
+
+class Embedder(Protocol):
+    # Identifies the model; indexes built by different embedders are kept apart
+    id: str
+    dim: int
+
+    def embed(self, texts: list[str]) -> np.ndarray: ...
+
+
+class HashingEmbedder:
+    """Local, deterministic stand-in for an embedding model.
+
+    Hashes word unigrams and bigrams into a fixed number of signed buckets and
+    L2-normalizes the result. Much weaker than a real model, but it needs no
+    network or API key, so the crew and its index run offline.
+    """
+
+    def __init__(self, dim: int = HASHING_DIM):
+        self.dim = dim
+        self.id = f"hashing-{dim}"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"[a-z0-9']+", text.lower())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], 'little') % self.dim
+                vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+        return _normalize(vectors)
+
+
+class OpenAIEmbedder:
+    """OpenAI embeddings, requested in batches of up to EMBED_BATCH_SIZE texts."""
+
+    def __init__(self, model: str = "text-embedding-3-small", dim: int = 1536):
+        # Only imported when a real model is used; the local stand-in needs none of it
+        from openai import OpenAI
+
+        self.client = OpenAI()
+        self.model = model
+        self.dim = dim
+        self.id = f"openai-{model}"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        response = self.client.embeddings.create(model=self.model, input=texts)
+        return _normalize(np.array([item.embedding for item in response.data], dtype=np.float32))
+
+
+def default_embedder() -> Embedder:
+    """OpenAI when an API key is configured, the local hashing embedder otherwise."""
+    if os.getenv("OPENAI_API_KEY") and os.getenv("PDF_INDEX_EMBEDDER", "openai") != "local":
+        return OpenAIEmbedder()
+    return HashingEmbedder()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _partial_path(path: str) -> str:
+    # Unique per process and thread, so concurrent writers never share a temporary file
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.part"
+
+
+def file_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def pdf_chunks(path: str, chunk_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> list[dict]:
+    """Split a PDF into overlapping text chunks, each tagged with the page it starts on."""
+    chunks = []
+    for page_number, page in enumerate(PdfReader(path).pages, start=1):
+        text = " ".join((page.extract_text() or "").split())
+        for start in range(0, len(text), chunk_chars - overlap):
+            chunks.append({'page': page_number, 'text': text[start:start + chunk_chars]})
+            if start + chunk_chars >= len(text):
+                break
+    return chunks
+
+
+class SearchResult(NamedTuple):
+    score: float
+    source: str
+    page: int
+    text: str
+
+
+class VectorIndex:
+    """Persistent chunk embeddings for a corpus of PDFs, one memory-mapped array per document.
+
+    Each document is stored under `<root>/<sha256>-<embedder id>/` as an
+    `embeddings.f32` matrix plus the chunk texts, so a book is embedded once
+    and every later run, with any file name, maps the same vectors back in.
+    `index.json` lists the documents in the corpus; adding a book only
+    embeds that book. Searches reload it when it changed, so books another
+    run or process added since are searched too.
+    """
+
+    def __init__(self, root: str = INDEX_DIR, embedder: Optional[Embedder] = None):
+        self.root = root
+        self.embedder = embedder or default_embedder()
+        self._lock = threading.Lock()
+        self._manifest_mtime = self._stat_manifest()
+        self._documents = self._read_manifest()
+        self._matrices: dict[str, np.memmap] = {}
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, 'index.json')
+
+    def _stat_manifest(self) -> Optional[int]:
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                documents = json.load(f)
+        except FileNotFoundError:
+            return {}
+        return {key: doc for key, doc in documents.items() if doc['embedder'] == self.embedder.id}
+
+    def _write_manifest(self) -> None:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                documents = json.load(f)
+        except FileNotFoundError:
+            documents = {}
+        documents.update(self._documents)
+        partial_path = _partial_path(self.manifest_path)
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                json.dump(documents, f, indent=2)
+            os.replace(partial_path, self.manifest_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        self._manifest_mtime = self._stat_manifest()
+
+    def _refresh(self) -> None:
+        """Pick up documents other writers added since the manifest was last read."""
+        with self._lock:
+            mtime = self._stat_manifest()
+            if mtime != self._manifest_mtime:
+                self._manifest_mtime = mtime
+                self._documents.update(self._read_manifest())
+
+    def add_document(self, path: str) -> str:
+        """Index `path` unless a file with the same content is already in the corpus; return its key."""
+        key = f"{file_sha256(path)}-{self.embedder.id}"
+        with self._lock:
+            if key not in self._documents:
+                # Another run may have indexed it since this one started
+                self._documents.update(self._read_manifest())
+            if key in self._documents and os.path.exists(os.path.join(self.root, key, 'embeddings.f32')):
+                return key
+            chunks = pdf_chunks(path)
+            directory = os.path.join(self.root, key)
+            os.makedirs(directory, exist_ok=True)
+            # Chunk texts plus the byte offset of each line, so a hit is read without scanning the file
+            offsets = []
+            with open(os.path.join(directory, 'chunks.jsonl'), 'wb') as f:
+                for chunk in chunks:
+                    offsets.append(f.tell())
+                    f.write(json.dumps(chunk, ensure_ascii=False).encode('utf-8') + b"\n")
+            np.array(offsets, dtype='<u8').tofile(os.path.join(directory, 'chunks.idx'))
+
+            # Embed in batches straight into the on-disk matrix
+            matrix_path = os.path.join(directory, 'embeddings.f32')
+            partial_path = _partial_path(matrix_path)
+            try:
+                if chunks:
+                    matrix = np.memmap(partial_path, dtype=np.float32, mode='w+', shape=(len(chunks), self.embedder.dim))
+                    for start in range(0, len(chunks), EMBED_BATCH_SIZE):
+                        batch = [chunk['text'] for chunk in chunks[start:start + EMBED_BATCH_SIZE]]
+                        matrix[start:start + len(batch)] = self.embedder.embed(batch)
+                    matrix.flush()
+                    del matrix
+                else:
+                    open(partial_path, 'wb').close()
+                os.replace(partial_path, matrix_path)
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+
+            self._documents[key] = {
+                'source': os.path.abspath(path),
+                'embedder': self.embedder.id,
+                'dim': self.embedder.dim,
+                'chunks': len(chunks),
+            }
+            self._write_manifest()
+            return key
+
+    def _matrix(self, key: str) -> np.ndarray:
+        if key not in self._matrices:
+            doc = self._documents[key]
+            self._matrices[key] = np.memmap(
+                os.path.join(self.root, key, 'embeddings.f32'), dtype=np.float32, mode='r', shape=(doc['chunks'], doc['dim'])
+            )
+        return self._matrices[key]
+
+    def _chunk(self, key: str, row: int) -> dict:
+        directory = os.path.join(self.root, key)
+        offset = np.fromfile(os.path.join(directory, 'chunks.idx'), dtype='<u8', count=1, offset=8 * row)[0]
+        with open(os.path.join(directory, 'chunks.jsonl'), 'rb') as f:
+            f.seek(int(offset))
+            return json.loads(f.readline())
+
+    def search(self, query: str, top_k: int = 5, keys: Optional[list[str]] = None) -> list[SearchResult]:
+        """Return the `top_k` chunks most similar to `query`, across the corpus or only `keys`."""
+        self._refresh()
+        query_vector = self.embedder.embed([query])[0]
+        candidates = []
+        for key in keys or list(self._documents):
+            if not self._documents[key]['chunks']:
+                continue
+            scores = self._matrix(key) @ query_vector
+            best = np.argpartition(-scores, min(top_k, len(scores)) - 1)[:top_k]
+            candidates.extend((float(scores[row]), key, int(row)) for row in best)
+        candidates.sort(reverse=True)
+
+        results = []
+        for score, key, row in candidates[:top_k]:
+            chunk = self._chunk(key, row)
+            results.append(SearchResult(score, self._documents[key]['source'], chunk['page'], chunk['text']))
+        return results
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""Compare one episode through the agent crew and through the direct pipeline.
+
+Usage: python benchmarks/fast_path.py <pdf_url> [crew|direct ...]
+
+Reports wall time, LLM tokens and LLM requests per episode for each mode.
+Both modes call the configured LLM, HeyGen and YouTube, so run it with the
+same credentials (or stand-in endpoints) for both.
+"""
+import sys
+import time
+
+import common  # noqa: F401  (puts src/ on sys.path)
+
+from youtube.crew import Youtube
+from youtube.pipeline import run_direct
+
+MODES = ('crew', 'direct')
+
+
+def run_crew(inputs):
+    result = Youtube().crew().kickoff(inputs=inputs)
+    return result.token_usage.model_dump()
+
+
+def run_fast(inputs):
+    result = run_direct(inputs, describe=Youtube().describe_episode, log=lambda message: None)
+    return result['token_usage'] or {}
+
+
+def main(pdf_url, modes):
+    inputs = {'pdf_url': pdf_url}
+    rows = []
+    for mode in modes:
+        started = time.perf_counter()
+        usage = (run_crew if mode == 'crew' else run_fast)(inputs)
+        rows.append((mode, time.perf_counter() - started, usage.get('total_tokens', 0), usage.get('successful_requests', 0)))
+
+    print(f"{'mode':<8} {'wall s':>8} {'tokens':>8} {'LLM calls':>10}")
+    for mode, elapsed, tokens, calls in rows:
+        print(f"{mode:<8} {elapsed:>8.1f} {tokens:>8} {calls:>10}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__)
+    main(sys.argv[1], [mode for mode in sys.argv[2:] if mode in MODES] or list(MODES))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Benchmark cold-start import time of every console script and the main modules.
+
+Usage: python benchmarks/import_time.py [--runs N] [--top N] [module ...]
+
+Each target is imported in a fresh interpreter with `-X importtime`; the
+reported time is the median cumulative import time over the runs. Console
+scripts are read from pyproject.toml, so every entry point is covered,
+and the heaviest imports under each are listed to show what to defer.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['youtube.main', 'youtube.crew', 'youtube.tools', 'youtube.pipeline', 'youtube.jobs']
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def entry_points() -> dict[str, str]:
+    """Map each [project.scripts] name to the `module:function` it runs."""
+    scripts, in_section = {}, False
+    with open(os.path.join(ROOT, 'pyproject.toml'), 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('['):
+                in_section = line == '[project.scripts]'
+            elif in_section and '=' in line:
+                name, target = (part.strip().strip('"') for part in line.split('=', 1))
+                scripts[name] = target
+    return scripts
+
+
+def import_profile(statement: str) -> list[tuple[str, int, int]]:
+    """Run `statement` in a fresh interpreter; return (module, depth, cumulative us) per import."""
+    env = {**os.environ, 'PYTHONPATH': os.path.join(ROOT, 'src')}
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    profile = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            profile.append((match.group(4), len(match.group(3)) // 2, int(match.group(2))))
+    return profile
+
+
+def measure(statement: str, runs: int, startup: frozenset = frozenset()) -> tuple[float, list[tuple[str, int]]]:
+    """Median total import time in ms, plus the heaviest imports of the last run not in `startup`."""
+    totals = []
+    for _ in range(runs):
+        profile = import_profile(statement)
+        totals.append(sum(cumulative for _, depth, cumulative in profile if depth == 0) / 1000)
+    heaviest = sorted(
+        ((module, cumulative) for module, depth, cumulative in profile if depth <= 1 and module not in startup),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return statistics.median(totals), heaviest
+
+
+def main(modules, runs: int, top: int):
+    targets = {}
+    for name, target in entry_points().items():
+        module, _, function = target.partition(':')
+        targets[f"{name} ({target})"] = f"from {module} import {function}"
+    for module in modules:
+        targets[module] = f"import {module}"
+
+    # The interpreter's own startup imports, subtracted from every target
+    baseline, _ = measure('pass', runs)
+    startup = frozenset(module for module, _, _ in import_profile('pass'))
+    print(f"{'target':<40} {'import ms':>10}")
+    for label, statement in targets.items():
+        total, heaviest = measure(statement, runs, startup)
+        print(f"{label:<40} {max(total - baseline, 0.0):>10.1f}")
+        for module, cumulative in heaviest[:top]:
+            if not module.startswith('youtube') and cumulative >= 1000:
+                print(f"  {module:<38} {cumulative / 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="heaviest third-party imports listed per target")
+    args = parser.parse_args()
+    main(args.modules, args.runs, args.top)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""Benchmark NearDuplicateIndex queries against corpus size.
+
+Usage: python benchmarks/near_duplicates.py [--queries N] [items ...]
+
+Each corpus holds `items` random page-sized signatures (200 pages stand
+for one book). Half the queries are near-duplicates of an indexed text
+(4 of 400 words changed), half match nothing. An LSH query should cost
+about the same at every size; a linear scan would grow with the corpus.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import common  # noqa: F401  (puts src/ on sys.path)
+import numpy as np
+
+from youtube.tools.near_duplicates import NUM_PERM, PAGE, NearDuplicateIndex, minhash
+
+DEFAULT_SIZES = [2_000, 20_000, 200_000]
+VOCABULARY = [f"term{i}" for i in range(20_000)]
+
+
+def random_page(rnd: random.Random, words: int = 400) -> str:
+    return " ".join(rnd.choice(VOCABULARY) for _ in range(words))
+
+
+def main(sizes, queries: int):
+    rnd = random.Random(0)
+    rng = np.random.default_rng(0)
+    # Real texts to find again; the rest of the corpus is random signatures, which index the same way
+    originals = [random_page(rnd) for _ in range(queries // 2)]
+    edited = []
+    for page in originals:
+        words = page.split()
+        for i in rnd.sample(range(len(words)), 4):
+            words[i] = rnd.choice(VOCABULARY)
+        edited.append(" ".join(words))
+    probes = [minhash(text) for text in edited] + [minhash(random_page(rnd)) for _ in range(queries - len(edited))]
+
+    print(f"{'items':>8} {'books':>6} {'build s':>8} {'query ms':>9} {'found':>6} {'false':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            index = NearDuplicateIndex(os.path.join(directory, f"index-{size}.sqlite3"))
+            started = time.perf_counter()
+            index.add_many(PAGE, [(f"original-{i}", 1, minhash(text)) for i, text in enumerate(originals)])
+            filler = rng.integers(0, 2**32, size=(size - len(originals), NUM_PERM), dtype=np.uint32)
+            for start in range(0, len(filler), 10_000):
+                index.add_many(PAGE, [(f"book-{start + i}", 1, row) for i, row in enumerate(filler[start:start + 10_000])])
+            build = time.perf_counter() - started
+
+            started = time.perf_counter()
+            results = [index.query(PAGE, probe) for probe in probes]
+            query_ms = (time.perf_counter() - started) / len(probes) * 1000
+            found = sum(1 for matches in results[:len(edited)] if matches)
+            false = sum(1 for matches in results[len(edited):] if matches)
+            print(f"{size:>8} {size // 200:>6} {build:>8.1f} {query_ms:>9.3f} {found:>6} {false:>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("items", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    main(args.items, args.queries)
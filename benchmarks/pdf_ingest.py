@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Benchmark PDFParserTool ingest: wall time and peak memory against PDF size.
+
+Usage: python benchmarks/pdf_ingest.py [--workers N] [pages ...]
+
+"heap MB" is the Python heap high-water mark reported by tracemalloc,
+which is what grows if the download is buffered instead of streamed.
+"RSS MB" and "workers MB" are the resident set high-water marks of this
+process and of its largest extraction worker (ru_maxrss). They only ever
+rise, so run sizes in ascending order to read them per size.
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import make_pdf, serve_directory
+
+from youtube.tools.custom_tool import PDFParserTool
+
+DEFAULT_SIZES = [50, 200, 800]
+
+
+def max_rss_mb(who: int) -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / 2**20 if sys.platform == 'darwin' else rss / 2**10
+
+
+def main(sizes, workers=None):
+    with tempfile.TemporaryDirectory() as directory, serve_directory(directory) as base_url:
+        # A throwaway cache so every size is really downloaded and parsed
+        tool = PDFParserTool(workers=workers, cache_dir=os.path.join(directory, 'cache'))
+        print(f"{'pages':>6} {'size MB':>8} {'wall s':>8} {'heap MB':>8} {'RSS MB':>8} {'workers MB':>10}")
+        for pages in sizes:
+            name = f"bench_{pages}.pdf"
+            payload = make_pdf(pages)
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(payload)
+            size_mb = len(payload) / 2**20
+            del payload
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            result = tool._run(f"{base_url}/{name}")
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            if result.startswith("Error"):
+                raise SystemExit(result)
+            print(
+                f"{pages:>6} {size_mb:>8.1f} {elapsed:>8.2f} {peak / 2**20:>8.1f} "
+                f"{max_rss_mb(resource.RUSAGE_SELF):>8.1f} {max_rss_mb(resource.RUSAGE_CHILDREN):>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--workers", type=int, default=None, help="extraction processes (1 = serial)")
+    args = parser.parse_args()
+    main(args.pages, workers=args.workers)
@@ -0,0 +1,306 @@
+"""Local stand-ins for the external services the pipeline talks to.
+
+Each stub is a ThreadingHTTPServer on an ephemeral localhost port that
+implements just enough of the real protocol for the tools to run against
+it, with configurable latency and failure rates.
+"""
+import hashlib
+import hmac
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from urllib.request import Request, urlopen
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def handle_error(self, request, client_address):
+        # Clients drop keep-alive connections after a failed response; that is expected here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            return self.random.random() < self.failure_rate
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def begin(self, inject_failures: bool = True) -> bool:
+        """Apply latency and injected failures; False means a 503 was already sent."""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.should_fail() and inject_failures:
+            self.send_json(503, {'error': 'injected failure'})
+            return False
+        return True
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def send_json(self, status: int, payload, headers: dict = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_empty(self, status: int, headers: dict = None):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+
+    def send_bytes(self, payload: bytes, content_type: str, headers: dict = None):
+        """Send `payload`, honouring a single `Range: bytes=N-` request like a CDN would."""
+        match = re.match(r'bytes=(\d+)-', self.headers.get('Range', ''))
+        start = int(match.group(1)) if match else 0
+        if start >= len(payload) and payload:
+            self.send_empty(416, {'Content-Range': f"bytes */{len(payload)}"})
+            return
+        self.send_response(206 if match else 200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload) - start))
+        self.send_header('Accept-Ranges', 'bytes')
+        if match:
+            self.send_header('Content-Range', f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload[start:])
+
+
+class PDFHostHandler(StubHandler):
+    """A static host for PDFs with ETag/Last-Modified validators and 304 revalidation."""
+
+    def do_GET(self):
+        if not self.begin():
+            return
+        payload = self.server.files.get(urlparse(self.path).path)
+        if payload is None:
+            self.send_json(404, {'error': 'not found'})
+            return
+        etag = '"%s"' % hashlib.sha256(payload).hexdigest()[:16]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_empty(304, {'ETag': etag})
+            return
+        self.send_bytes(payload, 'application/pdf', {'ETag': etag, 'Last-Modified': self.server.last_modified})
+
+
+class HeyGenHandler(StubHandler):
+    """HeyGen v2 generate, v1 status and asset/podcast uploads; renders finish after `render_seconds`.
+
+    Failures are only injected into status checks and asset downloads: a
+    submit is not idempotent, so the tools do not retry it. With
+    `server.webhook_url` set, each finished render is also announced by a
+    signed `avatar_video.success` callback, of which a `callback_loss`
+    fraction is dropped.
+    """
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self.read_body()
+        self.begin(inject_failures=False)
+        if url.path == '/v2/video/generate':
+            video_id = uuid.uuid4().hex
+            self.server.renders[video_id] = {'started': time.monotonic(), 'payload': json.loads(body or b'{}')}
+            if self.server.webhook_url:
+                timer = threading.Timer(self.server.render_seconds, self.server.send_callback, (video_id,))
+                timer.daemon = True
+                timer.start()
+            self.send_json(200, {'error': None, 'data': {'video_id': video_id}})
+        elif url.path == '/v1/asset':
+            self.send_json(200, {'code': 100, 'data': {'id': uuid.uuid4().hex, 'url': f'stub://{len(body)}'}})
+        elif url.path == '/v1/podcast/submit':
+            self.send_json(200, {'code': 100, 'data': {'task_id': uuid.uuid4().hex}})
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not self.begin():
+            return
+        if url.path == '/v1/video_status.get':
+            video_id = parse_qs(url.query).get('video_id', [''])[0]
+            render = self.server.renders.get(video_id)
+            if render is None:
+                self.send_json(404, {'code': 400, 'message': 'unknown video_id'})
+            elif time.monotonic() - render['started'] < self.server.render_seconds:
+                self.send_json(200, {'code': 100, 'data': {'id': video_id, 'status': 'processing'}})
+            else:
+                self.send_json(200, {'code': 100, 'data': {
+                    'id': video_id,
+                    'status': 'completed',
+                    'video_url': f"{self.server.base_url}/assets/{video_id}.mp4",
+                    'thumbnail_url': f"{self.server.base_url}/assets/{video_id}.jpg",
+                }})
+        elif url.path.startswith('/assets/'):
+            name = url.path.rsplit('/', 1)[-1]
+            video_id, _, extension = name.partition('.')
+            if video_id not in self.server.renders:
+                self.send_json(404, {'error': 'not found'})
+            elif extension == 'mp4':
+                self.send_bytes(self.server.video_bytes, 'video/mp4')
+            else:
+                self.send_bytes(self.server.thumbnail_bytes, 'image/jpeg')
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+
+class YouTubeUploadHandler(StubHandler):
+    """YouTube Data API resumable upload: session start, chunked PUTs, status queries, thumbnails."""
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self.read_body()
+        if not self.begin():
+            return
+        if url.path == '/videos':
+            session_id = uuid.uuid4().hex
+            self.server.sessions[session_id] = {
+                'total': int(self.headers['X-Upload-Content-Length']),
+                'data': bytearray(),
+                'metadata': json.loads(body or b'{}'),
+            }
+            self.send_json(200, {}, {'Location': f"{self.server.base_url}/sessions/{session_id}"})
+        elif url.path == '/thumbnails/set':
+            video_id = parse_qs(url.query)['videoId'][0]
+            self.server.thumbnails[video_id] = body
+            self.send_json(200, {'items': [{'default': {'url': f'stub://{video_id}.jpg'}}]})
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def do_PUT(self):
+        session_id = urlparse(self.path).path.rsplit('/', 1)[-1]
+        body = self.read_body()
+        session = self.server.sessions.get(session_id)
+        if session is None:
+            self.send_json(404, {'error': 'session expired'})
+            return
+        if not self.begin():
+            return
+        content_range = self.headers.get('Content-Range', '')
+        match = re.match(r'bytes (\d+)-(\d+)/(\d+)', content_range)
+        if match:
+            start = int(match.group(1))
+            # Accept only contiguous data, like the real endpoint
+            if start == len(session['data']):
+                session['data'] += body
+        if len(session['data']) >= session['total']:
+            video_id = session.setdefault('video_id', uuid.uuid4().hex[:11])
+            self.server.videos[video_id] = bytes(session['data'])
+            self.send_json(200, {'id': video_id, 'snippet': session['metadata'].get('snippet', {})})
+        elif session['data']:
+            self.send_empty(308, {'Range': f"bytes=0-{len(session['data']) - 1}"})
+        else:
+            self.send_empty(308)
+
+
+@contextmanager
+def running(server: StubServer):
+    """Serve `server` on a daemon thread for the duration of the block."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def pdf_host_stub(files: dict, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+    """Serve `files` ({'/name.pdf': bytes}) with validators; fetch from `server.base_url + name`."""
+    server = StubServer(PDFHostHandler, latency=latency, failure_rate=failure_rate, seed=seed)
+    server.files = dict(files)
+    server.last_modified = formatdate(usegmt=True)
+    with running(server):
+        yield server
+
+
+@contextmanager
+def heygen_stub(
+    render_seconds: float = 0.5,
+    video_bytes: int = 2 * 2**20,
+    latency: float = 0.0,
+    failure_rate: float = 0.0,
+    seed: int = 0,
+    webhook_url: str = None,
+    webhook_secret: str = '',
+    callback_loss: float = 0.0,
+):
+    """Run a HeyGen stand-in; point the HeyGen tools' api_base_url/upload_base_url at `server.base_url`.
+
+    `webhook_url`, `webhook_secret` and `callback_loss` can also be changed on the running server.
+    """
+    server = StubServer(HeyGenHandler, latency=latency, failure_rate=failure_rate, seed=seed)
+    server.renders = {}
+    server.render_seconds = render_seconds
+    server.video_bytes = random.Random(seed).randbytes(video_bytes)
+    server.thumbnail_bytes = b'\xff\xd8\xff\xe0' + bytes(1020)
+    server.webhook_url, server.webhook_secret = webhook_url, webhook_secret
+    server.callback_loss = callback_loss
+    server.callbacks_sent = 0
+    loss_random = random.Random(seed)
+
+    def send_callback(video_id):
+        """POST a success event for `video_id`, signed like HeyGen signs them."""
+        if loss_random.random() < server.callback_loss or not server.webhook_url:
+            return
+        body = json.dumps({'event_type': 'avatar_video.success', 'event_data': {
+            'video_id': video_id,
+            'url': f"{server.base_url}/assets/{video_id}.mp4",
+            'callback_id': None,
+        }}).encode('utf-8')
+        signature = hmac.new(server.webhook_secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+        request = Request(server.webhook_url, data=body, headers={'Content-Type': 'application/json', 'Signature': signature})
+        try:
+            urlopen(request, timeout=5).close()
+            server.callbacks_sent += 1
+        except OSError:
+            # Like the real service, a receiver that is down just misses the event
+            pass
+
+    server.send_callback = send_callback
+    with running(server):
+        yield server
+
+
+@contextmanager
+def youtube_stub(latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+    """Run a YouTube upload stand-in; point YouTubeUploaderTool.upload_base_url at `server.base_url`."""
+    server = StubServer(YouTubeUploadHandler, latency=latency, failure_rate=failure_rate, seed=seed)
+    server.sessions, server.videos, server.thumbnails = {}, {}, {}
+    with running(server):
+        yield server
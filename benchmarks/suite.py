@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+"""Offline benchmark suite for the ingest -> summarize -> render -> download -> upload path.
+
+Usage: python benchmarks/suite.py [-k NAME] [--rounds N] [--json OUT] [--compare BASELINE] [--threshold 0.1]
+
+Every benchmark runs against the local stand-ins in stub_servers.py, so the
+suite needs no API keys or network and is repeatable: HeyGen renders take a
+fixed `--render-seconds`, LLM calls `--llm-seconds`, and all stubs add the
+same `--latency` and `--failure-rate`. Each benchmark reports min/mean/max wall time over its
+rounds, throughput in its own unit, and the Python heap peak (tracemalloc) of one extra
+round. `--json` saves the results; `--compare` checks them against a saved
+run and exits non-zero if any mean got slower by more than `--threshold`.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from common import make_pdf
+from stub_servers import heygen_stub, pdf_host_stub, youtube_stub
+
+# Measure the tools, not the memoization layer in front of them
+os.environ['YOUTUBE_TOOL_CACHE'] = '0'
+
+from youtube.pipeline import run_direct, run_streaming  # noqa: E402
+from youtube.stages import PipelineStages  # noqa: E402
+from youtube.tools.custom_tool import (  # noqa: E402
+    HeyGenVideoGeneratorTool,
+    PDFParserTool,
+    ScriptSummarizerTool,
+    YouTubeUploaderTool,
+)
+from youtube.tools.heygen_poller import configure_poller, get_poller  # noqa: E402
+from youtube.tools.heygen_webhook import WebhookReceiver  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(unit: str):
+    """Register `fn(env) -> (items, stage_timings)` as a benchmark measured in `unit`/s."""
+    def register(fn):
+        BENCHMARKS[fn.__name__] = (fn, unit)
+        return fn
+    return register
+
+
+def _remove(*paths):
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+@benchmark('pages')
+def pdf_ingest_cold(env):
+    """Download and extract a PDF into an empty artifact cache."""
+    tool = env.cold_parser()
+    tool.extract(env.pdf_url)
+    return env.args.pages, {}
+
+
+@benchmark('pages')
+def pdf_ingest_warm(env):
+    """Ingest a PDF the artifact cache already holds."""
+    env.warm_parser.extract(env.pdf_url)
+    return env.args.pages, {}
+
+
+@benchmark('pages')
+def summarize(env):
+    """Map-reduce a parsed book into an episode script with a fixed-latency LLM stand-in."""
+    env.summarizer.write_script(env.warm_text_path)
+    return env.args.pages, {}
+
+
+@benchmark('segments')
+def heygen_render(env):
+    """Submit, poll and download concurrent segment renders, with an empty render cache."""
+    tool = env.video_generator.model_copy(update={'render_cache_dir': tempfile.mkdtemp(dir=env.workdir)})
+    segments = [f"Segment {index}. " + "Qualify early. " * 20 for index in range(env.args.segments)]
+    with ThreadPoolExecutor(max_workers=tool.max_concurrency) as pool:
+        results = list(pool.map(tool._render_segment, range(len(segments)), segments))
+    for result in results:
+        if isinstance(result, str):
+            raise RuntimeError(result)
+        _remove(result['data']['local_video_path'], result['data']['local_thumbnail_path'])
+    return len(segments), {}
+
+
+@benchmark('segments')
+def heygen_render_webhook(env):
+    """heygen_render with signed completion callbacks from the stub; status polls only run as a safety net."""
+    poller = get_poller(f"{env.heygen.base_url}/v1/video_status.get")
+    receiver = WebhookReceiver(poller, secret='bench-secret').start()
+    env.heygen.webhook_url, env.heygen.webhook_secret = receiver.url, receiver.secret
+    try:
+        return heygen_render(env)
+    finally:
+        env.heygen.webhook_url = None
+        receiver.close()
+
+
+@benchmark('MB')
+def youtube_upload(env):
+    """Resumable chunked upload of a video plus its thumbnail."""
+    env.uploader.upload(env.video_path, title='Benchmark', description='', tags=[], thumbnail_path=env.thumbnail_path)
+    return os.path.getsize(env.video_path) / 2**20, {}
+
+
+@benchmark('episodes')
+def direct_pipeline(env):
+    """One single-segment episode through every stage of run_direct, without the metadata step."""
+    stages = PipelineStages(
+        pdf_parser=env.cold_parser(),
+        summarizer=env.summarizer,
+        video_generator=env.video_generator.model_copy(
+            update={'max_script_chars': 4000, 'render_cache_dir': tempfile.mkdtemp(dir=env.workdir)}
+        ),
+        uploader=env.uploader,
+    )
+    result = run_direct({'pdf_url': env.pdf_url, 'title': 'Benchmark'}, log=lambda message: None, stages=stages.as_dict())
+    for segment in result['segments']:
+        _remove(segment['local_video_path'], segment['local_thumbnail_path'])
+    return 1, result['timings']
+
+
+class StubVideoStages(PipelineStages):
+    """Stub renders are random bytes, not MP4s ffmpeg could join, so the first segment stands in for the episode."""
+
+    def assemble(self, job, save):
+        segments = job.state['segments']
+        return {**job.state, 'video_path': segments[0]['local_video_path'], 'thumbnail_path': segments[0]['local_thumbnail_path']}
+
+
+def _segmented_episode(env, run):
+    """An unsummarized episode of `--segments` segments cut from the book, with cold caches."""
+    segment_chars = 1000
+    stages = StubVideoStages(
+        pdf_parser=env.cold_parser(),
+        summarizer=env.summarizer,
+        video_generator=env.video_generator.model_copy(update={
+            'segment_chars': segment_chars,
+            'max_script_chars': env.args.segments * segment_chars,
+            'render_cache_dir': tempfile.mkdtemp(dir=env.workdir),
+        }),
+        uploader=env.uploader,
+    )
+    inputs = {'pdf_url': env.pdf_url, 'title': 'Benchmark', 'summarize': False}
+    if run is run_direct:
+        result = run_direct(inputs, log=lambda message: None, stages=stages.as_dict())
+    else:
+        result = run_streaming(inputs, log=lambda message: None, stages=stages)
+    for segment in result['segments']:
+        _remove(segment['local_video_path'], segment['local_thumbnail_path'])
+    return len(result['segments']), result['timings']
+
+
+@benchmark('segments')
+def direct_segments(env):
+    """A multi-segment episode through run_direct, one stage after another."""
+    return _segmented_episode(env, run_direct)
+
+
+@benchmark('segments')
+def streaming_segments(env):
+    """The same episode through run_streaming, with the stages overlapping."""
+    return _segmented_episode(env, run_streaming)
+
+
+class Environment:
+    """Stub servers, fixtures and preconfigured tools shared by all benchmarks."""
+
+    def __init__(self, args, workdir, pdf_host, heygen, youtube):
+        self.args = args
+        self.workdir = workdir
+        self.heygen = heygen
+        self.pdf_url = f"{pdf_host.base_url}/bench.pdf"
+        # Every path a tool writes lives under workdir, so a run leaves src/data untouched
+        self.index_path = os.path.join(workdir, 'near_duplicates.sqlite3')
+        self.warm_parser = PDFParserTool(cache_dir=os.path.join(workdir, 'warm-cache'), near_duplicate_index_path=self.index_path)
+        self.warm_text_path = self.warm_parser.extract(self.pdf_url)
+        self.summarizer = ScriptSummarizerTool(complete=self.complete)
+
+        # The production backoff starts at seconds; scale it to the stub's render time
+        status_url = f"{heygen.base_url}/v1/video_status.get"
+        configure_poller(status_url, initial_delay=args.render_seconds / 4, max_delay=args.render_seconds)
+        self.video_generator = HeyGenVideoGeneratorTool(
+            api_base_url=heygen.base_url,
+            poll_timeout=60,
+            output_dir=os.path.join(workdir, 'videos'),
+            render_cache_dir=os.path.join(workdir, 'renders'),
+            near_duplicate_index_path=self.index_path,
+        )
+
+        settings_path = os.path.join(workdir, 'youtube_settings.json')
+        with open(settings_path, 'w', encoding='utf-8') as f:
+            json.dump({'access_token': 'stub-token'}, f)
+        self.uploader = YouTubeUploaderTool(
+            upload_base_url=youtube.base_url,
+            settings_path=settings_path,
+            session_dir=os.path.join(workdir, 'uploads'),
+            chunk_size=2**20,
+        )
+        self.video_path = os.path.join(workdir, 'upload.mp4')
+        with open(self.video_path, 'wb') as f:
+            f.write(os.urandom(args.upload_mb * 2**20))
+        self.thumbnail_path = os.path.join(workdir, 'upload.jpg')
+        with open(self.thumbnail_path, 'wb') as f:
+            f.write(heygen.thumbnail_bytes)
+
+    def cold_parser(self) -> PDFParserTool:
+        """A parser with an empty artifact cache."""
+        return PDFParserTool(cache_dir=tempfile.mkdtemp(dir=self.workdir), near_duplicate_index_path=self.index_path)
+
+    def complete(self, prompt: str) -> str:
+        """LLM stand-in: waits like a model would and echoes the prompt's last 250 words."""
+        time.sleep(self.args.llm_seconds)
+        return " ".join(prompt.split()[-250:])
+
+
+def measure(fn, env, rounds: int) -> dict:
+    times, items, stage_times = [], 0, {}
+    for _ in range(rounds):
+        started = time.perf_counter()
+        items, stages = fn(env)
+        times.append(time.perf_counter() - started)
+        for stage, elapsed in stages.items():
+            stage_times.setdefault(stage, []).append(elapsed)
+
+    # Memory is measured on its own round; tracing would skew the timings above
+    tracemalloc.start()
+    fn(env)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mean = statistics.mean(times)
+    return {
+        'rounds': rounds,
+        'min': min(times),
+        'mean': mean,
+        'max': max(times),
+        'stddev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'throughput': items / mean if mean else 0.0,
+        'peak_mb': peak / 2**20,
+        'stages': {stage: statistics.mean(values) for stage, values in stage_times.items()},
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a line per benchmark whose mean regressed by more than `threshold`."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get('benchmarks', {}).get(name)
+        if not before or not before['mean']:
+            continue
+        change = result['mean'] / before['mean'] - 1
+        if change > threshold:
+            regressions.append(f"{name}: mean {before['mean']:.3f}s -> {result['mean']:.3f}s (+{change:.0%})")
+    return regressions
+
+
+def print_table(results: dict):
+    print(f"{'benchmark':<22} {'min s':>8} {'mean s':>8} {'max s':>8} {'throughput':>16} {'heap MB':>8}")
+    for name, result in results.items():
+        unit = BENCHMARKS[name][1]
+        throughput = f"{result['throughput']:.1f} {unit}/s"
+        print(
+            f"{name:<22} {result['min']:>8.3f} {result['mean']:>8.3f} {result['max']:>8.3f} "
+            f"{throughput:>16} {result['peak_mb']:>8.1f}"
+        )
+        for stage, elapsed in result['stages'].items():
+            print(f"  {stage:<20} {elapsed:>17.3f}")
+
+
+def main(args) -> int:
+    selected = [name for name in BENCHMARKS if not args.k or args.k in name]
+    stub_options = {'latency': args.latency, 'failure_rate': args.failure_rate, 'seed': args.seed}
+    with tempfile.TemporaryDirectory() as workdir, \
+            pdf_host_stub({'/bench.pdf': make_pdf(args.pages)}, **stub_options) as pdf_host, \
+            heygen_stub(render_seconds=args.render_seconds, video_bytes=args.video_mb * 2**20, **stub_options) as heygen, \
+            youtube_stub(**stub_options) as youtube:
+        env = Environment(args, workdir, pdf_host, heygen, youtube)
+        results = {name: measure(BENCHMARKS[name][0], env, args.rounds) for name in selected}
+
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'benchmarks': results}, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results file from an earlier --json run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown of the mean (0.10 = 10%%)")
+    parser.add_argument("--pages", type=int, default=200, help="pages in the benchmark PDF")
+    parser.add_argument("--segments", type=int, default=8, help="concurrent renders in heygen_render")
+    parser.add_argument("--render-seconds", type=float, default=0.5, help="time a stub render takes")
+    parser.add_argument("--llm-seconds", type=float, default=0.2, help="time a stub LLM call takes")
+    parser.add_argument("--video-mb", type=int, default=2, help="size of each rendered segment")
+    parser.add_argument("--upload-mb", type=int, default=16, help="size of the uploaded video")
+    parser.add_argument("--latency", type=float, default=0.0, help="added per stub request, in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of stub requests answered 503")
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(main(parser.parse_args()))
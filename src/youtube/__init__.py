@@ -0,0 +1,16 @@
+import importlib
+
+# The crew is imported on first use: crewai takes seconds to load and only
+# the commands that build a crew need it.
+_LAZY_ATTRS = {
+    "Youtube": ".crew",
+    "EpisodeMetadata": ".crew",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, Optional
+
+# Crews run side by side by default; each one spends most of its time
+# waiting on the LLM, HeyGen and downloads rather than on local CPU
+DEFAULT_MAX_PARALLEL = 4
+
+
+def read_manifest(manifest_path: str) -> Iterator[dict]:
+    """Yield crew inputs from a manifest of PDF URLs.
+
+    Each non-blank line is either a bare URL or a JSON object with at least
+    a `pdf_url` key (any other keys are passed to the crew as extra inputs).
+    Lines starting with `#` are comments.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as manifest:
+        for number, line in enumerate(manifest, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                inputs = json.loads(line)
+                if 'pdf_url' not in inputs:
+                    raise ValueError(f"{manifest_path}:{number}: JSON entry has no 'pdf_url'")
+            else:
+                inputs = {'pdf_url': line}
+            yield inputs
+
+
+class ResultsWriter:
+    """Appends one JSON line per finished item and flushes it straight away."""
+
+    def __init__(self, results_path: str):
+        self._file = open(results_path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def write(self, record: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def run_batch(
+    items: list[dict],
+    run_item: Callable[[dict], object],
+    results_path: str,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+    on_result: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Run `run_item` over every item with at most `max_parallel` in flight.
+
+    A result record (inputs, status, output or error, duration) is appended to
+    `results_path` as soon as each item finishes, so a long batch can be
+    followed, and partially salvaged, while it is still running. One item
+    failing does not stop the others. Returns counts of ok and failed items.
+    """
+    writer = ResultsWriter(results_path)
+    counts = {'ok': 0, 'error': 0}
+
+    def run_one(inputs: dict) -> dict:
+        started = time.perf_counter()
+        record = {'inputs': inputs}
+        try:
+            output = run_item(inputs)
+            record.update(status='ok', output=getattr(output, 'raw', output))
+        except Exception as e:
+            record.update(status='error', error=str(e), traceback=traceback.format_exc())
+        record['duration_s'] = round(time.perf_counter() - started, 3)
+        return record
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="crew") as pool:
+            for future in as_completed([pool.submit(run_one, inputs) for inputs in items]):
+                record = future.result()
+                counts[record['status']] += 1
+                writer.write(record)
+                if on_result:
+                    on_result(record)
+    finally:
+        writer.close()
+    return counts
@@ -3,9 +3,17 @@ from typing import List
 from crewai import Agent, Crew, Process, Task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import FileWriterTool
 
-from youtube.tools import HeyGenVideoGeneratorTool, PDFParserTool, YouTubeUploaderTool
+from pydantic import BaseModel, Field
+
+from youtube.tools import HeyGenVideoGeneratorTool, PDFParserTool, ScriptSummarizerTool, YouTubeUploaderTool
+
+
+class EpisodeMetadata(BaseModel):
+    """YouTube metadata written for an episode by the fast-path pipeline."""
+    title: str = Field(..., description="Title of the YouTube video.")
+    description: str = Field(..., description="Description of the YouTube video.")
+    tags: list[str] = Field(default_factory=list, description="List of tags for the video.")
 
 
 @CrewBase
@@ -17,6 +25,9 @@ class Youtube:
 
     @agent
     def content_curator(self) -> Agent:
+        # crewai_tools is slow to import and only this agent uses it
+        from crewai_tools import FileWriterTool
+
         return Agent(
             config=self.agents_config["content_curator"],
             verbose=True,
@@ -36,7 +47,7 @@ class Youtube:
         return Agent(
             config=self.agents_config["video_producer"],
             verbose=True,
-            tools=[HeyGenVideoGeneratorTool(), YouTubeUploaderTool()],
+            tools=[ScriptSummarizerTool(), HeyGenVideoGeneratorTool(), YouTubeUploaderTool()],
         )
 
     @task
@@ -63,3 +74,25 @@ class Youtube:
             process=Process.sequential,
             verbose=True,
         )
+
+    def episode_metadata_crew(self) -> Crew:
+        """Creates a one-task crew that only writes episode metadata, for the direct pipeline"""
+        writer = Agent(config=self.agents_config["content_curator"], verbose=True)
+        return Crew(
+            agents=[writer],
+            tasks=[
+                Task(
+                    config=self.tasks_config["episode_metadata_task"],
+                    agent=writer,
+                    output_pydantic=EpisodeMetadata,
+                )
+            ],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def describe_episode(self, excerpt: str) -> dict:
+        """Ask the LLM for title, description and tags; the only judgment step of the fast path"""
+        result = self.episode_metadata_crew().kickoff(inputs={"excerpt": excerpt})
+        metadata = result.pydantic.model_dump() if result.pydantic else {}
+        return {**metadata, "token_usage": result.token_usage.model_dump()}
@@ -0,0 +1,332 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from typing import Callable, Iterable, NamedTuple, Optional
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'jobs.sqlite3')
+
+# Order in which every episode moves through the pipeline
+STAGES = ('ingest', 'summarize', 'render', 'download', 'assemble', 'upload')
+
+# A claimed job belongs to its worker for this long unless the lease is
+# renewed; a worker that dies simply stops renewing and the job is reclaimed
+LEASE_SECONDS = 120.0
+HEARTBEAT_INTERVAL = LEASE_SECONDS / 4
+MAX_ATTEMPTS = 3
+IDLE_POLL_SECONDS = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pdf_url TEXT NOT NULL,
+    inputs TEXT NOT NULL DEFAULT '{}',
+    state TEXT NOT NULL DEFAULT '{}',
+    stage TEXT NOT NULL DEFAULT 'ingest',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    lease_owner TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claimable ON jobs (status, lease_expires);
+CREATE TABLE IF NOT EXISTS job_stages (
+    job_id INTEGER NOT NULL REFERENCES jobs (id),
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    PRIMARY KEY (job_id, stage)
+);
+"""
+
+
+class Job(NamedTuple):
+    id: int
+    pdf_url: str
+    inputs: dict
+    state: dict
+    stage: str
+    attempts: int
+
+
+class LeaseLost(Exception):
+    """Raised when a worker's lease on a job was taken over by another worker."""
+
+
+class JobQueue:
+    """Durable episode queue in a local SQLite database.
+
+    A job records the next stage to run and a JSON `state` holding the
+    artifacts of completed stages (text path, HeyGen video_ids, downloaded
+    files, ...), so a job reclaimed after a crash resumes where it stopped
+    instead of re-ingesting the PDF or orphaning its renders.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def enqueue(self, pdf_url: str, inputs: Optional[dict] = None) -> int:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (pdf_url, inputs, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (pdf_url, json.dumps(inputs or {}), now, now),
+            )
+            return cursor.lastrowid
+
+    def claim(
+        self, worker_id: str, lease_seconds: float = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS
+    ) -> Optional[Job]:
+        """Lease the oldest runnable job: pending, or running under an expired lease.
+
+        Taking over an expired lease counts as a failed attempt, so a job
+        that keeps crashing its worker ends up failed instead of being
+        reclaimed forever.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'pending' "
+                    "OR (status = 'running' AND lease_expires < ?) ORDER BY id LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    conn.execute('COMMIT')
+                    return None
+                attempts = row['attempts'] + (row['status'] == 'running')
+                if attempts < max_attempts:
+                    break
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', attempts = ?, last_error = ?, lease_owner = NULL, "
+                    "lease_expires = NULL, updated_at = ? WHERE id = ?",
+                    (attempts, f"lease of {row['lease_owner']} expired during {row['stage']}", now, row['id']),
+                )
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = ?, lease_owner = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                (attempts, worker_id, now + lease_seconds, now, row['id']),
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return Job(row['id'], row['pdf_url'], json.loads(row['inputs']), json.loads(row['state']), row['stage'], attempts)
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float = LEASE_SECONDS) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (now + lease_seconds, now, job_id, worker_id),
+            ).rowcount
+        if not updated:
+            raise LeaseLost(f"job {job_id} is no longer leased by {worker_id}")
+
+    def save_state(self, job_id: int, worker_id: str, state: dict) -> None:
+        """Persist partial progress inside a stage (e.g. each submitted render)."""
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND lease_owner = ?",
+                (json.dumps(state), time.time(), job_id, worker_id),
+            ).rowcount
+        if not updated:
+            raise LeaseLost(f"job {job_id} is no longer leased by {worker_id}")
+
+    def start_stage(self, job_id: int, stage: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO job_stages (job_id, stage, status, started_at) VALUES (?, ?, 'running', ?) "
+                "ON CONFLICT (job_id, stage) DO UPDATE SET status = 'running', started_at = excluded.started_at, error = NULL",
+                (job_id, stage, time.time()),
+            )
+
+    def complete_stage(self, job_id: int, worker_id: str, stage: str, state: dict) -> None:
+        """Record `stage` as done and advance the job to the next stage (or finish it)."""
+        now = time.time()
+        index = STAGES.index(stage)
+        next_stage = STAGES[index + 1] if index + 1 < len(STAGES) else stage
+        status = 'running' if index + 1 < len(STAGES) else 'done'
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            updated = conn.execute(
+                "UPDATE jobs SET state = ?, stage = ?, status = ?, updated_at = ?, "
+                "lease_owner = CASE WHEN ? = 'done' THEN NULL ELSE lease_owner END "
+                "WHERE id = ? AND lease_owner = ?",
+                (json.dumps(state), next_stage, status, now, status, job_id, worker_id),
+            ).rowcount
+            if not updated:
+                conn.execute('ROLLBACK')
+                raise LeaseLost(f"job {job_id} is no longer leased by {worker_id}")
+            conn.execute(
+                "UPDATE job_stages SET status = 'done', finished_at = ? WHERE job_id = ? AND stage = ?",
+                (now, job_id, stage),
+            )
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def fail(self, job_id: int, worker_id: str, stage: str, error: str, max_attempts: int = MAX_ATTEMPTS) -> str:
+        """Release a job after a stage error: back to pending for a retry, or failed for good."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            attempts = row['attempts'] + 1
+            status = 'failed' if attempts >= max_attempts else 'pending'
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, last_error = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ? AND lease_owner = ?",
+                (status, attempts, error, now, job_id, worker_id),
+            )
+            conn.execute(
+                "UPDATE job_stages SET status = 'failed', finished_at = ?, error = ? WHERE job_id = ? AND stage = ?",
+                (now, error, job_id, stage),
+            )
+        return status
+
+    def release(self, job_id: int, worker_id: str) -> None:
+        """Hand a job back untouched, e.g. when its worker is shutting down."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (time.time(), job_id, worker_id),
+            )
+
+    def retry_failed(self) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, updated_at = ? WHERE status = 'failed'",
+                (time.time(),),
+            ).rowcount
+
+    def counts(self) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, stage, COUNT(*) AS n FROM jobs GROUP BY status, stage").fetchall()
+        return {f"{row['status']}/{row['stage']}": row['n'] for row in rows}
+
+    def stages(self, job_id: int) -> list[dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM job_stages WHERE job_id = ?", (job_id,)).fetchall()
+        return sorted((dict(row) for row in rows), key=lambda row: STAGES.index(row['stage']))
+
+
+StageFunction = Callable[[Job, Callable[[dict], None]], dict]
+
+
+class _Heartbeat(threading.Thread):
+    """Renews a job's lease in the background while its stage runs."""
+
+    def __init__(self, queue: JobQueue, job_id: int, worker_id: str):
+        super().__init__(name=f"heartbeat-{job_id}", daemon=True)
+        self.queue, self.job_id, self.worker_id = queue, job_id, worker_id
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        while not self.stopped.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.queue.heartbeat(self.job_id, self.worker_id)
+            except LeaseLost:
+                self.lost = True
+                return
+            except sqlite3.Error:
+                # Try again next beat; the lease has slack for a missed renewal
+                continue
+
+
+class JobWorker:
+    """Claims jobs and runs them through the remaining stages.
+
+    `stages` maps each stage name to a function `(job, save) -> state`
+    that returns the job state with its stage's artifacts added; `save`
+    persists intermediate state so work done mid-stage survives a crash.
+    """
+
+    def __init__(self, queue: JobQueue, stages: dict[str, StageFunction], concurrency: int = 1,
+                 worker_id: Optional[str] = None, log: Callable[[str], None] = print):
+        self.queue = queue
+        self.stages = stages
+        self.concurrency = concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.log = log
+        self.stopping = threading.Event()
+
+    def run_forever(self, exit_when_idle: bool = False) -> None:
+        threads = [
+            threading.Thread(target=self._loop, args=(f"{self.worker_id}/{n}", exit_when_idle), name=f"worker-{n}")
+            for n in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1.0)
+        except KeyboardInterrupt:
+            self.log("Stopping after the current stages finish...")
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+
+    def _loop(self, worker_id: str, exit_when_idle: bool) -> None:
+        while not self.stopping.is_set():
+            job = self.queue.claim(worker_id)
+            if job is None:
+                if exit_when_idle:
+                    return
+                self.stopping.wait(IDLE_POLL_SECONDS)
+                continue
+            self.run_job(job, worker_id)
+
+    def run_job(self, job: Job, worker_id: str) -> None:
+        heartbeat = _Heartbeat(self.queue, job.id, worker_id)
+        heartbeat.start()
+        state = dict(job.state)
+        stage = job.stage
+        try:
+            for stage in STAGES[STAGES.index(job.stage):]:
+                if self.stopping.is_set():
+                    self.queue.release(job.id, worker_id)
+                    return
+                if heartbeat.lost:
+                    raise LeaseLost(f"job {job.id} lease lost before {stage}")
+                self.log(f"[job {job.id}] {stage} ...")
+                self.queue.start_stage(job.id, stage)
+                current = job._replace(state=state, stage=stage)
+                state = self.stages[stage](current, lambda s: self.queue.save_state(job.id, worker_id, s))
+                self.queue.complete_stage(job.id, worker_id, stage, state)
+            self.log(f"[job {job.id}] done")
+        except LeaseLost as e:
+            self.log(f"[job {job.id}] {e}; leaving it to its new owner")
+        except Exception as e:
+            status = self.queue.fail(job.id, worker_id, stage, f"{e}\n{traceback.format_exc()}")
+            self.log(f"[job {job.id}] {stage} failed ({status}): {e}")
+        finally:
+            heartbeat.stopped.set()
+
+
+def enqueue_all(queue: JobQueue, items: Iterable[dict]) -> list[int]:
+    return [queue.enqueue(inputs['pdf_url'], inputs) for inputs in items]
@@ -4,7 +4,13 @@ import warnings
 
 from datetime import datetime
 
-from youtube.crew import Youtube
+import youtube
+from youtube import tools
+from youtube.batch import DEFAULT_MAX_PARALLEL, read_manifest, run_batch
+from youtube.jobs import JobQueue, JobWorker, enqueue_all
+from youtube.pipeline import run_direct, run_streaming
+from youtube.stages import STAGE_FUNCTIONS
+from youtube.tracing import get_tracer, instrument_crew, span
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -22,9 +28,64 @@ def run():
     }
     
     try:
-        Youtube().crew().kickoff(inputs=inputs)
+        with span('crew.kickoff', pdf_url=inputs['pdf_url']):
+            instrument_crew(youtube.Youtube().crew()).kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
+    finally:
+        report_trace()
+
+
+def run_fast():
+    """
+    Run the pipeline directly, using the LLM only to write the episode metadata.
+
+    Usage: run_fast [<pdf_url>]
+    """
+    inputs = {
+        'pdf_url': sys.argv[1] if len(sys.argv) > 1 else 'https://www.b2bmarketingworld.com/wp-content/uploads/Marketing-Strategy-for-B2B.pdf',
+    }
+
+    try:
+        with span('pipeline.run_direct', pdf_url=inputs['pdf_url']):
+            result = run_direct(inputs, describe=youtube.Youtube().describe_episode)
+    except Exception as e:
+        raise Exception(f"An error occurred while running the pipeline: {e}")
+    finally:
+        report_trace()
+
+    print(f"YouTube video ID: {result['youtube_video_id']}")
+
+
+def run_stream():
+    """
+    Run the pipeline with every stage working at once, rendering while the book is still being read.
+
+    Usage: run_stream [<pdf_url>]
+    """
+    inputs = {
+        'pdf_url': sys.argv[1] if len(sys.argv) > 1 else 'https://www.b2bmarketingworld.com/wp-content/uploads/Marketing-Strategy-for-B2B.pdf',
+    }
+
+    try:
+        with span('pipeline.run_streaming', pdf_url=inputs['pdf_url']):
+            result = run_streaming(inputs, describe=youtube.Youtube().describe_episode)
+    except Exception as e:
+        raise Exception(f"An error occurred while running the pipeline: {e}")
+    finally:
+        report_trace()
+
+    print(f"YouTube video ID: {result['youtube_video_id']}")
+
+
+def report_trace():
+    """
+    Print the per-stage summary of this run and export its spans.
+    """
+    tracer = get_tracer()
+    print(tracer.summary_table())
+    jsonl_path, otlp_path = tracer.export()
+    print(f"Trace written to {jsonl_path} and {otlp_path}")
 
 
 def train():
@@ -36,7 +97,7 @@ def train():
         'current_year': str(datetime.now().year)
     }
     try:
-        Youtube().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        youtube.Youtube().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
@@ -46,7 +107,7 @@ def replay():
     Replay the crew execution from a specific task.
     """
     try:
-        Youtube().crew().replay(task_id=sys.argv[1])
+        youtube.Youtube().crew().replay(task_id=sys.argv[1])
 
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
@@ -61,7 +122,87 @@ def test():
     }
     
     try:
-        Youtube().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
+        youtube.Youtube().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
+
+
+def batch():
+    """
+    Run the crew for every PDF in a manifest, several at a time.
+
+    Usage: batch <manifest> [<results_file>] [<max_parallel>]
+    The manifest holds one PDF URL or JSON object with a 'pdf_url' per line.
+    """
+    manifest_path = sys.argv[1]
+    results_path = sys.argv[2] if len(sys.argv) > 2 else 'batch_results.jsonl'
+    max_parallel = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_MAX_PARALLEL
+
+    def report(record):
+        print(f"[{record['status']}] {record['inputs']['pdf_url']} ({record['duration_s']}s)")
+
+    try:
+        items = list(read_manifest(manifest_path))
+        counts = run_batch(
+            items,
+            lambda inputs: youtube.Youtube().crew().kickoff(inputs=inputs),
+            results_path,
+            max_parallel=max_parallel,
+            on_result=report,
+        )
+    except Exception as e:
+        raise Exception(f"An error occurred while running the batch: {e}")
+
+    print(f"Batch finished: {counts['ok']} ok, {counts['error']} failed. Results in {results_path}")
+
+
+def enqueue():
+    """
+    Add PDFs to the durable job queue.
+
+    Usage: enqueue <manifest>
+    """
+    try:
+        queue = JobQueue()
+        job_ids = enqueue_all(queue, read_manifest(sys.argv[1]))
+    except Exception as e:
+        raise Exception(f"An error occurred while enqueueing jobs: {e}")
+
+    print(f"Enqueued {len(job_ids)} jobs into {queue.db_path}")
+
+
+def worker():
+    """
+    Run a long-lived worker that claims queued jobs and resumes each from its last completed stage.
+
+    Usage: worker [<concurrency>]
+    """
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    try:
+        JobWorker(JobQueue(), STAGE_FUNCTIONS, concurrency=concurrency).run_forever()
+    except Exception as e:
+        raise Exception(f"An error occurred while running the worker: {e}")
+
+
+def render_cache():
+    """
+    Inspect or empty the cache of finished HeyGen renders.
+
+    Usage: render_cache [list|clear]
+    """
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    cache = tools.HeyGenVideoGeneratorTool().render_cache()
+    if command == 'clear':
+        print(f"Removed {cache.clear()} cached renders from {cache.root}")
+        return
+    if command != 'list':
+        raise Exception(f"Unknown render_cache command: {command}")
+
+    entries = cache.entries()
+    print(f"{'key':<16} {'video_id':<34} {'MB':>8} {'hits':>5} {'last used':<19} text")
+    for key, entry in sorted(entries.items(), key=lambda item: item[1]['last_used'], reverse=True):
+        last_used = datetime.fromtimestamp(entry['last_used']).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"{key[:16]:<16} {entry['video_id']:<34} {entry['size'] / 2**20:>8.1f} {entry.get('hits', 0):>5} {last_used:<19} {entry['text']}")
+    total = sum(entry['size'] for entry in entries.values())
+    print(f"{len(entries)} renders, {total / 2**20:.1f} MB of {cache.max_bytes / 2**20:.0f} MB in {cache.root}")
@@ -0,0 +1,314 @@
+import queue
+import threading
+import time
+from itertools import chain
+from typing import Callable, Iterable, Iterator, Optional
+
+from youtube.jobs import STAGES, Job
+from youtube.stages import STAGE_FUNCTIONS, PipelineStages
+from youtube.tools.page_store import iter_page_records
+from youtube.tracing import add, in_current_context, span
+
+# Characters of the book shown to the LLM when it writes the episode metadata
+EXCERPT_CHARS = 4000
+
+# Extracted pages held between the parser and the script stage
+PAGE_QUEUE_SIZE = 64
+
+# Marks the end of a queue's items
+_DONE = object()
+
+# Describes an episode from an excerpt of its source text; returns a dict
+# with any of 'title', 'description' and 'tags'
+Describer = Callable[[str], dict]
+
+
+def read_excerpt(text_path: str, chars: int = EXCERPT_CHARS) -> str:
+    with open(text_path, 'r', encoding='utf-8') as f:
+        return f.read(chars)
+
+
+def _span_token_usage(counters: dict) -> dict:
+    """The LLM token counters of a span, keyed like a crew's token_usage."""
+    return {key[len('llm.'):]: int(value) for key, value in counters.items() if key.startswith('llm.') and key != 'llm.calls'}
+
+
+def _add_token_usage(total: Optional[dict], usage: Optional[dict]) -> Optional[dict]:
+    if not usage:
+        return total
+    total = dict(total or {})
+    for key, value in usage.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def run_direct(
+    inputs: dict,
+    describe: Optional[Describer] = None,
+    log: Callable[[str], None] = print,
+    stages: Optional[dict] = None,
+) -> dict:
+    """Run one episode through the pipeline in code, without agent reasoning loops.
+
+    Sourcing, rendering and uploading only hand a path or an ID from one tool
+    to the next, so they are chained directly. The LLM writes the script of
+    a book longer than the episode (map and reduce calls in the summarize
+    stage) and, through `describe`, the episode's title and description
+    before upload. Returns the final job state plus per-stage wall times and
+    the tokens both used, or None if neither called the LLM. `stages`
+    overrides the stage functions, e.g. `PipelineStages(...).as_dict()` with
+    tools pointed elsewhere.
+    """
+    stages = stages or STAGE_FUNCTIONS
+    token_usage = None
+    job = Job(id=0, pdf_url=inputs['pdf_url'], inputs=dict(inputs), state={}, stage=STAGES[0], attempts=0)
+    timings = {}
+    for stage in STAGES:
+        if stage == 'upload' and describe is not None:
+            started = time.perf_counter()
+            with span('stage.describe') as describe_span:
+                metadata = dict(describe(read_excerpt(job.state['text_path'])))
+                describe_usage = metadata.pop('token_usage', None)
+                for key, value in (describe_usage or {}).items():
+                    describe_span.add(f"llm.{key}", value)
+            token_usage = _add_token_usage(token_usage, describe_usage)
+            job = job._replace(inputs={**job.inputs, **{k: v for k, v in metadata.items() if v}})
+            timings['describe'] = time.perf_counter() - started
+
+        log(f"[{job.pdf_url}] {stage} ...")
+        started = time.perf_counter()
+        with span(f"stage.{stage}", pdf_url=job.pdf_url) as stage_span:
+            state = stages[stage](job._replace(stage=stage), lambda s: None)
+        timings[stage] = time.perf_counter() - started
+        token_usage = _add_token_usage(token_usage, _span_token_usage(stage_span.counters))
+        job = job._replace(state=state)
+
+    return {**job.state, 'inputs': job.inputs, 'timings': timings, 'token_usage': token_usage}
+
+
+class PipelineCancelled(Exception):
+    """Raised inside a streaming stage after another stage failed."""
+
+
+class StreamingRun:
+    """Stage threads of one streaming episode and the bounded queues between them.
+
+    A stage that finds its output queue full blocks until the next stage
+    catches up, so a fast parser never runs more than a queue ahead of the
+    renders. The first exception any stage raises cancels the others and is
+    re-raised by `join`.
+    """
+
+    def __init__(self, log: Callable[[str], None] = print, label: str = ''):
+        self.log = log
+        self.label = label
+        self.cancelled = threading.Event()
+        self.error: Optional[BaseException] = None
+        # Stage name -> [first worker start, last worker end]
+        self.windows: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def put(self, q: queue.Queue, item) -> None:
+        while not self.cancelled.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise PipelineCancelled()
+
+    def drain(self, q: queue.Queue) -> Iterator:
+        """Yield the items of `q` until its producers are done."""
+        while not self.cancelled.is_set():
+            try:
+                item = q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                # Leave the marker for the stage's other workers
+                q.put(_DONE)
+                return
+            yield item
+        raise PipelineCancelled()
+
+    def start(self, stage: str, fn: Callable[[], None], output: Optional[queue.Queue] = None, workers: int = 1) -> None:
+        """Run `fn` on `workers` threads; when the last one returns, `output` is marked done."""
+        remaining = [workers]
+        self.log(f"[{self.label}] {stage} ...")
+
+        def run():
+            started = time.perf_counter()
+            try:
+                with span(f"stage.{stage}", pdf_url=self.label):
+                    fn()
+            except PipelineCancelled:
+                pass
+            except BaseException as e:
+                self.fail(e)
+            finally:
+                with self._lock:
+                    window = self.windows.setdefault(stage, [started, started])
+                    window[0] = min(window[0], started)
+                    window[1] = time.perf_counter()
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last and output is not None:
+                    try:
+                        self.put(output, _DONE)
+                    except PipelineCancelled:
+                        pass
+
+        for number in range(workers):
+            thread = threading.Thread(target=in_current_context(run), name=f"{stage}-{number}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def fail(self, error: BaseException) -> None:
+        with self._lock:
+            if self.error is None:
+                self.error = error
+        self.cancelled.set()
+
+    def join(self) -> None:
+        """Wait for every stage; after a failure, raise it without waiting for stages stuck on the network."""
+        # Stages may start others (e.g. describe); those are appended before their starter ends and still joined here
+        for thread in self._threads:
+            while thread.is_alive() and not self.cancelled.is_set():
+                thread.join(0.1)
+        if self.error is not None:
+            raise self.error
+
+    def timings(self) -> dict:
+        """Seconds each stage was running; the windows overlap."""
+        return {stage: end - start for stage, (start, end) in self.windows.items()}
+
+
+def _segment_entry(data: dict) -> dict:
+    return {key: data[key] for key in ('video_id', 'local_video_path', 'local_thumbnail_path')}
+
+
+def _tap_excerpt(pages: Iterable, on_excerpt: Callable[[str], None], chars: int = EXCERPT_CHARS) -> Iterator:
+    """Pass page records through, calling `on_excerpt` once with the book's first `chars` characters."""
+    excerpt = ""
+    for record in pages:
+        if excerpt is not None:
+            excerpt += record.text[:chars - len(excerpt)]
+            if len(excerpt) >= chars:
+                on_excerpt(excerpt)
+                excerpt = None
+        yield record
+    if excerpt is not None:
+        on_excerpt(excerpt)
+
+
+def run_streaming(
+    inputs: dict,
+    describe: Optional[Describer] = None,
+    log: Callable[[str], None] = print,
+    stages: Optional[PipelineStages] = None,
+) -> dict:
+    """Run one episode like `run_direct`, with all stages working at the same time.
+
+    Pages flow from the parser into the script stage, script segments into
+    HeyGen submits, and submitted renders into a pool of download workers,
+    over bounded queues. Summaries of early chapters are requested while
+    later ones are still being extracted, the first segments render while
+    the rest are submitted, and the metadata LLM call runs as soon as the
+    opening pages exist. Only assembly and upload wait for every segment.
+    Returns the same result as `run_direct`; its timings are the overlapping
+    time each stage was running, plus the episode's total wall time.
+    """
+    stages = stages or PipelineStages()
+    parser, summarizer, generator = stages.pdf_parser, stages.summarizer, stages.video_generator
+    pdf_url = inputs['pdf_url']
+    run = StreamingRun(log=log, label=pdf_url)
+    pages: queue.Queue = queue.Queue(PAGE_QUEUE_SIZE)
+    # Bounds the renders waiting for a download worker, so at most twice
+    # max_concurrency renders are queued at HeyGen at once
+    segments: queue.Queue = queue.Queue(generator.max_concurrency)
+    submitted: queue.Queue = queue.Queue(generator.max_concurrency)
+    state: dict = {}
+    rendered: dict[int, dict] = {}
+    metadata: dict = {}
+    summary_usage: dict = {}
+    started = time.perf_counter()
+
+    def describe_episode(excerpt: str) -> None:
+        metadata.update(describe(excerpt))
+        for key, value in (metadata.get('token_usage') or {}).items():
+            add(f"llm.{key}", value)
+
+    def start_describe(excerpt: str) -> None:
+        if describe is not None:
+            run.start('describe', lambda: describe_episode(excerpt))
+
+    def ingest():
+        state['text_path'] = parser.extract(pdf_url, on_page=lambda text: run.put(pages, text))
+
+    def script():
+        records = _tap_excerpt(iter_page_records(run.drain(pages)), start_describe)
+        if inputs.get('summarize') is False:
+            texts = (record.text for record in records)
+        else:
+            minutes = inputs.get('episode_minutes') or summarizer.episode_minutes
+            # A book that fits the episode is read as it is, like `write_script` does;
+            # it compares the size of the text file, so count UTF-8 bytes too
+            head, size = [], 0
+            for record in records:
+                head.append(record)
+                size += len(record.text.encode('utf-8'))
+                if size > summarizer.script_chars(minutes):
+                    script_summarizer = summarizer.summarizer()
+                    try:
+                        # Stripped like the script file `write_script` writes, so `max_script_chars` cuts at the same place
+                        texts = [script_summarizer.summarize_pages(chain(head, records), minutes).strip()]
+                    finally:
+                        summary_usage.update(script_summarizer.token_usage)
+                    break
+            else:
+                texts = (record.text for record in head)
+        for segment in generator.stream_segments(texts):
+            run.put(segments, segment)
+        # Pages past `max_script_chars` are still needed to finish the text cache
+        for _ in records:
+            pass
+
+    def render():
+        for index, text in enumerate(run.drain(segments)):
+            # Unchanged (or, if enabled, near-duplicate) segments come from the render cache without being submitted
+            key = generator.render_key(text)
+            hit = generator.cached_segment(index, key, text)
+            if hit is not None:
+                rendered[index] = _segment_entry(hit['data'])
+            else:
+                run.put(submitted, (index, generator.submit_segment(text), key, text))
+
+    def download():
+        for index, video_id, key, text in run.drain(submitted):
+            rendered[index] = _segment_entry(generator.fetch_segment(index, video_id, cache_key=key, text=text)['data'])
+
+    run.start('ingest', ingest, output=pages)
+    run.start('summarize', script, output=segments)
+    run.start('render', render, output=submitted)
+    run.start('download', download, workers=generator.max_concurrency)
+    run.join()
+    if not rendered:
+        raise ValueError(f"no text to speak in {state.get('text_path', pdf_url)}")
+
+    job = Job(
+        id=0, pdf_url=pdf_url, inputs=dict(inputs), attempts=0, stage='assemble',
+        state={**state, 'segments': [rendered[index] for index in range(len(rendered))]},
+    )
+    token_usage = _add_token_usage(metadata.pop('token_usage', None), summary_usage)
+    job = job._replace(inputs={**job.inputs, **{k: v for k, v in metadata.items() if v}})
+    timings = run.timings()
+    for stage, stage_fn in (('assemble', stages.assemble), ('upload', stages.upload)):
+        log(f"[{pdf_url}] {stage} ...")
+        stage_started = time.perf_counter()
+        with span(f"stage.{stage}", pdf_url=pdf_url):
+            job = job._replace(stage=stage, state=stage_fn(job._replace(stage=stage), lambda s: None))
+        timings[stage] = time.perf_counter() - stage_started
+    timings['total'] = time.perf_counter() - started
+
+    return {**job.state, 'inputs': job.inputs, 'timings': timings, 'token_usage': token_usage}
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+from typing import Any, Optional, Type, TypeVar
+
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+config_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config')
+HEYGEN_SETTINGS_PATH = os.path.join(config_dir, 'heygen_settings.json')
+
+Settings = TypeVar('Settings', bound=BaseModel)
+
+
+class SettingsError(Exception):
+    """Raised when a settings file cannot be parsed or fails validation."""
+
+
+class HeyGenSettings(BaseModel):
+    """Render profile and credentials for the HeyGen tools.
+
+    Loaded from config/heygen_settings.json (or .yaml); every field can be
+    overridden with a HEYGEN_<FIELD> environment variable, e.g. HEYGEN_API_KEY.
+    """
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    api_key: Optional[str] = Field(default=None, description="HeyGen API key; usually set through HEYGEN_API_KEY.")
+
+    # Avatar video (v2/video/generate)
+    avatar_id: str = "Daisy-inskirt-20220818"
+    avatar_style: str = "normal"
+    talking_style: str = "stable"
+    expression: str = "default"
+    voice_id: str = "2d5b0e6cf36f460aa7fc47e3eee4ba54"
+    voice_speed: float = Field(default=1.0, gt=0)
+    voice_pitch: float = 1.0
+    voice_emotion: str = "Friendly"
+    locale: str = "en-US"
+    background_color: str = Field(default="#008000", pattern=r'^#[0-9a-fA-F]{6}$')
+    width: int = Field(default=1280, gt=0)
+    height: int = Field(default=720, gt=0)
+    caption: bool = True
+
+    # Podcast (v1/podcast/submit)
+    length: int = Field(default=60, gt=0)
+    orientation: str = "landscape"
+    enable_caption: bool = True
+    language: str = "en"
+    pose_id_1: Optional[str] = None
+    pose_id_2: Optional[str] = None
+
+    # Completion callbacks (tools/heygen_webhook.py); without a secret, renders are polled
+    webhook_secret: Optional[str] = Field(
+        default=None, description="Secret HeyGen returned for the registered webhook endpoint; usually set through HEYGEN_WEBHOOK_SECRET."
+    )
+    webhook_host: str = "127.0.0.1"
+    webhook_port: int = Field(default=8787, ge=0, le=65535)
+    webhook_path: str = "/heygen/webhook"
+
+
+def _parse(path: str) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith(('.yaml', '.yml')):
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+    except (json.JSONDecodeError, yaml.YAMLError) as e:
+        raise SettingsError(f"Cannot parse {path}: {e}") from e
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise SettingsError(f"{path}: expected a mapping at the top level, got {type(data).__name__}")
+    return data
+
+
+def _env_overrides(model: Type[BaseModel], env_prefix: str) -> dict:
+    overrides = {}
+    for name in model.model_fields:
+        value = os.environ.get(f"{env_prefix}{name.upper()}")
+        if value is not None:
+            overrides[name] = value
+    return overrides
+
+
+class SettingsFile:
+    """A settings file parsed and validated once, then re-read only when it changes.
+
+    `get()` stats the file on every call, which is cheap; the file is only
+    parsed again when its mtime or size differs from the cached copy, or the
+    environment overrides changed. A missing file means model defaults plus
+    environment overrides. The returned model is frozen, so callers can hold
+    on to it without copying.
+    """
+
+    def __init__(self, path: str, model: Type[Settings], env_prefix: str = ''):
+        self.path = path
+        self.model = model
+        self.env_prefix = env_prefix
+        self._lock = threading.Lock()
+        self._version: Any = None
+        self._settings: Optional[Settings] = None
+
+    def get(self) -> Settings:
+        try:
+            stat = os.stat(self.path)
+            fingerprint = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            fingerprint = None
+        overrides = _env_overrides(self.model, self.env_prefix)
+        version = (fingerprint, tuple(sorted(overrides.items())))
+
+        with self._lock:
+            if version != self._version:
+                data = _parse(self.path) if fingerprint is not None else {}
+                try:
+                    self._settings = self.model(**{**data, **overrides})
+                except ValidationError as e:
+                    raise SettingsError(f"Invalid settings in {self.path}: {e}") from e
+                self._version = version
+            return self._settings
+
+
+_settings_files: dict[tuple[str, type], SettingsFile] = {}
+_settings_lock = threading.Lock()
+
+
+def load_settings(path: str, model: Type[Settings], env_prefix: str = '') -> Settings:
+    """Return the current settings in `path`, shared process-wide and reloaded when the file changes."""
+    key = (os.path.abspath(path), model)
+    with _settings_lock:
+        if key not in _settings_files:
+            _settings_files[key] = SettingsFile(path, model, env_prefix)
+        settings_file = _settings_files[key]
+    return settings_file.get()
+
+
+def heygen_settings(path: str = HEYGEN_SETTINGS_PATH) -> HeyGenSettings:
+    return load_settings(path, HeyGenSettings, env_prefix='HEYGEN_')
@@ -0,0 +1,179 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from youtube.jobs import Job
+from youtube.tracing import in_current_context
+from youtube import tools
+
+
+def _episode_title(job: Job) -> str:
+    if job.inputs.get('title'):
+        return job.inputs['title']
+    name = os.path.basename(job.pdf_url).split('?')[0].rsplit('.', 1)[0]
+    return name.replace('-', ' ').replace('_', ' ').strip() or 'B2B Sales Podcast'
+
+
+class PipelineStages:
+    """The stages of an episode, run on a given set of tool instances.
+
+    Tools that are not passed in are built with their defaults on first use.
+    """
+
+    def __init__(
+        self,
+        pdf_parser: Optional["tools.PDFParserTool"] = None,
+        summarizer: Optional["tools.ScriptSummarizerTool"] = None,
+        video_generator: Optional["tools.HeyGenVideoGeneratorTool"] = None,
+        uploader: Optional["tools.YouTubeUploaderTool"] = None,
+    ):
+        self._pdf_parser = pdf_parser
+        self._summarizer = summarizer
+        self._video_generator = video_generator
+        self._uploader = uploader
+
+    @property
+    def pdf_parser(self) -> "tools.PDFParserTool":
+        if self._pdf_parser is None:
+            self._pdf_parser = tools.PDFParserTool()
+        return self._pdf_parser
+
+    @property
+    def summarizer(self) -> "tools.ScriptSummarizerTool":
+        if self._summarizer is None:
+            self._summarizer = tools.ScriptSummarizerTool()
+        return self._summarizer
+
+    @property
+    def video_generator(self) -> "tools.HeyGenVideoGeneratorTool":
+        if self._video_generator is None:
+            self._video_generator = tools.HeyGenVideoGeneratorTool()
+        return self._video_generator
+
+    @property
+    def uploader(self) -> "tools.YouTubeUploaderTool":
+        if self._uploader is None:
+            self._uploader = tools.YouTubeUploaderTool()
+        return self._uploader
+
+    def as_dict(self) -> dict:
+        return {
+            'ingest': self.ingest,
+            'summarize': self.summarize,
+            'render': self.render,
+            'download': self.download,
+            'assemble': self.assemble,
+            'upload': self.upload,
+        }
+
+    def ingest(self, job: Job, save: Callable[[dict], None]) -> dict:
+        return {**job.state, 'text_path': self.pdf_parser.extract(job.pdf_url)}
+
+    def summarize(self, job: Job, save: Callable[[dict], None]) -> dict:
+        """Condense the book into a script for the episode length in `inputs['episode_minutes']`.
+
+        With `inputs['summarize']` set to False the book text itself is the script.
+        """
+        if job.inputs.get('summarize') is False:
+            return {**job.state, 'script_path': job.state['text_path']}
+        script_path = self.summarizer.write_script(job.state['text_path'], job.inputs.get('episode_minutes'))
+        return {**job.state, 'script_path': script_path}
+
+    def render(self, job: Job, save: Callable[[dict], None]) -> dict:
+        """Submit every script segment to HeyGen, saving each video_id as soon as it exists."""
+        script_path = job.state.get('script_path', job.state['text_path'])
+        segments = self.video_generator.read_segments(script_path)
+        if not segments:
+            raise ValueError(f"no text to speak in {script_path}")
+        state = dict(job.state)
+        video_ids = list(state.get('video_ids', []))
+        render_keys = list(state.get('render_keys', []))
+        cached = list(state.get('segments', []))
+        # Segments submitted before a crash keep their renders; only the rest (and
+        # renders HeyGen failed, left as None by `download`) are sent, and of those
+        # only the ones the render cache does not already hold (or, with
+        # near_duplicates='skip', holds a near-duplicate of)
+        for index, segment in enumerate(segments):
+            if index < len(video_ids) and video_ids[index] is not None:
+                continue
+            key = self.video_generator.render_key(segment)
+            hit = self.video_generator.cached_segment(index, key, segment)
+            if hit is not None:
+                data = hit['data']
+                cached.append({name: data[name] for name in ('video_id', 'local_video_path', 'local_thumbnail_path')})
+                video_id = data['video_id']
+            else:
+                video_id = self.video_generator.submit_segment(segment)
+            if index < len(video_ids):
+                video_ids[index], render_keys[index] = video_id, key
+            else:
+                video_ids.append(video_id)
+                render_keys.append(key)
+            state.update(video_ids=video_ids, render_keys=render_keys, segments=cached)
+            save(state)
+        return state
+
+    def download(self, job: Job, save: Callable[[dict], None]) -> dict:
+        """Wait for every render and download the ones not already on disk.
+
+        Renders HeyGen reports as failed are dropped from `video_ids` before
+        the stage fails, so its retry submits them again.
+        """
+        from youtube.tools.heygen_poller import HeyGenJobFailed
+
+        state = dict(job.state)
+        if None in state['video_ids']:
+            state = self.render(job._replace(state=state), save)
+        done = {segment['video_id']: segment for segment in state.get('segments', [])}
+        # The texts go into the render cache and the near-duplicate index with each render
+        segments = self.video_generator.read_segments(state.get('script_path', state['text_path']))
+        failed: list[HeyGenJobFailed] = []
+
+        def fetch(index_and_id):
+            index, video_id = index_and_id
+            if video_id in done and os.path.exists(done[video_id]['local_video_path']):
+                return done[video_id]
+            keys = state.get('render_keys', [])
+            cache_key = keys[index] if index < len(keys) else None
+            text = segments[index] if index < len(segments) else ''
+            try:
+                data = self.video_generator.fetch_segment(index, video_id, cache_key=cache_key, text=text)['data']
+            except HeyGenJobFailed as e:
+                failed.append(e)
+                return None
+            return {key: data[key] for key in ('video_id', 'local_video_path', 'local_thumbnail_path')}
+
+        with ThreadPoolExecutor(max_workers=self.video_generator.max_concurrency) as pool:
+            fetched = list(pool.map(in_current_context(fetch), enumerate(state['video_ids'])))
+        if failed:
+            # Keep the downloads that worked; the retry only waits for the resubmitted renders
+            failed_ids = {e.video_id for e in failed}
+            state['video_ids'] = [None if video_id in failed_ids else video_id for video_id in state['video_ids']]
+            state['segments'] = [segment for segment in fetched if segment is not None]
+            save(state)
+            raise failed[0]
+        state['segments'] = fetched
+        return state
+
+    def assemble(self, job: Job, save: Callable[[dict], None]) -> dict:
+        segments = job.state['segments']
+        if len(segments) == 1 and not (self.video_generator.intro_path or self.video_generator.outro_path):
+            video_path = segments[0]['local_video_path']
+        else:
+            video_path = self.video_generator.assemble(
+                [segment['local_video_path'] for segment in segments], segments[0]['video_id']
+            )
+        return {**job.state, 'video_path': video_path, 'thumbnail_path': segments[0]['local_thumbnail_path']}
+
+    def upload(self, job: Job, save: Callable[[dict], None]) -> dict:
+        youtube_video_id = self.uploader.upload(
+            job.state['video_path'],
+            title=_episode_title(job),
+            description=job.inputs.get('description', ''),
+            tags=job.inputs.get('tags', []),
+            thumbnail_path=job.state.get('thumbnail_path', ''),
+        )
+        return {**job.state, 'youtube_video_id': youtube_video_id}
+
+
+STAGE_FUNCTIONS = PipelineStages().as_dict()
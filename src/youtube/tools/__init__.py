@@ -1,3 +1,25 @@
-from .custom_tool import PDFParserTool, HeyGenPodcastGeneratorTool, YouTubeUploaderTool, HeyGenVideoGeneratorTool
+import importlib
 
-__all__ = ["PDFParserTool", "HeyGenPodcastGeneratorTool", "YouTubeUploaderTool", "HeyGenVideoGeneratorTool"]
\ No newline at end of file
+# Tools are imported on first use: custom_tool pulls in crewai, PyPDF2 and
+# requests, which commands such as `enqueue` never need.
+_LAZY_ATTRS = {
+    "PDFParserTool": ".custom_tool",
+    "HeyGenPodcastGeneratorTool": ".custom_tool",
+    "YouTubeUploaderTool": ".custom_tool",
+    "HeyGenVideoGeneratorTool": ".custom_tool",
+    "ScriptSummarizerTool": ".custom_tool",
+}
+
+__all__ = ["PDFParserTool", "HeyGenPodcastGeneratorTool", "YouTubeUploaderTool", "HeyGenVideoGeneratorTool", "ScriptSummarizerTool"]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
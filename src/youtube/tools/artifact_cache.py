@@ -0,0 +1,175 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Iterable, Optional
+
+import requests
+
+from .http_client import get_session
+from .manifest_file import load_json, manifest_lock, save_json
+from .page_store import index_path, pages_path, write_pages
+
+# Defaults for the on-disk PDF/text cache used by PDFParserTool
+DEFAULT_MAX_BYTES = 2 * 1024**3
+# How long a cached URL is trusted without asking the server again
+DEFAULT_FRESH_FOR = 24 * 60 * 60
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+MANIFEST_NAME = 'manifest.json'
+# Fresh lookups append "<digest> <time>" here instead of rewriting the manifest
+USES_NAME = 'uses.log'
+
+
+class PDFArtifactCache:
+    """Content-addressed store for downloaded PDFs and their extracted text.
+
+    Objects are stored under the SHA-256 of the PDF bytes, so two sources that
+    share a file name never collide and the same book reached through two URLs
+    is parsed once. A JSON manifest maps each URL to its object together with
+    the ETag/Last-Modified validators used for conditional GETs, and records
+    object sizes and last use for least-recently-used eviction. Every update
+    of the manifest holds its lock, so several processes can share the cache;
+    fresh lookups only append to a log of uses, which the next update folds
+    into the manifest.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES, fresh_for: float = DEFAULT_FRESH_FOR):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.fresh_for = fresh_for
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.uses_path = os.path.join(root, USES_NAME)
+        os.makedirs(root, exist_ok=True)
+
+    def pdf_path(self, digest: str) -> str:
+        return os.path.join(self.root, f"{digest}.pdf")
+
+    def text_path(self, digest: str) -> str:
+        return os.path.join(self.root, f"{digest}.txt")
+
+    def lookup_fresh(self, url: str) -> Optional[str]:
+        """Return the cached text path for `url` if it was validated recently enough."""
+        # The manifest is replaced in one step, so it can be read without the lock
+        entry = load_json(self.manifest_path, {'urls': {}})['urls'].get(url)
+        if not entry or time.time() - entry['checked_at'] > self.fresh_for:
+            return None
+        digest = entry['digest']
+        if not os.path.exists(self.text_path(digest)):
+            return None
+        with self._locked(), open(self.uses_path, 'a', encoding='utf-8') as uses:
+            uses.write(f"{digest} {time.time()}\n")
+        return self.text_path(digest)
+
+    def fetch(self, url: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> str:
+        """Make sure the PDF behind `url` is in the cache and return its digest.
+
+        Known URLs are revalidated with If-None-Match/If-Modified-Since; on a
+        304 nothing is downloaded. Otherwise the body is streamed to disk in
+        chunks and hashed on the way.
+        """
+        with self._locked():
+            entry = self._load()['urls'].get(url)
+        headers = {}
+        if entry and os.path.exists(self.pdf_path(entry['digest'])):
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        with get_session().get(url, headers=headers, stream=True) as response:
+            if response.status_code == 304 and headers:
+                digest = entry['digest']
+            else:
+                response.raise_for_status()  # Raise exception for bad status codes
+                digest = self._stream_to_store(response, chunk_size)
+            validators = {
+                'etag': response.headers.get('ETag') or (entry or {}).get('etag'),
+                'last_modified': response.headers.get('Last-Modified') or (entry or {}).get('last_modified'),
+            }
+
+        with self._locked():
+            manifest = self._load()
+            manifest['urls'][url] = {'digest': digest, 'checked_at': time.time(), **validators}
+            self._touch(manifest, digest)
+            self._save(manifest)
+        return digest
+
+    def store_pages(self, digest: str, page_texts: Iterable[str]) -> str:
+        """Stream extracted page texts for `digest` to disk and evict old objects if over budget."""
+        text_path = write_pages(page_texts, self.text_path(digest))
+        with self._locked():
+            manifest = self._load()
+            self._touch(manifest, digest)
+            self._evict(manifest, keep=digest)
+            self._save(manifest)
+        return text_path
+
+    def object_paths(self, digest: str) -> list[str]:
+        text_path = self.text_path(digest)
+        pages = pages_path(text_path)
+        return [self.pdf_path(digest), text_path, pages, index_path(pages)]
+
+    def _stream_to_store(self, response: requests.Response, chunk_size: int) -> str:
+        sha256 = hashlib.sha256()
+        partial_path = os.path.join(self.root, f"download-{os.getpid()}-{threading.get_ident()}.part")
+        try:
+            with open(partial_path, 'wb') as pdf_file:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    sha256.update(chunk)
+                    pdf_file.write(chunk)
+            digest = sha256.hexdigest()
+            # Same bytes already stored (e.g. a mirror URL): keep the existing object
+            if os.path.exists(self.pdf_path(digest)):
+                os.remove(partial_path)
+            else:
+                os.replace(partial_path, self.pdf_path(digest))
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return digest
+
+    def _touch(self, manifest: dict, digest: str) -> None:
+        size = 0
+        for path in self.object_paths(digest):
+            if os.path.exists(path):
+                size += os.path.getsize(path)
+        manifest['objects'][digest] = {'size': size, 'last_used': time.time()}
+
+    def _evict(self, manifest: dict, keep: str) -> None:
+        objects = manifest['objects']
+        total = sum(entry['size'] for entry in objects.values())
+        for digest in sorted(objects, key=lambda d: objects[d]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            for path in self.object_paths(digest):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= objects.pop(digest)['size']
+            manifest['urls'] = {url: e for url, e in manifest['urls'].items() if e['digest'] != digest}
+
+    def _locked(self):
+        return manifest_lock(self.manifest_path)
+
+    def _load(self) -> dict:
+        """The manifest with the uses logged since it was last saved; call with the lock held."""
+        manifest = load_json(self.manifest_path, {'urls': {}, 'objects': {}})
+        try:
+            with open(self.uses_path, 'r', encoding='utf-8') as uses:
+                for line in uses:
+                    digest, _, used = line.partition(' ')
+                    entry = manifest['objects'].get(digest)
+                    # A line cut short by a crash is skipped
+                    if entry is not None and used.strip():
+                        entry['last_used'] = max(entry['last_used'], float(used))
+        except FileNotFoundError:
+            pass
+        return manifest
+
+    def _save(self, manifest: dict) -> None:
+        save_json(self.manifest_path, manifest)
+        # Those uses are in the manifest now
+        if os.path.exists(self.uses_path):
+            os.remove(self.uses_path)
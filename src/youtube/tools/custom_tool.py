@@ -1,17 +1,58 @@
 import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Type
+from typing import Callable, Iterable, Iterator, Literal, Optional, Type
 import json
 
-import PyPDF2
 import requests
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from datetime import datetime
 
-output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'videos')
-os.makedirs(output_dir, exist_ok=True)
+from .http_client import get_session
+from .memoize import memoized
+from ..settings import HEYGEN_SETTINGS_PATH, HeyGenSettings, heygen_settings
+from ..tracing import add, in_current_context, traced
+from .heygen_poller import API_BASE_URL, DEFAULT_DEADLINE, HeyGenJobFailed, get_poller
+from .heygen_webhook import ensure_webhook
+from .artifact_cache import DEFAULT_MAX_BYTES, PDFArtifactCache
+from .downloads import download_many
+from .near_duplicates import (
+    DEFAULT_DB_PATH as NEAR_DUPLICATE_DB_PATH,
+    DEFAULT_THRESHOLD as NEAR_DUPLICATE_THRESHOLD,
+    SEGMENT,
+    NearDuplicateIndex,
+    get_near_duplicate_index,
+    minhash,
+)
+from .pdf_extraction import iter_page_texts
+from .render_cache import (
+    DEFAULT_MAX_BYTES as RENDER_CACHE_MAX_BYTES,
+    RenderCache,
+    render_key,
+    render_profile_key,
+)
+from .script_segmenter import HEYGEN_INPUT_LIMIT, iter_segments, segment_text, take_chars
+from .summarizer import (
+    CHUNK_TOKENS,
+    DEFAULT_EPISODE_MINUTES,
+    MAX_CONCURRENCY,
+    ScriptSummarizer,
+    iter_text_pages,
+    llm_completion,
+    script_target_chars,
+)
+from .video_assembly import VideoAssemblyError, concat_segments
+from .youtube_upload import DEFAULT_CHUNK_SIZE, UPLOAD_BASE_URL, ResumableUploader
+
+data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
+output_dir = os.path.join(data_dir, 'videos')
+config_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'config')
+cache_dir = os.path.join(data_dir, 'cache')
+render_cache_dir = os.path.join(data_dir, 'renders')
+
+# Settings sent with a v1/podcast/submit request
+PODCAST_FIELDS = ('length', 'orientation', 'enable_caption', 'language', 'pose_id_1', 'pose_id_2')
+
 
 class PDFParserToolInput(BaseModel):
     """Input schema for PDFParserTool."""
@@ -25,55 +66,128 @@ class PDFParserTool(BaseTool):
         "Useful for processing PDF documents and converting them to plain text format."
     )
     args_schema: Type[BaseModel] = PDFParserToolInput
+    workers: Optional[int] = Field(
+        default=None,
+        description="Processes used for text extraction; defaults to the CPU count, 1 forces serial mode.",
+    )
+    cache_dir: str = Field(default=cache_dir, description="Directory of the content-addressed PDF/text cache.")
+    cache_max_bytes: int = Field(default=DEFAULT_MAX_BYTES, description="Size budget of the cache before LRU eviction.")
+    near_duplicate_index_path: Optional[str] = Field(
+        default=NEAR_DUPLICATE_DB_PATH, description="MinHash index every ingested book's pages are added to; None skips indexing."
+    )
 
+    # Not memoized: the artifact cache already answers repeated URLs without
+    # network, and a memo could hand out a text path it has since evicted
+    @traced()
     def _run(self, pdf_url: str) -> str:
         try:
-            # Download PDF from URL
-            response = requests.get(pdf_url)
-            response.raise_for_status()  # Raise exception for bad status codes
-            
-            # Create a temporary file to store the PDF
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_file.write(response.content)
-                temp_file_path = temp_file.name
-            
-            # Extract text from PDF
-            text_content = ""
-            with open(temp_file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text_content += page.extract_text()
-            
-            # Ensure data directory exists at project root
-            data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            
-            # Generate a unique filename for the text file
-            pdf_filename = os.path.basename(pdf_url).split('?')[0] or 'extracted'
-            if not pdf_filename.lower().endswith('.pdf'):
-                pdf_filename += '.pdf'
-            txt_filename = pdf_filename[:-4] + '.txt'
-            
-            # Save PDF file to data directory
-            pdf_file_path = os.path.join(data_dir, pdf_filename)
-            with open(pdf_file_path, 'wb') as pdf_file:
-                pdf_file.write(response.content)
-            
-            # Save extracted text to the new file
-            text_file_path = os.path.join(data_dir, txt_filename)
-            with open(text_file_path, 'w', encoding='utf-8') as text_file:
-                text_file.write(text_content)
-            
-            # Clean up temporary PDF file
-            os.remove(temp_file_path)
-            
-            return text_file_path
-                
+            return self.extract(pdf_url)
         except requests.RequestException as e:
             return f"Error downloading PDF: {str(e)}"
         except Exception as e:
             return f"Error parsing PDF: {str(e)}"
 
+    def extract(self, pdf_url: str, on_page: Optional[Callable[[str], None]] = None) -> str:
+        """Download (or reuse) the PDF at `pdf_url` and return the path of its extracted text.
+
+        `on_page` is called with the text of every page in order, as it is
+        extracted or read back from the cache; a callback that blocks holds
+        up extraction, which lets a consumer push back on the parser.
+        """
+        cache = PDFArtifactCache(self.cache_dir, max_bytes=self.cache_max_bytes)
+
+        # A recently validated URL needs neither network nor parsing
+        text_file_path = cache.lookup_fresh(pdf_url)
+        if text_file_path:
+            self._index_pages(text_file_path)
+            return self._replay_pages(text_file_path, on_page)
+
+        # Stream PDF from URL into the cache, or revalidate the cached copy
+        digest = cache.fetch(pdf_url)
+
+        # Identical bytes are only ever parsed once
+        text_file_path = cache.text_path(digest)
+        if not os.path.exists(text_file_path):
+            # Extract text from PDF page by page, spreading large books over a
+            # process pool, and write each page out as soon as it is ready
+            page_texts = iter_page_texts(cache.pdf_path(digest), workers=self.workers)
+            if on_page is not None:
+                page_texts = _tap(page_texts, on_page)
+            text_file_path = cache.store_pages(digest, page_texts)
+            self._index_pages(text_file_path)
+            return text_file_path
+
+        self._index_pages(text_file_path)
+        return self._replay_pages(text_file_path, on_page)
+
+    def _index_pages(self, text_file_path: str) -> None:
+        """Add a book's pages to the near-duplicate index unless they are already in it."""
+        if not self.near_duplicate_index_path:
+            return
+        # Cached texts are named after the SHA-256 of their PDF
+        digest = os.path.splitext(os.path.basename(text_file_path))[0]
+        duplicates = get_near_duplicate_index(self.near_duplicate_index_path).index_pages(
+            digest, (record.text for record in iter_text_pages(text_file_path))
+        )
+        if duplicates:
+            add('dedup.near_duplicate_pages', duplicates)
+
+    def _replay_pages(self, text_file_path: str, on_page: Optional[Callable[[str], None]]) -> str:
+        if on_page is not None:
+            for record in iter_text_pages(text_file_path):
+                on_page(record.text)
+        return text_file_path
+
+
+def _tap(items: Iterable, callback: Callable) -> Iterator:
+    for item in items:
+        callback(item)
+        yield item
+
+
+class ScriptSummarizerToolInput(BaseModel):
+    """Input schema for ScriptSummarizerTool."""
+    file_path: str = Field(..., description="Path to the book text written by the PDF Parser Tool.")
+
+
+class ScriptSummarizerTool(BaseTool):
+    name: str = "Script Summarizer Tool"
+    description: str = (
+        "A tool that condenses a long book text into a podcast script sized to the episode length. "
+        "Takes the path of the book text and returns the path of the script file."
+    )
+    args_schema: Type[BaseModel] = ScriptSummarizerToolInput
+    episode_minutes: float = Field(default=DEFAULT_EPISODE_MINUTES, description="Target length of the episode.")
+    model: Optional[str] = Field(default=None, description="LLM used for the summaries; defaults to the MODEL environment variable.")
+    chunk_tokens: int = Field(default=CHUNK_TOKENS, description="Book text sent to the LLM per summary.")
+    max_concurrency: int = Field(default=MAX_CONCURRENCY, description="Summaries requested at the same time.")
+    complete: Optional[Callable[[str], str]] = Field(
+        default=None, exclude=True, description="Completion function used instead of the LLM, e.g. a local stand-in."
+    )
+
+    @traced()
+    def _run(self, file_path: str) -> str:
+        try:
+            return self.write_script(file_path)
+        except Exception as e:
+            return f"Error summarizing text: {str(e)}"
+
+    def write_script(self, file_path: str, episode_minutes: Optional[float] = None) -> str:
+        """Summarize `file_path` into a script file and return its path."""
+        return self.summarizer().write_script(file_path, episode_minutes or self.episode_minutes)
+
+    def script_chars(self, episode_minutes: Optional[float] = None) -> int:
+        """Book texts up to this many characters are the script as they are."""
+        return script_target_chars(episode_minutes or self.episode_minutes)
+
+    def summarizer(self) -> ScriptSummarizer:
+        return ScriptSummarizer(
+            self.complete or llm_completion(self.model),
+            model_id=self.model or os.getenv('MODEL', ''),
+            chunk_tokens=self.chunk_tokens,
+            max_concurrency=self.max_concurrency,
+        )
+
 
 class HeyGenPodcastGeneratorToolInput(BaseModel):
     """Input schema for HeyGenPodcastGeneratorTool."""
@@ -87,34 +201,34 @@ class HeyGenPodcastGeneratorTool(BaseTool):
         "Takes a PDF URL and other settings as input. Headers and cookies are loaded from config/heygen_settings.json or environment."
     )
     args_schema: Type[BaseModel] = HeyGenPodcastGeneratorToolInput
-
+    api_base_url: str = Field(default="https://api2.heygen.com", description="Base URL of the HeyGen podcast API.")
+    upload_base_url: str = Field(default="https://upload.heygen.com", description="Base URL of the HeyGen asset upload API.")
+    settings_path: str = Field(default=HEYGEN_SETTINGS_PATH, description="HeyGen settings JSON or YAML file.")
+
+    # Podcasts are paid for; the same PDF with the same podcast settings returns the earlier submission
+    @traced()
+    @memoized(
+        ttl=7 * 24 * 60 * 60,
+        file_args=('pdf_file_path',),
+        cache_if=lambda result: result.startswith('{'),
+        key_extra=lambda tool: heygen_settings(tool.settings_path).model_dump(include=set(PODCAST_FIELDS)),
+    )
     def _run(self, pdf_file_path: str) -> str:
         try:
-            import requests
-
-            settings = {
-                "avatar_id": "Daisy-inskirt-20220818",
-                "avatar_style": "normal", 
-                "voice_id": "2d5b0e6cf36f460aa7fc47e3eee4ba54",
-                "background_color": "#008000",
-                "width": 1280,
-                "height": 720
-            }
+            settings = heygen_settings(self.settings_path)
 
             # Required fields for the API
-            required_keys = ['key']
-            for k in required_keys:
-                if k not in settings:
-                    return f"Missing '{k}' in HeyGen settings JSON file."
+            if not settings.api_key:
+                return "Missing HeyGen API key: set HEYGEN_API_KEY or 'api_key' in the HeyGen settings file."
 
             # Upload the PDF file first
             with open(pdf_file_path, "rb") as f:
-                upload_url = "https://upload.heygen.com/v1/asset"
+                upload_url = f"{self.upload_base_url}/v1/asset"
                 upload_headers = {
                     "Content-Type": "application/pdf",
-                    "x-api-key": settings['key']
+                    "x-api-key": settings.api_key
                 }
-                upload_response = requests.post(upload_url, data=f, headers=upload_headers)
+                upload_response = get_session().post(upload_url, data=f, headers=upload_headers)
                 upload_response.raise_for_status()
                 asset_data = upload_response.json()
 
@@ -122,23 +236,22 @@ class HeyGenPodcastGeneratorTool(BaseTool):
             headers = {
                 'accept': 'application/json',
                 'content-type': 'application/json',
-                'x-api-key': settings['key']
+                'x-api-key': settings.api_key
             }
 
             payload = {
                 "source_type": "pdf",
                 "asset_id": asset_data.get('asset_id'),
-                "key": settings['key'],
-                "length": settings.get('length', 60),
-                "orientation": settings.get('orientation', 'landscape'),
-                "enable_caption": settings.get('enable_caption', True),
-                "language": settings.get('language', 'en'),
-                "pose_id_1": settings.get('pose_id_1'),
-                "pose_id_2": settings.get('pose_id_2')
+                "length": settings.length,
+                "orientation": settings.orientation,
+                "enable_caption": settings.enable_caption,
+                "language": settings.language,
+                "pose_id_1": settings.pose_id_1,
+                "pose_id_2": settings.pose_id_2
             }
 
-            url = "https://api2.heygen.com/v1/podcast/submit"
-            response = requests.post(url, headers=headers, json=payload)
+            url = f"{self.api_base_url}/v1/podcast/submit"
+            response = get_session().post(url, headers=headers, json=payload)
             response.raise_for_status()
             return response.text
         except Exception as e:
@@ -161,79 +274,57 @@ class YouTubeUploaderTool(BaseTool):
         "Requires OAuth2 credentials in config/youtube_settings.json."
     )
     args_schema: Type[BaseModel] = YouTubeUploaderToolInput
+    upload_base_url: str = Field(default=UPLOAD_BASE_URL, description="Base URL of the YouTube upload API.")
+    chunk_size: int = Field(default=DEFAULT_CHUNK_SIZE, description="Bytes per resumable upload request; a multiple of 256 KiB.")
+    settings_path: str = Field(default=os.path.join(config_dir, 'youtube_settings.json'), description="OAuth2 credentials JSON file.")
+    session_dir: str = Field(default=os.path.join(data_dir, 'uploads'), description="Directory of resumable upload sessions still in progress.")
 
+    # Not memoized: every call must really publish a video
+    @traced()
     def _run(self, video_file_path: str, title: str, description: str, tags: list[str] = [], thumbnail_path: str = ""):
         try:
-            # import json
-            # import os
-            # import requests
-            # from urllib.parse import urlencode
-
-            # # Load credentials from config/youtube_settings.json
-            # config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'youtube_settings.json')
-            # if not os.path.exists(config_path):
-            #     return "YouTube settings JSON file not found at config/youtube_settings.json."
-            
-            # with open(config_path, 'r', encoding='utf-8') as f:
-            #     creds_data = json.load(f)
-
-            # # Prepare video upload
-            # upload_url = "https://www.googleapis.com/upload/youtube/v3/videos"
-            # params = {
-            #     'part': 'snippet,status',
-            #     'key': creds_data.get('api_key')
-            # }
-            
-            # headers = {
-            #     'Authorization': f"Bearer {creds_data.get('access_token')}",
-            #     'Content-Type': 'multipart/form-data'
-            # }
-
-            # # Prepare video metadata
-            # metadata = {
-            #     'snippet': {
-            #         'title': title,
-            #         'description': description,
-            #         'tags': tags,
-            #     },
-            #     'status': {
-            #         'privacyStatus': 'private',
-            #     }
-            # }
-
-            # # Upload video file
-            # with open(video_file_path, 'rb') as video_file:
-            #     files = {
-            #         'video': ('video.mp4', video_file, 'video/mp4'),
-            #         'metadata': (None, json.dumps(metadata))
-            #     }
-            #     response = requests.post(
-            #         f"{upload_url}?{urlencode(params)}",
-            #         headers=headers,
-            #         files=files
-            #     )
-            #     response.raise_for_status()
-            #     video_data = response.json()
-            #     video_id = video_data.get('id')
-
-            # # Upload thumbnail if provided
-            # if thumbnail_path and os.path.exists(thumbnail_path):
-            #     thumbnail_url = f"https://www.googleapis.com/upload/youtube/v3/thumbnails/set"
-            #     params['videoId'] = video_id
-                
-            #     with open(thumbnail_path, 'rb') as thumbnail_file:
-            #         files = {'image': thumbnail_file}
-            #         thumbnail_response = requests.post(
-            #             f"{thumbnail_url}?{urlencode(params)}",
-            #             headers=headers,
-            #             files=files
-            #         )
-            #         thumbnail_response.raise_for_status()
-
-            return f"Video uploaded successfully. Video ID: 1234567890"
+            # Load credentials from config/youtube_settings.json
+            if not os.path.exists(self.settings_path):
+                return "YouTube settings JSON file not found at config/youtube_settings.json."
+
+            video_id = self.upload(video_file_path, title, description, tags, thumbnail_path)
+            return f"Video uploaded successfully. Video ID: {video_id}"
         except Exception as e:
             return f"Error uploading video: {str(e)}"
 
+    def upload(self, video_file_path: str, title: str, description: str, tags: list[str] = [], thumbnail_path: str = "") -> str:
+        """Upload a video (and optional thumbnail) and return its YouTube video ID."""
+        with open(self.settings_path, 'r', encoding='utf-8') as f:
+            creds_data = json.load(f)
+
+        uploader = ResumableUploader(
+            access_token=creds_data.get('access_token'),
+            session_dir=self.session_dir,
+            base_url=self.upload_base_url,
+            chunk_size=self.chunk_size,
+        )
+
+        # Prepare video metadata
+        metadata = {
+            'snippet': {
+                'title': title,
+                'description': description,
+                'tags': tags,
+            },
+            'status': {
+                'privacyStatus': 'private',
+            }
+        }
+
+        # Upload video file in resumable chunks
+        video_id = uploader.upload_video(video_file_path, metadata)['id']
+
+        # Upload thumbnail if provided; it needs the video ID, so nothing is left to overlap it with
+        if thumbnail_path and os.path.exists(thumbnail_path):
+            uploader.upload_thumbnail(video_id, thumbnail_path)
+
+        return video_id
+
 
 class HeyGenVideoGeneratorToolInput(BaseModel):
     """Input schema for HeyGenVideoGeneratorTool."""
@@ -247,113 +338,257 @@ class HeyGenVideoGeneratorTool(BaseTool):
         "Takes a text and other settings as input. Headers and cookies are loaded from config/heygen_settings.json or environment."
     )
     args_schema: Type[BaseModel] = HeyGenVideoGeneratorToolInput
+    api_base_url: str = Field(default=API_BASE_URL, description="Base URL of the HeyGen API.")
+    poll_timeout: float = Field(default=DEFAULT_DEADLINE, description="Seconds to wait for a render before giving up.")
+    segment_chars: int = Field(default=HEYGEN_INPUT_LIMIT, description="Maximum characters of script per rendered segment.")
+    max_concurrency: int = Field(default=4, description="Segments rendered at the same time.")
+    max_script_chars: Optional[int] = Field(default=None, description="Only render this many characters of the script; None renders all of it.")
+    intro_path: Optional[str] = Field(default=None, description="MP4 bumper placed before the first segment.")
+    outro_path: Optional[str] = Field(default=None, description="MP4 bumper placed after the last segment.")
+    settings_path: str = Field(default=HEYGEN_SETTINGS_PATH, description="HeyGen settings JSON or YAML file.")
+    output_dir: str = Field(default=output_dir, description="Directory the rendered segments and assembled episodes are written to.")
+    render_cache_dir: str = Field(default=render_cache_dir, description="Directory of finished renders reused for unchanged segments.")
+    render_cache_max_bytes: int = Field(default=RENDER_CACHE_MAX_BYTES, description="Size budget of the render cache before old renders are evicted.")
+    near_duplicates: Literal['skip', 'flag', 'off'] = Field(
+        default='flag',
+        description="For a segment nearly the same as one rendered before: reuse that render ('skip'), only count it ('flag'), or do not check ('off').",
+    )
+    near_duplicate_threshold: float = Field(default=NEAR_DUPLICATE_THRESHOLD, description="Estimated Jaccard similarity from which segments count as near-duplicates.")
+    near_duplicate_index_path: str = Field(default=NEAR_DUPLICATE_DB_PATH, description="MinHash index of rendered segments.")
 
+    # Not memoized: unchanged segments are reused from the render cache, which
+    # also knows whether their videos are still on disk
+    @traced()
     def _run(self, file_path: str) -> str:
         try:
-            import requests
-            import os
-            import time
-
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
+            # Split the script into sentence-aligned segments HeyGen accepts
+            segments = self.read_segments(file_path)
+            if not segments:
+                return f"Error generating video: no text to speak in {file_path}"
+
+            # Render all segments concurrently, keeping results in script order
+            results = [None] * len(segments)
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                futures = {pool.submit(in_current_context(self._render_segment), index, segment): index for index, segment in enumerate(segments)}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+            failed = [result for result in results if isinstance(result, str)]
+            if failed:
+                return f"Video generation failed for {len(failed)} of {len(segments)} segments: {failed}"
+
+            if len(results) == 1 and not (self.intro_path or self.outro_path):
+                return results[0]
+
+            # Stitch the segments (and any bumpers) into one episode by stream copy
+            segment_paths = [result['data']['local_video_path'] for result in results]
+            try:
+                episode_path = self.assemble(segment_paths, results[0]['data']['video_id'])
+            except VideoAssemblyError as e:
+                return f"Error assembling video segments {segment_paths}: {str(e)}"
+
+            return {
+                'data': {
+                    'status': 'completed',
+                    'segments': [result['data'] for result in results],
+                    'local_video_paths': segment_paths,
+                    'local_video_path': episode_path,
+                    'local_thumbnail_path': results[0]['data']['local_thumbnail_path'],
+                }
+            }
 
-            # HACK for now do to not print everything
-            text = text[:100]
+        except Exception as e:
+            return f"Error generating video: {str(e)}"
 
-            # Generate video
-            url = "https://api.heygen.com/v2/video/generate"
-            headers = {
-                "accept": "application/json",
-                "content-type": "application/json",
-                "x-api-key": os.getenv("HEYGEN_API_KEY"),
+    def settings(self) -> HeyGenSettings:
+        """The current render profile, re-read only when the settings file changes."""
+        return heygen_settings(self.settings_path)
+
+    def render_cache(self) -> RenderCache:
+        return RenderCache(self.render_cache_dir, max_bytes=self.render_cache_max_bytes)
+
+    def render_key(self, text: str) -> str:
+        """Cache key of `text` spoken with the current render profile."""
+        return render_key(text, self.settings())
+
+    def near_duplicate_index(self) -> NearDuplicateIndex:
+        return get_near_duplicate_index(self.near_duplicate_index_path)
+
+    def segment_kind(self) -> str:
+        """Index kind of rendered segments; one per render profile, so a match always looks and sounds the same."""
+        return f"{SEGMENT}/{render_profile_key(self.settings())[:16]}"
+
+    def cached_segment(self, index: int, key: str, text: Optional[str] = None) -> Optional[dict]:
+        """Status data for a segment rendered before with the same text and profile, or None.
+
+        With the segment's `text` and `near_duplicates='skip'`, the render of
+        a nearly identical earlier segment is returned too, marked
+        `render_cache: 'near_duplicate'`.
+        """
+        cache = self.render_cache()
+        entry = cache.lookup(key)
+        if entry is not None:
+            add('heygen.render_cache_hits')
+            return self._cached_data(cache, index, key, entry, 'hit')
+        if text is None or self.near_duplicates == 'off':
+            return None
+        signature = minhash(text)
+        if signature is None:
+            return None
+        for match in self.near_duplicate_index().query(self.segment_kind(), signature, self.near_duplicate_threshold):
+            if self.near_duplicates == 'flag':
+                add('dedup.near_duplicate_segments')
+                return None
+            # The earlier render may have been evicted since it was indexed
+            entry = cache.lookup(match.source)
+            if entry is not None:
+                add('dedup.near_duplicate_segments')
+                add('dedup.renders_skipped')
+                data = self._cached_data(cache, index, match.source, entry, 'near_duplicate')
+                data['data']['near_duplicate_similarity'] = match.similarity
+                return data
+        return None
+
+    def _cached_data(self, cache: RenderCache, index: int, key: str, entry: dict, outcome: str) -> dict:
+        video_id = entry['video_id']
+        video_path = os.path.join(self.output_dir, f"video_{video_id}.mp4")
+        thumbnail_path = os.path.join(self.output_dir, f"thumbnail_{video_id}.jpg")
+        cache.materialize(key, video_path, thumbnail_path)
+        return {
+            'data': {
+                'status': 'completed',
+                'video_id': video_id,
+                'local_video_path': video_path,
+                'local_thumbnail_path': thumbnail_path,
+                'local_video_sha256': entry['sha256'],
+                'segment_index': index,
+                'render_cache': outcome,
             }
-            
-            video_inputs = [
-                {
-                    "character": {
-                        "type": "avatar",
-                        "avatar_id": "Daisy-inskirt-20220818",
-                        "scale": 1,
-                        "avatar_style": "normal",
-                        "offset": {"x": 0, "y": 0},
-                        "talking_style": "stable",
-                        "expression": "default"
-                    },
-                    "voice": {
-                        "type": "text",
-                        "voice_id": "2d5b0e6cf36f460aa7fc47e3eee4ba54",
-                        "input_text": text,
-                        "speed": 1.0,
-                        "pitch": 1.0,
-                        "emotion": "Friendly",
-                        "locale": "en-US"
-                    },
-                    "background": {
-                        "type": "color",
-                        "value": "#008000"
-                    }
-                }
-            ]
-            
-            payload = {
-                "caption": True,
-                "dimension": {
-                    "width": 1280,
-                    "height": 720
+        }
+
+    def read_segments(self, file_path: str) -> list[str]:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read() if self.max_script_chars is None else f.read(self.max_script_chars)
+        return segment_text(text, max_chars=self.segment_chars)
+
+    def stream_segments(self, texts: Iterable[str]) -> Iterator[str]:
+        """Segments of script text arriving in pieces (e.g. pages).
+
+        They are the same segments, and so have the same render keys, as
+        `read_segments` makes of a file holding the joined text.
+        """
+        return iter_segments(take_chars(texts, self.max_script_chars), max_chars=self.segment_chars)
+
+    def assemble(self, segment_paths: list[str], episode_id: str) -> str:
+        """Stitch downloaded segments (and any bumpers) into `episode_<episode_id>.mp4`."""
+        episode_path = os.path.join(self.output_dir, f"episode_{episode_id}.mp4")
+        return concat_segments(segment_paths, episode_path, intro_path=self.intro_path, outro_path=self.outro_path)
+
+    def _render_segment(self, index: int, text: str):
+        """Render one script segment and download it; returns status data or an error string."""
+        # Unchanged segments are served from earlier renders instead of being paid for again
+        key = self.render_key(text)
+        cached = self.cached_segment(index, key, text)
+        if cached is not None:
+            return cached
+        video_id = self.submit_segment(text)
+        try:
+            return self.fetch_segment(index, video_id, cache_key=key, text=text)
+        except HeyGenJobFailed as e:
+            return f"Segment {index} failed: {e.status_data}"
+
+    def submit_segment(self, text: str) -> str:
+        """Submit one script segment to v2/video/generate and return its HeyGen video_id."""
+        # Generate video
+        settings = self.settings()
+        url = f"{self.api_base_url}/v2/video/generate"
+        headers = {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "x-api-key": settings.api_key,
+        }
+
+        video_inputs = [
+            {
+                "character": {
+                    "type": "avatar",
+                    "avatar_id": settings.avatar_id,
+                    "scale": 1,
+                    "avatar_style": settings.avatar_style,
+                    "offset": {"x": 0, "y": 0},
+                    "talking_style": settings.talking_style,
+                    "expression": settings.expression
                 },
-                "video_inputs": video_inputs
-            }
-            
-            response = requests.post(url, json=payload, headers=headers)
-            video_id = response.json()['data']['video_id']
-            
-            # Check status
-            status_url = "https://api.heygen.com/v1/video_status.get"
-            status_headers = {
-                "accept": "application/json",
-                "x-api-key": os.getenv("HEYGEN_API_KEY")
+                "voice": {
+                    "type": "text",
+                    "voice_id": settings.voice_id,
+                    "input_text": text,
+                    "speed": settings.voice_speed,
+                    "pitch": settings.voice_pitch,
+                    "emotion": settings.voice_emotion,
+                    "locale": settings.locale
+                },
+                "background": {
+                    "type": "color",
+                    "value": settings.background_color
+                }
             }
-            params = {"video_id": video_id}
-            
-            while True:
-                response = requests.get(status_url, headers=status_headers, params=params)
-                status_data = response.json()
-                status = status_data.get('data', {}).get('status')
-
-                if status == 'completed':
-                    # Extract video and thumbnail URLs from response
-                    video_url = status_data.get('data', {}).get('video_url')
-                    thumbnail_url = status_data.get('data', {}).get('thumbnail_url')
-                    
-                    # Download video and thumbnail
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    video_path = os.path.join(output_dir, f"video_{timestamp}.mp4")
-                    thumbnail_path = os.path.join(output_dir, f"thumbnail_{timestamp}.jpg")
-                    
-                    # Download video
-                    video_response = requests.get(video_url)
-                    with open(video_path, 'wb') as f:
-                        f.write(video_response.content)
-                        
-                    # Download thumbnail
-                    thumbnail_response = requests.get(thumbnail_url)
-                    with open(thumbnail_path, 'wb') as f:
-                        f.write(thumbnail_response.content)
-                    
-                    # Add URLs and local paths to status data
-                    status_data['data']['video_url'] = video_url
-                    status_data['data']['thumbnail_url'] = thumbnail_url
-                    status_data['data']['local_video_path'] = video_path
-                    status_data['data']['local_thumbnail_path'] = thumbnail_path
-                    
-                    return status_data
-                elif status == 'failed':
-                    return f"Video generation failed: {status_data}"
-                time.sleep(10)  # Wait 10 seconds before checking again
+        ]
+
+        payload = {
+            "caption": settings.caption,
+            "dimension": {
+                "width": settings.width,
+                "height": settings.height
+            },
+            "video_inputs": video_inputs
+        }
+
+        response = get_session().post(url, json=payload, headers=headers)
+        response.raise_for_status()
+        return response.json()['data']['video_id']
+
+    def fetch_segment(self, index: int, video_id: str, cache_key: Optional[str] = None, text: str = '') -> dict:
+        """Wait for a submitted render to finish and download it; raises HeyGenJobFailed.
+
+        With a `cache_key` the finished render is added to the render cache.
+        """
+        # Wait for the render on the shared poller instead of sleeping in this thread
+        poller = get_poller(f"{self.api_base_url}/v1/video_status.get")
+        settings = self.settings()
+        if settings.webhook_secret:
+            # Completion callbacks resolve the render at once; polling becomes a slow safety net
+            ensure_webhook(poller, settings.webhook_secret, settings.webhook_host, settings.webhook_port, settings.webhook_path)
+        status_data = poller.submit(video_id, deadline=self.poll_timeout, api_key=settings.api_key).result()
+        add('heygen.poll_iterations', status_data['data'].get('poll_iterations', 0))
+
+        # Extract video and thumbnail URLs from response
+        video_url = status_data.get('data', {}).get('video_url')
+        thumbnail_url = status_data.get('data', {}).get('thumbnail_url')
+
+        # Stream video and thumbnail to disk side by side, named after the render
+        video_path = os.path.join(self.output_dir, f"video_{video_id}.mp4")
+        thumbnail_path = os.path.join(self.output_dir, f"thumbnail_{video_id}.jpg")
+        video, thumbnail = download_many([(video_url, video_path), (thumbnail_url, thumbnail_path)])
+
+        # Add URLs and local paths to status data
+        status_data['data']['video_url'] = video_url
+        status_data['data']['thumbnail_url'] = thumbnail_url
+        status_data['data']['local_video_path'] = video_path
+        status_data['data']['local_thumbnail_path'] = thumbnail_path
+        status_data['data']['video_id'] = video_id
+        status_data['data']['local_video_sha256'] = video.sha256
+        status_data['data']['segment_index'] = index
+
+        if cache_key:
+            self.render_cache().store(cache_key, video_path, thumbnail_path, video_id, video.sha256, text=text)
+            # Later segments that are nearly the same text can then find this render
+            signature = minhash(text) if text and self.near_duplicates != 'off' else None
+            if signature is not None:
+                self.near_duplicate_index().add(self.segment_kind(), cache_key, 0, signature)
+
+        return status_data
 
-        except Exception as e:
-            return f"Error generating video: {str(e)}"
-        
 
 class YouTubeVideoUploaderPlaceholderInput(BaseModel):
     """Input schema for YouTubeVideoUploaderPlaceholder."""
@@ -371,6 +606,7 @@ class YouTubeVideoUploaderPlaceholder(BaseTool):
     )
     args_schema: Type[BaseModel] = YouTubeVideoUploaderPlaceholderInput
 
+    @traced()
     def _run(self, video_file_path: str, title: str, description: str, tags: list[str] = [], thumbnail_path: str = ""):
         return f"[PLACEHOLDER] Would upload '{video_file_path}' to YouTube with title '{title}' and thumbnail path '{thumbnail_path}'."
 
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import requests
+
+from ..tracing import in_current_context
+from .http_client import get_session
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Connection drops are resumed from the bytes already on disk this many times
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF = 2.0
+# CDN hiccups are retried like dropped connections
+RETRIABLE_STATUS_CODES = {500, 502, 503, 504}
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed or fails verification."""
+
+
+class DownloadResult(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+
+
+def _hash_file(path: str, sha256) -> int:
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+            size += len(chunk)
+    return size
+
+
+def _expected_total(response: requests.Response, offset: int) -> Optional[int]:
+    content_range = response.headers.get('Content-Range', '')
+    if response.status_code == 206 and '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length')
+    return int(length) if length is not None else None
+
+
+def download_file(
+    url: str,
+    path: str,
+    expected_size: Optional[int] = None,
+    expected_sha256: Optional[str] = None,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+) -> DownloadResult:
+    """Stream `url` to `path` in chunks, resuming a partial `.part` file with HTTP Range.
+
+    The file only appears under `path` once its size matches what the server
+    announced (or `expected_size`) and, if given, its SHA-256 matches
+    `expected_sha256`.
+    """
+    partial_path = path + '.part'
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        sha256 = hashlib.sha256()
+        offset = _hash_file(partial_path, sha256) if os.path.exists(partial_path) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        try:
+            with get_session().get(url, headers=headers, stream=True) as response:
+                if response.status_code == 416:
+                    # Nothing left to fetch: the partial file already holds every byte
+                    total = offset
+                elif response.status_code in RETRIABLE_STATUS_CODES and attempt < MAX_ATTEMPTS:
+                    time.sleep(RETRY_BACKOFF * attempt)
+                    continue
+                else:
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        # Server ignored the Range header; start over
+                        sha256, offset = hashlib.sha256(), 0
+                    total = _expected_total(response, offset)
+                    if total is not None and response.status_code == 200:
+                        total += offset
+                    with open(partial_path, 'ab' if offset else 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            sha256.update(chunk)
+                            f.write(chunk)
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+            if attempt == MAX_ATTEMPTS:
+                raise
+            time.sleep(RETRY_BACKOFF * attempt)
+
+    size = os.path.getsize(partial_path)
+    expected_size = expected_size if expected_size is not None else total
+    digest = sha256.hexdigest()
+    if expected_size is not None and size != expected_size:
+        raise DownloadError(f"{url}: got {size} bytes, expected {expected_size}")
+    if expected_sha256 and digest != expected_sha256.lower():
+        os.remove(partial_path)
+        raise DownloadError(f"{url}: SHA-256 {digest} does not match expected {expected_sha256}")
+    os.replace(partial_path, path)
+    return DownloadResult(path, size, digest)
+
+
+def download_many(jobs: list[tuple[str, str]], max_workers: int = 4) -> list[DownloadResult]:
+    """Download several `(url, path)` pairs concurrently; results are in input order."""
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        futures = [pool.submit(in_current_context(download_file), url, path) for url, path in jobs]
+        return [future.result() for future in futures]
@@ -0,0 +1,204 @@
+import asyncio
+import concurrent.futures
+import random
+import threading
+from typing import Optional
+
+import requests
+
+from ..settings import heygen_settings
+from .http_client import get_session
+from .rate_limit import get_rate_limiter
+
+API_BASE_URL = "https://api.heygen.com"
+STATUS_URL = API_BASE_URL + "/v1/video_status.get"
+
+# Backoff between status checks of one job: starts short because small
+# renders finish quickly, then backs off towards MAX_DELAY for long ones
+INITIAL_DELAY = 5.0
+MAX_DELAY = 60.0
+BACKOFF_FACTOR = 1.6
+JITTER = 0.2
+# Give up on a job that has not finished within this many seconds
+DEFAULT_DEADLINE = 60 * 60
+# Status checks while a webhook receiver is attached only catch lost callbacks
+WEBHOOK_POLL_DELAY = 5 * 60
+
+
+class HeyGenJobFailed(Exception):
+    """Raised when HeyGen reports a render as failed."""
+
+    def __init__(self, video_id: str, status_data: dict):
+        super().__init__(f"HeyGen video {video_id} failed")
+        self.video_id = video_id
+        self.status_data = status_data
+
+
+class HeyGenJobPoller:
+    """Tracks in-flight HeyGen renders on a single asyncio event loop.
+
+    Each `video_id` is polled by one task with jittered exponential backoff
+    and an overall deadline, however many callers wait on it. Async callers
+    await `wait()`; synchronous tools call `submit()` and get a
+    `concurrent.futures.Future`, served by a loop running in a daemon thread.
+    Callers pass the API key the render was submitted with, so tools with
+    different HeyGen settings can share the poller.
+
+    With a webhook receiver attached (see heygen_webhook.py), completion
+    callbacks wake a job through `notify()` and polling slows to one check
+    every `webhook_poll_delay` seconds, in case a callback never arrives.
+    """
+
+    def __init__(
+        self,
+        status_url: str = STATUS_URL,
+        api_key: Optional[str] = None,
+        initial_delay: float = INITIAL_DELAY,
+        max_delay: float = MAX_DELAY,
+        backoff_factor: float = BACKOFF_FACTOR,
+        jitter: float = JITTER,
+        webhook_poll_delay: float = WEBHOOK_POLL_DELAY,
+    ):
+        self.status_url = status_url
+        self.api_key = api_key
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.webhook_poll_delay = webhook_poll_delay
+        self.status_requests = 0
+        # The attached webhook receiver, if any
+        self.webhook = None
+        self._jobs: dict[str, asyncio.Task] = {}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._callbacks: dict[str, dict] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    async def wait(self, video_id: str, deadline: float = DEFAULT_DEADLINE, api_key: Optional[str] = None) -> dict:
+        """Wait until `video_id` completes and return its status payload.
+
+        Raises HeyGenJobFailed if the render fails and TimeoutError once
+        `deadline` seconds have passed. A job already being tracked keeps the
+        deadline and API key it was first registered with; without an
+        `api_key` the poller's own key, or the default settings' key, is used.
+        """
+        task = self._jobs.get(video_id)
+        if task is None:
+            self._wakeups[video_id] = asyncio.Event()
+            task = asyncio.ensure_future(self._poll(video_id, deadline, api_key))
+            self._jobs[video_id] = task
+            task.add_done_callback(lambda _: self._forget(video_id))
+        return await asyncio.shield(task)
+
+    def notify(self, video_id: str, status_data: Optional[dict] = None) -> bool:
+        """Wake the job for `video_id` after a completion callback; call on the poller's loop.
+
+        The woken job checks the status at once (the callback does not carry
+        every URL the download needs); `status_data` with a `failed` status
+        fails it without another request. Returns False for a video this
+        poller is not waiting on, e.g. one submitted by another process.
+        """
+        wakeup = self._wakeups.get(video_id)
+        if wakeup is None:
+            return False
+        self._callbacks[video_id] = status_data or {'data': {'id': video_id, 'status': 'completed'}}
+        wakeup.set()
+        return True
+
+    def _forget(self, video_id: str) -> None:
+        self._jobs.pop(video_id, None)
+        self._wakeups.pop(video_id, None)
+        self._callbacks.pop(video_id, None)
+
+    def submit(
+        self, video_id: str, deadline: float = DEFAULT_DEADLINE, api_key: Optional[str] = None
+    ) -> concurrent.futures.Future:
+        """Thread-safe entry point: track `video_id` and return a future for its result."""
+        return asyncio.run_coroutine_threadsafe(self.wait(video_id, deadline, api_key), self._background_loop())
+
+    async def _poll(self, video_id: str, deadline: float, api_key: Optional[str]) -> dict:
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + deadline
+        delay = self.initial_delay
+        iterations = 0
+        called_back = False
+        while True:
+            iterations += 1
+            try:
+                await get_rate_limiter().acquire_async(self.status_url)
+                # Counted here on the loop thread; the requests themselves run on executor threads
+                self.status_requests += 1
+                status_data = await loop.run_in_executor(None, self._fetch_status, video_id, api_key)
+                status = status_data.get('data', {}).get('status')
+            except requests.RequestException:
+                # A flaky status call is not a failed render; try again after the backoff
+                status = None
+            if status == 'completed':
+                status_data['data']['poll_iterations'] = iterations
+                return status_data
+            if status == 'failed':
+                raise HeyGenJobFailed(video_id, status_data)
+
+            remaining = give_up_at - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f"HeyGen video {video_id} not ready after {deadline:g}s (last status: {status})")
+            if self.webhook is not None and not called_back:
+                pause = self.webhook_poll_delay
+            else:
+                pause = delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+                delay = min(delay * self.backoff_factor, self.max_delay)
+            await self._sleep(video_id, min(pause, remaining))
+
+            callback = self._callbacks.pop(video_id, None)
+            if callback is not None:
+                if callback['data'].get('status') == 'failed':
+                    callback['data']['poll_iterations'] = iterations
+                    raise HeyGenJobFailed(video_id, callback)
+                # Reported done: if the status API lags behind, back off normally rather than slowly
+                called_back = True
+
+    async def _sleep(self, video_id: str, seconds: float) -> None:
+        """Sleep until the next status check, or until a callback for `video_id` arrives."""
+        wakeup = self._wakeups[video_id]
+        try:
+            await asyncio.wait_for(wakeup.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+        wakeup.clear()
+
+    def _fetch_status(self, video_id: str, api_key: Optional[str] = None) -> dict:
+        headers = {
+            "accept": "application/json",
+            "x-api-key": api_key or self.api_key or heygen_settings().api_key,
+        }
+        # The token was taken on the event loop before this ran
+        response = get_session().get(self.status_url, headers=headers, params={"video_id": video_id}, rate_limit=False)
+        response.raise_for_status()
+        return response.json()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="heygen-poller", daemon=True).start()
+            return self._loop
+
+
+_shared_pollers: dict[str, HeyGenJobPoller] = {}
+_shared_lock = threading.Lock()
+
+
+def get_poller(status_url: str = STATUS_URL) -> HeyGenJobPoller:
+    """Return the process-wide poller for `status_url`, shared by every HeyGen tool instance."""
+    with _shared_lock:
+        if status_url not in _shared_pollers:
+            _shared_pollers[status_url] = HeyGenJobPoller(status_url=status_url)
+        return _shared_pollers[status_url]
+
+
+def configure_poller(status_url: str = STATUS_URL, **options) -> HeyGenJobPoller:
+    """Replace the shared poller for `status_url`, e.g. with a shorter backoff for a local stand-in."""
+    with _shared_lock:
+        _shared_pollers[status_url] = HeyGenJobPoller(status_url=status_url, **options)
+        return _shared_pollers[status_url]
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import hmac
+import json
+from typing import Optional
+
+from ..tracing import add
+from .heygen_poller import HeyGenJobPoller
+
+DEFAULT_PATH = '/heygen/webhook'
+# HeyGen signs the raw request body with the endpoint's secret (HMAC-SHA256, hex)
+SIGNATURE_HEADER = 'signature'
+MAX_BODY_BYTES = 64 * 1024
+READ_TIMEOUT = 10.0
+
+SUCCESS_EVENT = 'avatar_video.success'
+FAIL_EVENT = 'avatar_video.fail'
+
+_REASONS = {
+    200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large',
+}
+
+
+def sign(body: bytes, secret: str) -> str:
+    return hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    return bool(signature) and hmac.compare_digest(sign(body, secret), signature.strip().lower())
+
+
+class WebhookReceiver:
+    """HTTP endpoint for HeyGen completion callbacks, served on a poller's event loop.
+
+    Register `<public url><path>` for the `avatar_video.success` and
+    `avatar_video.fail` events with HeyGen (v1/webhook/endpoint.add) and
+    configure the secret it returns. Every callback must carry a valid
+    signature; accepted ones wake the matching job in `poller` at once,
+    and while the receiver is attached the poller only polls as a safety net.
+    """
+
+    def __init__(
+        self,
+        poller: HeyGenJobPoller,
+        secret: str,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        path: str = DEFAULT_PATH,
+    ):
+        self.poller = poller
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.path = path
+        self.events_received = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    def start(self) -> 'WebhookReceiver':
+        """Start listening on the poller's loop and attach to the poller; raises OSError if the port is taken."""
+        loop = self.poller._background_loop()
+        asyncio.run_coroutine_threadsafe(self._listen(), loop).result()
+        self.poller.webhook = self
+        return self
+
+    def close(self) -> None:
+        """Stop listening; the poller goes back to its normal backoff."""
+        if self.poller.webhook is self:
+            self.poller.webhook = None
+        if self._server is not None:
+            asyncio.run_coroutine_threadsafe(self._stop(), self.poller._background_loop()).result()
+
+    async def _listen(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 picks a free port; report the one actually bound
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            status = await asyncio.wait_for(self._respond(reader), READ_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            status = 400
+        try:
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode('ascii')
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader: asyncio.StreamReader) -> int:
+        method, target, _ = (await reader.readline()).decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+            if len(headers) > 100:
+                raise ValueError("too many headers")
+
+        if target.split('?', 1)[0] != self.path:
+            return 404
+        if method != 'POST':
+            return 405
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_BYTES:
+            return 413
+        body = await reader.readexactly(length)
+        if not verify_signature(body, headers.get(SIGNATURE_HEADER), self.secret):
+            add('heygen.webhook_rejected')
+            return 401
+        try:
+            event = json.loads(body)
+        except json.JSONDecodeError:
+            return 400
+        if not isinstance(event, dict):
+            return 400
+        self.handle_event(event)
+        return 200
+
+    def handle_event(self, event: dict) -> None:
+        """Wake the job an already verified callback is about; other event types are ignored."""
+        event_type = event.get('event_type')
+        data = event.get('event_data') or {}
+        video_id = data.get('video_id')
+        if not video_id or event_type not in (SUCCESS_EVENT, FAIL_EVENT):
+            return
+        self.events_received += 1
+        add('heygen.webhook_events')
+        if event_type == FAIL_EVENT:
+            self.poller.notify(video_id, {'data': {'id': video_id, 'status': 'failed', 'error': data.get('msg')}})
+        else:
+            self.poller.notify(video_id)
+
+
+def ensure_webhook(
+    poller: HeyGenJobPoller, secret: str, host: str = '127.0.0.1', port: int = 0, path: str = DEFAULT_PATH
+) -> Optional[WebhookReceiver]:
+    """Attach a receiver to `poller` unless it has one; returns None if the port cannot be bound.
+
+    Only one process on the host can own the port; the others keep polling
+    with their normal backoff.
+    """
+    if poller.webhook is not None:
+        return poller.webhook
+    try:
+        return WebhookReceiver(poller, secret, host=host, port=port, path=path).start()
+    except OSError:
+        add('heygen.webhook_unavailable')
+        return None
@@ -0,0 +1,123 @@
+import threading
+import time
+from typing import Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .. import tracing
+from .rate_limit import get_rate_limiter
+
+# (connect, read) seconds; the read timeout applies per socket read, so
+# large streamed downloads are not cut off
+DEFAULT_TIMEOUT = (10.0, 60.0)
+# Distinct hosts kept open at once (PDF hosts, HeyGen API/upload, YouTube, CDNs)
+POOL_CONNECTIONS = 16
+# Keep-alive connections per host, enough for the concurrent renders,
+# downloads and status polls that hit one host together
+POOL_MAXSIZE = 32
+# 429 responses are retried after their Retry-After pause this many times
+MAX_THROTTLED_RETRIES = 5
+
+
+class PooledSession(requests.Session):
+    """A requests.Session with per-host keep-alive pools, default timeouts, rate limits and reuse metrics."""
+
+    def __init__(
+        self,
+        timeout: Union[float, tuple[float, float]] = DEFAULT_TIMEOUT,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+    ):
+        super().__init__()
+        self.timeout = timeout
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, rate_limit: bool = True, **kwargs):
+        """Send a request once the rate limiter allows it, waiting out and retrying 429s.
+
+        Pass `rate_limit=False` when the caller already acquired a token,
+        e.g. with `acquire_async` on an event loop.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = get_rate_limiter()
+        for attempt in range(MAX_THROTTLED_RETRIES + 1):
+            if rate_limit or attempt:
+                limiter.acquire(url)
+            response = super().request(method, url, **kwargs)
+            tracing.add('http.requests')
+            tracing.add('http.bytes_sent', _body_size(response.request))
+            tracing.add('http.bytes_received', int(response.headers.get('Content-Length') or 0))
+            if response.status_code != 429 or attempt == MAX_THROTTLED_RETRIES or not _replayable(kwargs):
+                return response
+            # Pause every caller of this endpoint, not just this one, then try again
+            pause = limiter.throttled(url, response.headers.get('Retry-After'))
+            response.close()
+            time.sleep(pause)
+        return response
+
+    def connection_stats(self) -> dict:
+        """Requests sent and TCP/TLS connections opened, per host.
+
+        A host whose `connections` stays far below `requests` is getting
+        keep-alive reuse. Pools evicted from the adapter's LRU are not counted.
+        """
+        stats = {}
+        for adapter in {id(a): a for a in self.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}:{pool.port}"
+                entry = stats.setdefault(host, {'requests': 0, 'connections': 0})
+                entry['requests'] += pool.num_requests
+                entry['connections'] += pool.num_connections
+        for entry in stats.values():
+            entry['reused'] = max(entry['requests'] - entry['connections'], 0)
+        return stats
+
+
+def _body_size(request: requests.PreparedRequest) -> int:
+    if isinstance(request.body, (bytes, str)):
+        return len(request.body)
+    # Streamed bodies (open files) announce their size in the header
+    return int(request.headers.get('Content-Length') or 0)
+
+
+def _replayable(kwargs: dict) -> bool:
+    # Streamed bodies (open files) have been consumed by the first attempt
+    return 'files' not in kwargs and not hasattr(kwargs.get('data'), 'read')
+
+
+_shared_session: Optional[PooledSession] = None
+_shared_lock = threading.Lock()
+
+
+def get_session() -> PooledSession:
+    """Return the process-wide session shared by every tool for PDF, HeyGen and YouTube traffic."""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = PooledSession()
+        return _shared_session
+
+
+def configure(
+    timeout: Union[float, tuple[float, float]] = DEFAULT_TIMEOUT,
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_maxsize: int = POOL_MAXSIZE,
+) -> PooledSession:
+    """Replace the shared session, e.g. to raise pool sizes for a large batch."""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+        _shared_session = PooledSession(timeout=timeout, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        return _shared_session
+
+
+def connection_stats() -> dict:
+    return get_session().connection_stats()
@@ -0,0 +1,48 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+_thread_locks: dict[str, threading.Lock] = {}
+_thread_locks_lock = threading.Lock()
+
+
+@contextmanager
+def manifest_lock(manifest_path: str) -> Iterator[None]:
+    """Hold the manifest at `manifest_path` for a read-modify-write.
+
+    Threads of this process wait on a lock per path and other processes
+    (batch runs, queue workers) on an flock of `<manifest>.lock`, so no
+    writer can overwrite another's update.
+    """
+    path = os.path.abspath(manifest_path)
+    with _thread_locks_lock:
+        lock = _thread_locks.setdefault(path, threading.Lock())
+    with lock, open(path + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_json(path: str, default: dict) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def save_json(path: str, data: dict) -> None:
+    """Replace `path` in one step, through a temporary file no other writer uses."""
+    partial_path = f"{path}.{os.getpid()}-{threading.get_ident()}.part"
+    try:
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
@@ -0,0 +1,188 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from crewai.tools import BaseTool
+
+from .. import tracing
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'tool_cache.sqlite3')
+DEFAULT_MAX_BYTES = 64 * 1024**2
+
+# Set YOUTUBE_TOOL_CACHE=0 to run every tool call for real
+ENABLED_ENV = 'YOUTUBE_TOOL_CACHE'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tool_results (
+    key TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tool_results_lru ON tool_results (last_used);
+"""
+
+
+class ToolResultCache:
+    """On-disk store of tool results keyed by a hash of tool, settings and arguments.
+
+    Entries expire after their tool's TTL and the least recently used ones
+    are evicted once the stored results exceed `max_bytes`. Backed by SQLite
+    so results survive restarts and are shared by `run`, `train` and `test`.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT value, expires_at FROM tool_results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        if row[1] is not None and row[1] < now:
+            conn.execute("DELETE FROM tool_results WHERE key = ?", (key,))
+            return False, None
+        conn.execute("UPDATE tool_results SET last_used = ? WHERE key = ?", (now, key))
+        return True, json.loads(row[0])
+
+    def set(self, key: str, tool: str, value: Any, ttl: Optional[float]) -> None:
+        now = time.time()
+        encoded = json.dumps(value, default=str)
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO tool_results (key, tool, value, size, expires_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, tool, encoded, len(encoded), None if ttl is None else now + ttl, now),
+        )
+        self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM tool_results WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM tool_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM tool_results ORDER BY last_used"):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM tool_results WHERE key = ?", doomed)
+
+    def clear(self, tool: Optional[str] = None) -> int:
+        if tool is None:
+            return self._conn().execute("DELETE FROM tool_results").rowcount
+        return self._conn().execute("DELETE FROM tool_results WHERE tool = ?", (tool,)).rowcount
+
+
+_shared_cache: Optional[ToolResultCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_tool_cache() -> ToolResultCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ToolResultCache()
+        return _shared_cache
+
+
+def _is_success(result: Any) -> bool:
+    # Tools report failures as strings rather than raising; never cache those
+    return not (isinstance(result, str) and result.startswith('Error'))
+
+
+def _tool_settings(tool: BaseTool) -> dict:
+    """The tool's own configuration fields, which can change what a call returns."""
+    return {
+        name: getattr(tool, name)
+        for name in type(tool).model_fields
+        if name not in BaseTool.model_fields
+    }
+
+
+def _file_fingerprint(path: Any) -> Any:
+    try:
+        stat = os.stat(path)
+    except (TypeError, OSError):
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def memoized(
+    ttl: Optional[float],
+    file_args: Iterable[str] = (),
+    cache_if: Callable[[Any], bool] = _is_success,
+    key_extra: Optional[Callable[[BaseTool], Any]] = None,
+):
+    """Memoize a tool's `_run` on a hash of its normalized arguments and settings.
+
+    `ttl` is in seconds (None keeps results until evicted). Arguments named
+    in `file_args` are paths whose size and mtime join the key, so editing the
+    file invalidates the result. Only results accepted by `cache_if` are
+    stored. `key_extra(tool)` adds anything else the result depends on, such
+    as settings loaded from a file. Tools with side effects that must happen every time, such as
+    uploads, simply leave `_run` undecorated, and so do tools returning paths
+    that their own caches may evict, since a hit is returned without a check.
+    """
+    file_args = tuple(file_args)
+
+    def decorator(run):
+        signature = inspect.signature(run)
+
+        @functools.wraps(run)
+        def wrapper(self, *args, **kwargs):
+            if os.getenv(ENABLED_ENV, '1') == '0':
+                return run(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name != 'self'}
+            try:
+                extra = key_extra(self) if key_extra else None
+            except Exception:
+                # Let the tool itself report whatever makes it unable to run
+                return run(self, *args, **kwargs)
+            key_material = {
+                'tool': f"{type(self).__module__}.{type(self).__qualname__}",
+                'settings': _tool_settings(self),
+                'args': arguments,
+                'files': {name: _file_fingerprint(arguments.get(name)) for name in file_args},
+                'extra': extra,
+            }
+            key = hashlib.sha256(json.dumps(key_material, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+            cache = get_tool_cache()
+            hit, value = cache.get(key)
+            if hit:
+                tracing.add('cache.hits')
+                return value
+            result = run(self, *args, **kwargs)
+            if cache_if(result):
+                cache.set(key, type(self).__name__, result, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
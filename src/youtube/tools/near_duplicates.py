@@ -0,0 +1,216 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'near_duplicates.sqlite3')
+
+PAGE = 'page'
+SEGMENT = 'segment'
+
+# Word 5-grams: long enough that unrelated sales texts share few, short
+# enough that an edited sentence only changes a handful
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+# 16 bands of 8 rows put the LSH threshold near a Jaccard similarity of 0.7;
+# candidates are then checked against DEFAULT_THRESHOLD
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.8
+MAX_CANDIDATES = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    created REAL NOT NULL,
+    UNIQUE (kind, source, position)
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    kind TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    item_id INTEGER NOT NULL REFERENCES items (id)
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (kind, bucket);
+"""
+
+
+def _seeded_uint64(label: str) -> int:
+    # Derived from fixed labels, not a RNG, so signatures stored today stay comparable
+    return int.from_bytes(hashlib.blake2b(label.encode('ascii'), digest_size=8).digest(), 'little')
+
+
+# Multiply-shift hash functions standing in for random permutations; odd multipliers
+_MULTIPLIERS = np.array([_seeded_uint64(f"a{i}") | 1 for i in range(NUM_PERM)], dtype=np.uint64)
+_OFFSETS = np.array([_seeded_uint64(f"b{i}") for i in range(NUM_PERM)], dtype=np.uint64)
+
+
+class Match(NamedTuple):
+    similarity: float
+    source: str
+    position: int
+
+
+def shingles(text: str, words: int = SHINGLE_WORDS) -> set[str]:
+    """Overlapping word n-grams of `text`, ignoring case, punctuation and Unicode form."""
+    tokens = re.findall(r"[\w']+", unicodedata.normalize('NFKC', text).lower())
+    if len(tokens) < words:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + words]) for i in range(len(tokens) - words + 1)}
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of the shingles of `text`: NUM_PERM uint32 values, or None for empty text."""
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little') for shingle in shingles(text)),
+        dtype=np.uint64,
+    )
+    if not hashes.size:
+        return None
+    # uint64 arithmetic wraps around, which is what multiply-shift hashing wants
+    with np.errstate(over='ignore'):
+        values = (_MULTIPLIERS[:, None] * hashes[None, :] + _OFFSETS[:, None]) >> np.uint64(32)
+    return values.min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def band_buckets(signature: np.ndarray) -> list[int]:
+    """One bucket per band; texts sharing any bucket are candidate near-duplicates."""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of page and segment texts in a SQLite file.
+
+    Each text is stored as its MinHash signature plus one row per LSH band,
+    so a query is BANDS indexed bucket lookups and a similarity check of the
+    few texts they return, however many documents the corpus holds. Pages
+    are indexed per PDF digest as books are ingested; segments per render
+    key as they are rendered, so a segment that is nearly the same as an
+    earlier one can reuse its render. Writes are single transactions, and
+    several processes can share the file.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def has_source(self, kind: str, source: str) -> bool:
+        row = self._conn().execute("SELECT 1 FROM items WHERE kind = ? AND source = ? LIMIT 1", (kind, source)).fetchone()
+        return row is not None
+
+    def add(self, kind: str, source: str, position: int, signature: np.ndarray) -> bool:
+        """Index one signature; returns False if (kind, source, position) was already indexed."""
+        return self.add_many(kind, [(source, position, signature)]) == 1
+
+    def add_many(self, kind: str, items: Iterable[tuple[str, int, np.ndarray]]) -> int:
+        """Index (source, position, signature) triples in one transaction; returns how many were new."""
+        conn = self._conn()
+        added = 0
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            for source, position, signature in items:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO items (kind, source, position, signature, created) VALUES (?, ?, ?, ?, ?)",
+                    (kind, source, position, signature.tobytes(), now),
+                )
+                if cursor.rowcount:
+                    conn.executemany(
+                        "INSERT INTO buckets (kind, bucket, item_id) VALUES (?, ?, ?)",
+                        [(kind, bucket, cursor.lastrowid) for bucket in band_buckets(signature)],
+                    )
+                    added += 1
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return added
+
+    def query(
+        self,
+        kind: str,
+        signature: np.ndarray,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude_source: Optional[str] = None,
+    ) -> list[Match]:
+        """Indexed texts of `kind` at least `threshold` similar to `signature`, most similar first."""
+        buckets = band_buckets(signature)
+        # Candidates sharing the most bands are the likeliest matches, so they are the ones kept under the limit
+        rows = self._conn().execute(
+            f"SELECT items.source, items.position, items.signature FROM items WHERE items.id IN ("
+            f"SELECT item_id FROM buckets WHERE kind = ? AND bucket IN ({', '.join('?' * len(buckets))}) "
+            f"GROUP BY item_id ORDER BY COUNT(*) DESC LIMIT ?)",
+            (kind, *buckets, MAX_CANDIDATES),
+        ).fetchall()
+        matches = []
+        for source, position, blob in rows:
+            if source == exclude_source:
+                continue
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= threshold:
+                matches.append(Match(score, source, position))
+        matches.sort(reverse=True)
+        return matches
+
+    def index_pages(self, digest: str, page_texts: Iterable[str], threshold: float = DEFAULT_THRESHOLD) -> Optional[int]:
+        """Index the pages of the PDF with content hash `digest`.
+
+        Returns how many of its pages nearly repeat a page of another PDF
+        already in the index, or None if this PDF was indexed before.
+        """
+        if self.has_source(PAGE, digest):
+            return None
+        items, duplicates = [], 0
+        for number, text in enumerate(page_texts, start=1):
+            signature = minhash(text)
+            if signature is None:
+                continue
+            if self.query(PAGE, signature, threshold, exclude_source=digest):
+                duplicates += 1
+            items.append((digest, number, signature))
+        self.add_many(PAGE, items)
+        return duplicates
+
+
+_shared_indexes: dict[str, NearDuplicateIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def get_near_duplicate_index(db_path: str = DEFAULT_DB_PATH) -> NearDuplicateIndex:
+    """Return the process-wide index for `db_path`, shared by every tool instance."""
+    with _shared_lock:
+        if db_path not in _shared_indexes:
+            _shared_indexes[db_path] = NearDuplicateIndex(db_path)
+        return _shared_indexes[db_path]
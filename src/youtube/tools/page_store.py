@@ -0,0 +1,120 @@
+import json
+import os
+import struct
+import threading
+from bisect import bisect_right
+from typing import Iterable, Iterator, NamedTuple
+
+# One index entry per page plus a trailing sentinel: byte offset of the
+# page's line in the JSONL file and the character offset of its text in the
+# concatenated book
+INDEX_ENTRY = struct.Struct('<QQ')
+
+
+class PageRecord(NamedTuple):
+    page: int
+    text: str
+    start: int
+    end: int
+
+
+def pages_path(text_path: str) -> str:
+    return text_path[:-4] + '.pages.jsonl' if text_path.endswith('.txt') else text_path + '.pages.jsonl'
+
+
+def index_path(jsonl_path: str) -> str:
+    return jsonl_path[:-6] + '.idx'
+
+
+def iter_page_records(page_texts: Iterable[str]) -> Iterator[PageRecord]:
+    """Number page texts from 1 and attach their character offsets in the book."""
+    offset = 0
+    for number, text in enumerate(page_texts, start=1):
+        yield PageRecord(number, text, offset, offset + len(text))
+        offset += len(text)
+
+
+def write_pages(page_texts: Iterable[str], text_path: str) -> str:
+    """Stream page texts to disk as they are produced.
+
+    Writes the plain `.txt` the agents consume alongside a `.pages.jsonl` file
+    of page records and its binary byte-offset index, one page at a time, so
+    the whole book is never held in memory. Workers extracting the same book
+    at once each write their own partial files; the last to finish publishes.
+    """
+    jsonl_path = pages_path(text_path)
+    suffix = f".{os.getpid()}-{threading.get_ident()}.part"
+    text_partial, jsonl_partial, index_partial = (
+        path + suffix for path in (text_path, jsonl_path, index_path(jsonl_path))
+    )
+    end = 0
+    try:
+        with open(text_partial, 'w', encoding='utf-8') as text_file, \
+                open(jsonl_partial, 'wb') as jsonl_file, \
+                open(index_partial, 'wb') as index_file:
+            for record in iter_page_records(page_texts):
+                index_file.write(INDEX_ENTRY.pack(jsonl_file.tell(), record.start))
+                jsonl_file.write(json.dumps(record._asdict(), ensure_ascii=False).encode('utf-8') + b'\n')
+                text_file.write(record.text)
+                end = record.end
+            index_file.write(INDEX_ENTRY.pack(jsonl_file.tell(), end))
+
+        # Publish the JSONL and index before the text file, whose presence marks the set complete
+        os.replace(jsonl_partial, jsonl_path)
+        os.replace(index_partial, index_path(jsonl_path))
+        os.replace(text_partial, text_path)
+    finally:
+        for partial in (text_partial, jsonl_partial, index_partial):
+            if os.path.exists(partial):
+                os.remove(partial)
+    return text_path
+
+
+class PageStore:
+    """Random access to the pages written by `write_pages` without loading the book."""
+
+    def __init__(self, jsonl_path: str):
+        self.path = jsonl_path
+        with open(index_path(jsonl_path), 'rb') as index_file:
+            entries = list(INDEX_ENTRY.iter_unpack(index_file.read()))
+        self._byte_offsets = [entry[0] for entry in entries]
+        self._char_offsets = [entry[1] for entry in entries]
+
+    @classmethod
+    def for_text(cls, text_path: str) -> 'PageStore':
+        return cls(pages_path(text_path))
+
+    def __len__(self) -> int:
+        return len(self._byte_offsets) - 1
+
+    @property
+    def total_chars(self) -> int:
+        return self._char_offsets[-1]
+
+    def pages(self, first: int = 1, last: int = None) -> Iterator[PageRecord]:
+        """Yield pages `first` to `last` inclusive (1-based), reading only their bytes."""
+        last = len(self) if last is None else min(last, len(self))
+        if first > last:
+            return
+        with open(self.path, 'rb') as jsonl_file:
+            jsonl_file.seek(self._byte_offsets[first - 1])
+            data = jsonl_file.read(self._byte_offsets[last] - self._byte_offsets[first - 1])
+        for line in data.splitlines():
+            yield PageRecord(**json.loads(line))
+
+    def page(self, number: int) -> PageRecord:
+        if not 1 <= number <= len(self):
+            raise IndexError(f"page {number} out of range 1..{len(self)}")
+        return next(self.pages(number, number))
+
+    def read_chars(self, start: int, stop: int) -> str:
+        """Return characters `start:stop` of the book, touching only the pages that hold them."""
+        stop = min(stop, self.total_chars)
+        if start >= stop:
+            return ""
+        first = bisect_right(self._char_offsets, start)
+        last = bisect_right(self._char_offsets, stop - 1)
+        parts = []
+        for record in self.pages(first, last):
+            parts.append(record.text[max(start - record.start, 0):stop - record.start])
+        return "".join(parts)
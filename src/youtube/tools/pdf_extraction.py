@@ -0,0 +1,90 @@
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import PyPDF2
+
+# Books shorter than this are extracted in-process; below it the cost of
+# starting workers and re-opening the PDF in each one outweighs the gain
+SERIAL_PAGE_THRESHOLD = 64
+
+# Each worker gets several contiguous page ranges so a few image-heavy
+# chapters do not leave the other workers idle at the end
+RANGES_PER_WORKER = 4
+
+
+@contextmanager
+def open_pdf(pdf_file_path: str):
+    """Open a PDF from disk as a memory-mapped PdfReader.
+
+    Pages are paged in by the OS as PyPDF2 touches them, so the book is
+    never copied into the Python heap as a whole.
+    """
+    with open(pdf_file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield PyPDF2.PdfReader(mapped)
+
+
+def count_pages(pdf_file_path: str) -> int:
+    with open_pdf(pdf_file_path) as pdf_reader:
+        return len(pdf_reader.pages)
+
+
+def extract_page_range(pdf_file_path: str, start: int, stop: int) -> list[str]:
+    """Extract the text of pages `start` to `stop` (exclusive), in order."""
+    with open_pdf(pdf_file_path) as pdf_reader:
+        return [pdf_reader.pages[number].extract_text() or "" for number in range(start, stop)]
+
+
+def split_page_range(page_count: int, parts: int) -> list[tuple[int, int]]:
+    """Split `range(page_count)` into at most `parts` contiguous, near-equal, non-empty ranges."""
+    if page_count <= 0:
+        return []
+    parts = max(1, min(parts, page_count))
+    size, remainder = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for index in range(parts):
+        stop = start + size + (1 if index < remainder else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def iter_page_texts(pdf_file_path: str, workers: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of every page of a PDF in page order, as it is extracted.
+
+    Page ranges are fanned out over a process pool with `workers` processes
+    (the CPU count by default). With one worker, or for PDFs under
+    SERIAL_PAGE_THRESHOLD pages, extraction runs serially in-process.
+    Only about one range per worker is extracted ahead of the consumer, so a
+    slow consumer holds the workers back instead of piling pages up in
+    memory, and closing the generator early cancels the ranges not started.
+    """
+    page_count = count_pages(pdf_file_path)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or page_count < SERIAL_PAGE_THRESHOLD:
+        with open_pdf(pdf_file_path) as pdf_reader:
+            for page in pdf_reader.pages:
+                yield page.extract_text() or ""
+        return
+
+    ranges = deque(split_page_range(page_count, workers * RANGES_PER_WORKER))
+    workers = min(workers, len(ranges))
+    pool = ProcessPoolExecutor(max_workers=workers)
+    finished = False
+    try:
+        # Futures are taken in submission order, so pages stay in book order
+        pending = deque(pool.submit(extract_page_range, pdf_file_path, *ranges.popleft()) for _ in range(workers))
+        while pending:
+            chunk = pending.popleft().result()
+            if ranges:
+                pending.append(pool.submit(extract_page_range, pdf_file_path, *ranges.popleft()))
+            yield from chunk
+        finished = True
+    finally:
+        # An early exit leaves at most one range per worker running; the rest are dropped
+        pool.shutdown(wait=finished, cancel_futures=True)
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from .. import tracing
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'rate_limits.sqlite3')
+
+# Set YOUTUBE_RATE_LIMITS=0 to send requests without waiting for tokens
+ENABLED_ENV = 'YOUTUBE_RATE_LIMITS'
+
+# Pause used when a 429 carries no usable Retry-After header
+DEFAULT_RETRY_AFTER = 5.0
+
+
+class EndpointLimit(NamedTuple):
+    """`rate` requests per second with bursts of up to `burst`, for URLs on `host` under `path_prefix`.
+
+    An empty `path_prefix` limits the whole API; a request takes a token from
+    every limit it matches, so endpoint limits nest inside API-wide ones.
+    """
+    host: str
+    path_prefix: str
+    rate: float
+    burst: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.host}{self.path_prefix}"
+
+
+# Kept below the published quotas so parallel workers back off before the APIs do
+DEFAULT_LIMITS = (
+    EndpointLimit('api.heygen.com', '', rate=10.0, burst=20),
+    EndpointLimit('api.heygen.com', '/v2/video/generate', rate=1.0, burst=3),
+    EndpointLimit('api.heygen.com', '/v1/video_status.get', rate=5.0, burst=10),
+    EndpointLimit('api2.heygen.com', '', rate=2.0, burst=4),
+    EndpointLimit('upload.heygen.com', '', rate=2.0, burst=4),
+    EndpointLimit('www.googleapis.com', '/upload/youtube/v3', rate=10.0, burst=20),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+def _refill(tokens: float, updated: float, now: float, limit: EndpointLimit) -> float:
+    return min(float(limit.burst), tokens + max(now - updated, 0.0) * limit.rate)
+
+
+class MemoryBucketStore:
+    """Token buckets shared by the threads and event loops of one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[str, list[float]] = {}
+
+    def reserve(self, limit: EndpointLimit, now: float) -> float:
+        """Take a token, possibly on credit, and return the seconds to wait before using it."""
+        with self._lock:
+            tokens, updated, blocked_until = self._buckets.get(limit.key, (float(limit.burst), now, 0.0))
+            start = max(now, blocked_until)
+            tokens = _refill(tokens, updated, start, limit) - 1
+            self._buckets[limit.key] = [tokens, start, blocked_until]
+            return start - now + max(-tokens, 0.0) / limit.rate
+
+    def block(self, limit: EndpointLimit, until: float) -> None:
+        """Stop handing out tokens for `limit` until `until`, after the API said to back off."""
+        with self._lock:
+            _, _, blocked_until = self._buckets.get(limit.key, (0.0, until, 0.0))
+            # One token is left for the first request once the pause is over
+            until = max(until, blocked_until)
+            self._buckets[limit.key] = [1.0, until, until]
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file, shared by every process on the host that uses the same path.
+
+    Each reservation is one IMMEDIATE transaction, so concurrent workers never
+    hand out the same token twice.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Opened on first use, so processes that only talk to unlimited hosts never create the file
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, limit: EndpointLimit, now: float) -> float:
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated, blocked_until FROM buckets WHERE key = ?", (limit.key,)
+            ).fetchone()
+            tokens, updated, blocked_until = row or (float(limit.burst), now, 0.0)
+            start = max(now, blocked_until)
+            tokens = _refill(tokens, updated, start, limit) - 1
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated, blocked_until) VALUES (?, ?, ?, ?)",
+                (limit.key, tokens, start, blocked_until),
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return start - now + max(-tokens, 0.0) / limit.rate
+
+    def block(self, limit: EndpointLimit, until: float) -> None:
+        self._conn().execute(
+            "INSERT INTO buckets (key, tokens, updated, blocked_until) VALUES (?, 1, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET tokens = 1, "
+            "updated = max(excluded.updated, blocked_until), blocked_until = max(excluded.blocked_until, blocked_until)",
+            (limit.key, until, until),
+        )
+
+
+class RateLimiter:
+    """Token-bucket limits per API and endpoint, applied before each request is sent."""
+
+    def __init__(self, limits: Iterable[EndpointLimit] = DEFAULT_LIMITS, store=None):
+        self.limits = tuple(limits)
+        self.store = store if store is not None else MemoryBucketStore()
+
+    def limits_for(self, url: str) -> list[EndpointLimit]:
+        parsed = urlparse(url)
+        return [
+            limit for limit in self.limits
+            if parsed.hostname == limit.host and parsed.path.startswith(limit.path_prefix)
+        ]
+
+    def reserve(self, url: str) -> float:
+        """Take a token from every limit `url` matches; return how long to wait before sending."""
+        if os.getenv(ENABLED_ENV, '1') == '0':
+            return 0.0
+        now = time.time()
+        wait = max((self.store.reserve(limit, now) for limit in self.limits_for(url)), default=0.0)
+        if wait > 0:
+            tracing.add('ratelimit.waits')
+            tracing.add('ratelimit.wait_s', wait)
+        return wait
+
+    def acquire(self, url: str) -> None:
+        """Block the calling thread until a request to `url` is within its limits."""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str) -> None:
+        """Like `acquire`, but yields to the event loop while waiting."""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def throttled(self, url: str, retry_after: Optional[str]) -> float:
+        """Record a 429 for `url`: pause its buckets for every caller and return the pause in seconds."""
+        pause = parse_retry_after(retry_after)
+        until = time.time() + pause
+        for limit in self.limits_for(url):
+            self.store.block(limit, until)
+        tracing.add('http.throttled')
+        return pause
+
+
+def parse_retry_after(value: Optional[str], default: float = DEFAULT_RETRY_AFTER) -> float:
+    """Seconds to wait from a Retry-After header, given as seconds or an HTTP date."""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter, backed by the host-wide SQLite store."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(store=SQLiteBucketStore())
+        return _shared_limiter
+
+
+def configure_rate_limits(
+    limits: Iterable[EndpointLimit] = DEFAULT_LIMITS,
+    db_path: Optional[str] = DEFAULT_DB_PATH,
+) -> RateLimiter:
+    """Replace the shared limiter; `db_path=None` keeps the buckets in this process only."""
+    global _shared_limiter
+    with _shared_lock:
+        store = SQLiteBucketStore(db_path) if db_path else MemoryBucketStore()
+        _shared_limiter = RateLimiter(limits, store=store)
+        return _shared_limiter
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+from ..settings import HeyGenSettings
+from .manifest_file import load_json, manifest_lock, save_json
+
+DEFAULT_MAX_BYTES = 20 * 1024**3
+MANIFEST_NAME = 'manifest.json'
+# Lookups append "<key> <time>" here instead of rewriting the manifest
+USES_NAME = 'uses.log'
+
+# Settings that change what a render looks or sounds like; the API key and
+# podcast-only fields do not
+RENDER_FIELDS = (
+    'avatar_id', 'avatar_style', 'talking_style', 'expression',
+    'voice_id', 'voice_speed', 'voice_pitch', 'voice_emotion', 'locale',
+    'background_color', 'width', 'height', 'caption',
+)
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace and Unicode form do not change the spoken words, so they do not change the key."""
+    return " ".join(unicodedata.normalize('NFC', text).split())
+
+
+def render_profile_key(settings: HeyGenSettings) -> str:
+    """Hash of the settings that shape a render, without the text."""
+    material = {name: getattr(settings, name) for name in RENDER_FIELDS}
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def render_key(text: str, settings: HeyGenSettings) -> str:
+    material = {'text': normalize_text(text), **{name: getattr(settings, name) for name in RENDER_FIELDS}}
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    partial_path = f"{target}.{os.getpid()}-{threading.get_ident()}.part"
+    try:
+        try:
+            os.link(source, partial_path)
+        except OSError:
+            shutil.copyfile(source, partial_path)
+        os.replace(partial_path, target)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+class RenderCache:
+    """Finished HeyGen renders keyed by a hash of the segment text and render profile.
+
+    A segment whose normalized text, avatar, voice, dimension and background
+    were rendered before is served from here instead of being submitted
+    again. Files are hard-linked in and out where the filesystem allows, so
+    evicting a cache entry never removes a video an episode still uses. A
+    JSON manifest records each entry's HeyGen video_id, size and last use
+    for least-recently-used eviction beyond `max_bytes`. Changes to it hold
+    its lock, so several processes can share the cache; lookups only append
+    to a log of uses, which the next change folds into the manifest.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.uses_path = os.path.join(root, USES_NAME)
+
+    def video_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.mp4")
+
+    def thumbnail_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.jpg")
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Return the manifest entry for `key` if its video is still on disk."""
+        # The manifest is replaced in one step, so it can be read without the lock
+        entry = load_json(self.manifest_path, {'entries': {}})['entries'].get(key)
+        if entry is None or not os.path.exists(self.video_path(key)):
+            return None
+        with self._locked(), open(self.uses_path, 'a', encoding='utf-8') as uses:
+            uses.write(f"{key} {time.time()}\n")
+        return entry
+
+    def materialize(self, key: str, video_path: str, thumbnail_path: str) -> None:
+        """Place the cached render for `key` at `video_path` and `thumbnail_path`."""
+        _link_or_copy(self.video_path(key), video_path)
+        if os.path.exists(self.thumbnail_path(key)):
+            _link_or_copy(self.thumbnail_path(key), thumbnail_path)
+
+    def store(
+        self, key: str, video_path: str, thumbnail_path: str, video_id: str, sha256: str, text: str = ''
+    ) -> None:
+        """Add a finished render to the cache and evict old ones if over budget."""
+        _link_or_copy(video_path, self.video_path(key))
+        if thumbnail_path and os.path.exists(thumbnail_path):
+            _link_or_copy(thumbnail_path, self.thumbnail_path(key))
+        size = sum(os.path.getsize(path) for path in self.object_paths(key) if os.path.exists(path))
+        with self._locked():
+            manifest = self._load()
+            now = time.time()
+            manifest['entries'][key] = {
+                'video_id': video_id,
+                'sha256': sha256,
+                'size': size,
+                'created': now,
+                'last_used': now,
+                'hits': 0,
+                'text': normalize_text(text)[:80],
+            }
+            self._evict(manifest, keep=key)
+            self._save(manifest)
+
+    def entries(self) -> dict:
+        with self._locked():
+            return self._load()['entries']
+
+    def total_bytes(self) -> int:
+        return sum(entry['size'] for entry in self.entries().values())
+
+    def clear(self) -> int:
+        """Remove every cached render; returns how many were removed."""
+        with self._locked():
+            manifest = self._load()
+            for key in manifest['entries']:
+                self._remove(key)
+            count = len(manifest['entries'])
+            manifest['entries'] = {}
+            self._save(manifest)
+            return count
+
+    def object_paths(self, key: str) -> list[str]:
+        return [self.video_path(key), self.thumbnail_path(key)]
+
+    def _remove(self, key: str) -> None:
+        for path in self.object_paths(key):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _evict(self, manifest: dict, keep: str) -> None:
+        entries = manifest['entries']
+        total = sum(entry['size'] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._remove(key)
+            total -= entries.pop(key)['size']
+
+    def _locked(self):
+        os.makedirs(self.root, exist_ok=True)
+        return manifest_lock(self.manifest_path)
+
+    def _load(self) -> dict:
+        """The manifest with the uses logged since it was last saved; call with the lock held."""
+        manifest = load_json(self.manifest_path, {'entries': {}})
+        try:
+            with open(self.uses_path, 'r', encoding='utf-8') as uses:
+                for line in uses:
+                    key, _, used = line.partition(' ')
+                    entry = manifest['entries'].get(key)
+                    # A line cut short by a crash is skipped
+                    if entry is not None and used.strip():
+                        entry['last_used'] = max(entry['last_used'], float(used))
+                        entry['hits'] = entry.get('hits', 0) + 1
+        except FileNotFoundError:
+            pass
+        return manifest
+
+    def _save(self, manifest: dict) -> None:
+        save_json(self.manifest_path, manifest)
+        # Those uses are in the manifest now
+        if os.path.exists(self.uses_path):
+            os.remove(self.uses_path)
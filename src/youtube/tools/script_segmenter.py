@@ -0,0 +1,80 @@
+import re
+from typing import Iterable, Iterator, Optional
+
+# HeyGen rejects v2/video/generate voice inputs longer than this many characters
+HEYGEN_INPUT_LIMIT = 5000
+
+# A sentence ends at ., ! or ? (optionally followed by closing quotes or
+# brackets) and is separated from the next one by whitespace
+_SENTENCE_END = re.compile(r'(?<=[.!?])["\'\)\]]*\s+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def split_sentences(text: str) -> list[str]:
+    return [sentence for sentence in map(_normalize, _SENTENCE_END.split(text)) if sentence]
+
+
+def _split_long(sentence: str, max_chars: int) -> Iterator[str]:
+    """Cut a sentence that alone exceeds `max_chars` at word boundaries."""
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(' ', 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        yield sentence[:cut].rstrip()
+        sentence = sentence[cut:].lstrip()
+    if sentence:
+        yield sentence
+
+
+def iter_segments(texts: Iterable[str], max_chars: int = HEYGEN_INPUT_LIMIT) -> Iterator[str]:
+    """Pack a stream of text (e.g. pages) into sentence-aligned segments of at most `max_chars`.
+
+    Pieces of text are joined exactly as the extracted `.txt` is, and a
+    sentence that runs over a page break is carried into the next piece
+    before being placed. Sentences are only cut when a single one is longer
+    than `max_chars`.
+    """
+    carry = ""
+    segment = ""
+    for text in texts:
+        pieces = _SENTENCE_END.split(carry + text)
+        # The last sentence may continue in the next piece of text; it is kept
+        # as extracted so whitespace at the break still separates the words
+        carry = pieces.pop()
+        sentences = [sentence for sentence in map(_normalize, pieces) if sentence]
+        if len(_normalize(carry)) > max_chars:
+            *complete, last = _split_long(_normalize(carry), max_chars)
+            sentences.extend(complete)
+            carry = last + " " if carry[-1:].isspace() else last
+        for sentence in sentences:
+            for piece in _split_long(sentence, max_chars):
+                if segment and len(segment) + 1 + len(piece) > max_chars:
+                    yield segment
+                    segment = ""
+                segment = f"{segment} {piece}" if segment else piece
+    for piece in _split_long(_normalize(carry), max_chars):
+        if segment and len(segment) + 1 + len(piece) > max_chars:
+            yield segment
+            segment = ""
+        segment = f"{segment} {piece}" if segment else piece
+    if segment:
+        yield segment
+
+
+def take_chars(texts: Iterable[str], limit: Optional[int]) -> Iterator[str]:
+    """The first `limit` characters of a stream of text, or all of it when `limit` is None."""
+    for text in texts:
+        if limit is not None:
+            if limit <= 0:
+                return
+            text = text[:limit]
+            limit -= len(text)
+        yield text
+
+
+def segment_text(text: str, max_chars: int = HEYGEN_INPUT_LIMIT) -> list[str]:
+    return list(iter_segments([text], max_chars=max_chars))
@@ -0,0 +1,236 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from crewai import LLM
+
+from .. import tracing
+from .memoize import ENABLED_ENV, ToolResultCache, get_tool_cache
+from .page_store import PageRecord, PageStore, pages_path
+
+# Rough size of a token in English prose; good enough to stay inside budgets
+CHARS_PER_TOKEN = 4
+WORDS_PER_MINUTE = 150
+DEFAULT_EPISODE_MINUTES = 10.0
+
+# Book text sent per map call, and summaries combined per reduce call
+CHUNK_TOKENS = 6000
+REDUCE_TOKENS = 12000
+SUMMARY_WORDS = 250
+MAX_CONCURRENCY = 8
+CACHE_TTL = 30 * 24 * 60 * 60
+# Bump when the prompts change so cached summaries are not reused
+PROMPT_VERSION = 1
+
+# Sends a prompt to an LLM and returns its reply
+Completion = Callable[[str], str]
+
+MAP_PROMPT = """Summarize pages {first}-{last} of a B2B sales book for a podcast host.
+Keep the concrete advice, frameworks, examples and numbers; drop filler.
+Answer in about {words} words of plain prose.
+
+{text}"""
+
+REDUCE_PROMPT = """Merge these consecutive section summaries of a B2B sales book into one summary.
+Keep the order of ideas and every distinct piece of advice.
+Answer in about {words} words of plain prose.
+
+{text}"""
+
+SCRIPT_PROMPT = """Write the spoken script of a {minutes:g}-minute B2B sales podcast episode based on these summaries of a book.
+It is read aloud by one host, so use plain sentences without headings, lists or stage directions.
+Write about {words} words.
+
+{text}"""
+
+
+class Chunk(NamedTuple):
+    first_page: int
+    last_page: int
+    text: str
+
+
+def script_target_chars(episode_minutes: float) -> int:
+    """Characters of text that fill `episode_minutes`; books up to this size are read as they are."""
+    return int(episode_minutes * WORDS_PER_MINUTE) * 6
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_pages(pages: Iterable[PageRecord], max_tokens: int = CHUNK_TOKENS) -> Iterator[Chunk]:
+    """Group consecutive pages into chunks of at most `max_tokens`; longer pages are split."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    first, parts, size = None, [], 0
+    for record in pages:
+        for start in range(0, max(len(record.text), 1), max_chars):
+            text = record.text[start:start + max_chars]
+            if parts and size + len(text) > max_chars:
+                yield Chunk(first, last, "".join(parts))
+                first, parts, size = None, [], 0
+            if first is None:
+                first = record.page
+            last = record.page
+            parts.append(text)
+            size += len(text)
+    if parts and size:
+        yield Chunk(first, last, "".join(parts))
+
+
+def iter_text_pages(text_path: str, page_chars: int = 3000) -> Iterator[PageRecord]:
+    """Pages of a book text: the records `write_pages` stored, or fixed windows of a plain `.txt`."""
+    if os.path.exists(pages_path(text_path)):
+        store = PageStore.for_text(text_path)
+        # A batch of pages at a time keeps memory flat on long books
+        for first in range(1, len(store) + 1, 64):
+            yield from store.pages(first, first + 63)
+        return
+    with open(text_path, 'r', encoding='utf-8') as f:
+        offset = 0
+        for number, text in enumerate(iter(lambda: f.read(page_chars), ''), start=1):
+            yield PageRecord(number, text, offset, offset + len(text))
+            offset += len(text)
+
+
+class LLMCompletion:
+    """Completion through crewAI's LLM, using the MODEL environment variable like the agents do."""
+
+    def __init__(self, model: Optional[str] = None):
+        self.llm = LLM(model=model or os.getenv('MODEL', 'gpt-4o-mini'))
+
+    def __call__(self, prompt: str) -> str:
+        return self.llm.call(prompt)
+
+    def token_usage(self) -> dict:
+        """Tokens used by every call so far, in the keys of a crew's token_usage."""
+        summary = getattr(self.llm, 'get_token_usage_summary', None)
+        return summary().model_dump() if summary else {}
+
+
+def llm_completion(model: Optional[str] = None) -> Completion:
+    return LLMCompletion(model)
+
+
+class ScriptSummarizer:
+    """Map-reduce summarization of a long book text into an episode-length script.
+
+    Chunks of pages are summarized in parallel, the summaries are merged
+    level by level until they fit one prompt, and a last call writes the
+    script at `WORDS_PER_MINUTE`. Every call is cached by a hash of its
+    prompt, so re-running a book, or a book that shares chapters with an
+    earlier one, only pays for the parts that changed.
+    """
+
+    def __init__(
+        self,
+        complete: Completion,
+        model_id: str = '',
+        chunk_tokens: int = CHUNK_TOKENS,
+        reduce_tokens: int = REDUCE_TOKENS,
+        summary_words: int = SUMMARY_WORDS,
+        max_concurrency: int = MAX_CONCURRENCY,
+        cache: Optional[ToolResultCache] = None,
+    ):
+        self.complete = complete
+        self.model_id = model_id
+        self.chunk_tokens = chunk_tokens
+        self.reduce_tokens = reduce_tokens
+        self.summary_words = summary_words
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        # Tokens the last summary cost, when `complete` reports them
+        self.token_usage: dict = {}
+
+    def summarize(self, text_path: str, episode_minutes: float = DEFAULT_EPISODE_MINUTES) -> str:
+        """Return a script of about `episode_minutes` for the book in `text_path`."""
+        return self.summarize_pages(iter_text_pages(text_path), episode_minutes)
+
+    def summarize_pages(self, pages: Iterable[PageRecord], episode_minutes: float = DEFAULT_EPISODE_MINUTES) -> str:
+        """Return a script of about `episode_minutes` for a book given as a stream of pages.
+
+        Each chunk is sent to the LLM as soon as its last page arrives, so the
+        map calls overlap a parser that is still extracting the book. The
+        tokens the calls used are added to the current span as `llm.*`
+        counters and kept in `token_usage`.
+        """
+        usage_before = self._usage()
+        try:
+            return self._summarize_pages(pages, episode_minutes)
+        finally:
+            self.token_usage = {key: value - usage_before.get(key, 0) for key, value in self._usage().items()}
+            for key, value in self.token_usage.items():
+                tracing.add(f"llm.{key}", value)
+
+    def _usage(self) -> dict:
+        usage = getattr(self.complete, 'token_usage', None)
+        return usage() if usage else {}
+
+    def _summarize_pages(self, pages: Iterable[PageRecord], episode_minutes: float) -> str:
+        words = int(episode_minutes * WORDS_PER_MINUTE)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            summaries = list(pool.map(
+                tracing.in_current_context(self._summarize_chunk),
+                chunk_pages(pages, self.chunk_tokens),
+            ))
+            tracing.add('summarize.chunks', len(summaries))
+            while len(summaries) > 1 and sum(map(estimate_tokens, summaries)) > self.reduce_tokens:
+                summaries = list(pool.map(tracing.in_current_context(self._merge), self._reduce_groups(summaries)))
+                tracing.add('summarize.reduce_levels')
+        return self._complete(SCRIPT_PROMPT.format(minutes=episode_minutes, words=words, text="\n\n".join(summaries)))
+
+    def write_script(self, text_path: str, episode_minutes: float = DEFAULT_EPISODE_MINUTES) -> str:
+        """Write the script next to the book text and return its path.
+
+        A book already shorter than the episode is returned unchanged,
+        without calling the LLM.
+        """
+        if os.path.getsize(text_path) <= script_target_chars(episode_minutes):
+            return text_path
+        base = text_path[:-4] if text_path.endswith('.txt') else text_path
+        script_path = f"{base}.script-{episode_minutes:g}m.txt"
+        script = self.summarize(text_path, episode_minutes)
+        with open(script_path + '.part', 'w', encoding='utf-8') as f:
+            f.write(script.strip() + "\n")
+        os.replace(script_path + '.part', script_path)
+        return script_path
+
+    def _summarize_chunk(self, chunk: Chunk) -> str:
+        return self._complete(MAP_PROMPT.format(
+            first=chunk.first_page, last=chunk.last_page, words=self.summary_words, text=chunk.text
+        ))
+
+    def _merge(self, group: list[str]) -> str:
+        return self._complete(REDUCE_PROMPT.format(words=self.summary_words * 2, text="\n\n".join(group)))
+
+    def _reduce_groups(self, summaries: list[str]) -> list[list[str]]:
+        """Split summaries into runs that fit `reduce_tokens`, each of at least two so every level shrinks."""
+        groups, current, size = [], [], 0
+        for summary in summaries:
+            tokens = estimate_tokens(summary)
+            if len(current) >= 2 and size + tokens > self.reduce_tokens:
+                groups.append(current)
+                current, size = [], 0
+            current.append(summary)
+            size += tokens
+        if len(current) == 1 and groups:
+            groups[-1].append(current[0])
+        elif current:
+            groups.append(current)
+        return groups
+
+    def _complete(self, prompt: str) -> str:
+        if os.getenv(ENABLED_ENV, '1') == '0':
+            tracing.add('llm.calls')
+            return self.complete(prompt)
+        key = hashlib.sha256(f"{PROMPT_VERSION}\0{self.model_id}\0{prompt}".encode('utf-8')).hexdigest()
+        cache = self.cache if self.cache is not None else get_tool_cache()
+        hit, value = cache.get(key)
+        if hit:
+            tracing.add('cache.hits')
+            return value
+        tracing.add('llm.calls')
+        value = self.complete(prompt)
+        cache.set(key, type(self).__name__, value, CACHE_TTL)
+        return value
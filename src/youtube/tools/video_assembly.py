@@ -0,0 +1,92 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Optional
+
+
+class VideoAssemblyError(Exception):
+    """Raised when ffmpeg/ffprobe are missing or fail to assemble an episode."""
+
+
+def _binary(name: str) -> str:
+    path = shutil.which(name)
+    if path is None:
+        raise VideoAssemblyError(f"{name} not found on PATH; it is required to assemble video segments")
+    return path
+
+
+def probe_duration(video_path: str) -> float:
+    """Return the container duration of `video_path` in seconds."""
+    result = subprocess.run(
+        [_binary('ffprobe'), '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=nw=1:nk=1', video_path],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise VideoAssemblyError(f"ffprobe failed on {video_path}: {result.stderr.strip()}")
+    return float(result.stdout.strip())
+
+
+def _concat_entry(path: str) -> str:
+    # The concat demuxer quotes with single quotes; embedded ones are closed, escaped and reopened
+    return "file '" + os.path.abspath(path).replace("'", "'\\''") + "'\n"
+
+
+def _chapter_metadata(parts: list[tuple[str, str]]) -> str:
+    lines = [';FFMETADATA1']
+    start = 0
+    for title, path in parts:
+        end = start + int(round(probe_duration(path) * 1000))
+        lines += ['[CHAPTER]', 'TIMEBASE=1/1000', f'START={start}', f'END={end}', f'title={title}']
+        start = end
+    return '\n'.join(lines) + '\n'
+
+
+def concat_segments(
+    segment_paths: list[str],
+    output_path: str,
+    intro_path: Optional[str] = None,
+    outro_path: Optional[str] = None,
+    chapters: bool = True,
+) -> str:
+    """Join rendered MP4 segments into one episode by stream copy, without re-encoding.
+
+    Optional intro/outro bumpers are spliced in the same pass; like the
+    segments, they must share codec, resolution and frame rate, which holds
+    for renders from one HeyGen profile. With `chapters`, a chapter marker is
+    written at every segment boundary.
+    """
+    if not segment_paths:
+        raise VideoAssemblyError("no segments to assemble")
+
+    parts = []
+    if intro_path:
+        parts.append(('Intro', intro_path))
+    parts += [(f'Segment {number}', path) for number, path in enumerate(segment_paths, start=1)]
+    if outro_path:
+        parts.append(('Outro', outro_path))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        list_path = os.path.join(work_dir, 'segments.txt')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.writelines(_concat_entry(path) for _, path in parts)
+
+        command = [_binary('ffmpeg'), '-y', '-hide_banner', '-loglevel', 'error',
+                   '-f', 'concat', '-safe', '0', '-i', list_path]
+        if chapters:
+            metadata_path = os.path.join(work_dir, 'chapters.txt')
+            with open(metadata_path, 'w', encoding='utf-8') as f:
+                f.write(_chapter_metadata(parts))
+            command += ['-i', metadata_path, '-map', '0', '-map_metadata', '1', '-map_chapters', '1']
+        # Stream copy only; faststart moves the index up front for progressive playback
+        partial_path = output_path + '.part'
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        command += ['-c', 'copy', '-movflags', '+faststart', '-f', 'mp4', partial_path]
+
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise VideoAssemblyError(f"ffmpeg concat failed: {result.stderr.strip()}")
+        os.replace(partial_path, output_path)
+    return output_path
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Optional
+
+import requests
+
+from .http_client import get_session
+
+UPLOAD_BASE_URL = "https://www.googleapis.com/upload/youtube/v3"
+
+# YouTube requires every chunk except the last to be a multiple of 256 KiB
+CHUNK_GRANULARITY = 256 * 1024
+DEFAULT_CHUNK_SIZE = 32 * CHUNK_GRANULARITY  # 8 MiB
+
+MAX_RETRIES = 8
+MAX_BACKOFF = 64.0
+RETRIABLE_STATUS_CODES = {500, 502, 503, 504}
+
+
+class UploadError(Exception):
+    """Raised when YouTube rejects an upload or retries are exhausted."""
+
+
+class ResumableUploader:
+    """Chunked uploads over the YouTube Data API resumable protocol.
+
+    The session URI of every upload in progress is persisted under
+    `session_dir`, keyed by the video file's path, size and mtime, so an
+    upload interrupted by a crash picks up from the last byte YouTube
+    acknowledged instead of starting over. Chunks that fail with a 5xx or a
+    dropped connection are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        session_dir: str,
+        base_url: str = UPLOAD_BASE_URL,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_retries: int = MAX_RETRIES,
+    ):
+        if chunk_size <= 0 or chunk_size % CHUNK_GRANULARITY:
+            raise ValueError(f"chunk_size must be a positive multiple of {CHUNK_GRANULARITY} bytes")
+        self.access_token = access_token
+        self.session_dir = session_dir
+        self.base_url = base_url.rstrip('/')
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+
+    def upload_video(self, video_file_path: str, metadata: dict) -> dict:
+        """Upload `video_file_path` with `metadata` (snippet/status) and return YouTube's video resource."""
+        total = os.path.getsize(video_file_path)
+        if total == 0:
+            raise UploadError(f"{video_file_path} is empty")
+        session_file = self._session_file(video_file_path)
+
+        session_uri = self._load_session(session_file)
+        offset = None
+        if session_uri:
+            offset = self._query_offset(session_uri, total)
+            if isinstance(offset, dict):
+                os.remove(session_file)
+                return offset
+        if offset is None:
+            # No session, or the saved one has expired: start a new upload
+            session_uri = self._start_session(metadata, total)
+            self._save_session(session_file, session_uri)
+            offset = 0
+
+        with open(video_file_path, 'rb') as video_file:
+            while True:
+                video_file.seek(offset)
+                chunk = video_file.read(self.chunk_size)
+                if not chunk:
+                    raise UploadError(f"YouTube asked for byte {offset} of a {total}-byte file")
+                result = self._put_chunk(session_uri, chunk, offset, total)
+                if isinstance(result, dict):
+                    os.remove(session_file)
+                    return result
+                # A server that keeps acknowledging the same range would loop forever
+                if result <= offset:
+                    raise UploadError(f"Upload made no progress past byte {offset} of {total}")
+                offset = result
+
+    def upload_thumbnail(self, video_id: str, thumbnail_path: str) -> dict:
+        with open(thumbnail_path, 'rb') as f:
+            image = f.read()
+        content_type = 'image/png' if thumbnail_path.lower().endswith('.png') else 'image/jpeg'
+        response = self._with_retries(
+            lambda: get_session().post(
+                f"{self.base_url}/thumbnails/set",
+                params={'videoId': video_id},
+                headers={**self._auth_headers(), 'Content-Type': content_type},
+                data=image,
+            )
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _start_session(self, metadata: dict, total: int) -> str:
+        response = self._with_retries(
+            lambda: get_session().post(
+                f"{self.base_url}/videos",
+                params={'uploadType': 'resumable', 'part': ','.join(metadata)},
+                headers={
+                    **self._auth_headers(),
+                    'Content-Type': 'application/json; charset=UTF-8',
+                    'X-Upload-Content-Length': str(total),
+                    'X-Upload-Content-Type': 'video/mp4',
+                },
+                json=metadata,
+            )
+        )
+        response.raise_for_status()
+        return response.headers['Location']
+
+    def _query_offset(self, session_uri: str, total: int):
+        """Ask YouTube how much of an earlier session it has.
+
+        Returns the next byte offset, the finished video resource if the
+        upload had already completed, or None if the session is gone.
+        """
+        response = self._with_retries(
+            lambda: get_session().put(session_uri, headers={**self._auth_headers(), 'Content-Range': f'bytes */{total}'})
+        )
+        if response.status_code in (200, 201):
+            return response.json()
+        if response.status_code == 308:
+            return self._next_offset(response)
+        if response.status_code in (404, 410):
+            return None
+        raise UploadError(f"Unexpected status {response.status_code} resuming upload: {response.text}")
+
+    def _put_chunk(self, session_uri: str, chunk: bytes, offset: int, total: int):
+        end = offset + len(chunk) - 1
+
+        def put():
+            return get_session().put(
+                session_uri,
+                headers={**self._auth_headers(), 'Content-Length': str(len(chunk)), 'Content-Range': f'bytes {offset}-{end}/{total}'},
+                data=chunk,
+            )
+
+        try:
+            response = self._with_retries(put)
+        except UploadError:
+            # Retries exhausted mid-chunk; the server may still have part of it
+            offset = self._query_offset(session_uri, total)
+            if offset is None:
+                raise
+            return offset
+        if response.status_code in (200, 201):
+            return response.json()
+        if response.status_code == 308:
+            return self._next_offset(response)
+        raise UploadError(f"Upload rejected with status {response.status_code}: {response.text}")
+
+    def _with_retries(self, send) -> requests.Response:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = send()
+                if response.status_code not in RETRIABLE_STATUS_CODES:
+                    return response
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+            if attempt == self.max_retries:
+                break
+            time.sleep(min(2 ** attempt, MAX_BACKOFF) * random.uniform(0.5, 1.0))
+        raise UploadError(f"Giving up after {self.max_retries} retries: {error}")
+
+    @staticmethod
+    def _next_offset(response: requests.Response) -> int:
+        # "Range: bytes=0-N" lists what the server has; no header means nothing yet
+        received = response.headers.get('Range')
+        return int(received.rsplit('-', 1)[1]) + 1 if received else 0
+
+    def _auth_headers(self) -> dict:
+        return {'Authorization': f"Bearer {self.access_token}"}
+
+    def _session_file(self, video_file_path: str) -> str:
+        stat = os.stat(video_file_path)
+        key = f"{os.path.abspath(video_file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return os.path.join(self.session_dir, hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '.json')
+
+    @staticmethod
+    def _load_session(session_file: str) -> Optional[str]:
+        try:
+            with open(session_file, 'r', encoding='utf-8') as f:
+                return json.load(f)['session_uri']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def _save_session(self, session_file: str, session_uri: str) -> None:
+        os.makedirs(self.session_dir, exist_ok=True)
+        with open(session_file, 'w', encoding='utf-8') as f:
+            json.dump({'session_uri': session_uri, 'created_at': time.time()}, f)
@@ -0,0 +1,254 @@
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+DEFAULT_TRACE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'traces')
+
+# Counters shown as columns of the summary table, in this order
+SUMMARY_COUNTERS = (
+    ('http.requests', 'HTTP'),
+    ('http.bytes_received', 'bytes in'),
+    ('http.bytes_sent', 'bytes out'),
+    ('heygen.poll_iterations', 'polls'),
+    ('llm.total_tokens', 'tokens'),
+    ('cache.hits', 'cache hits'),
+)
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Optional[dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.counters: dict[str, float] = defaultdict(float)
+        self.status = 'ok'
+        self._lock = threading.Lock()
+
+    @property
+    def duration_s(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def add(self, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[counter] += amount
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_s': round(self.duration_s, 6),
+            'status': self.status,
+            'attributes': self.attributes,
+            'counters': dict(self.counters),
+        }
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('current_span', default=None)
+
+
+class Tracer:
+    """Collects spans for one process run: tool calls, crew tasks, pipeline stages.
+
+    Each span carries wall time plus counters (HTTP requests and bytes,
+    HeyGen poll iterations, LLM tokens, cache hits) added while it is the
+    current span. Spans are exported as JSONL and as OTLP/JSON, the
+    OpenTelemetry wire format, and summarised as a table per span name.
+    """
+
+    def __init__(self, service_name: str = 'youtube'):
+        self.service_name = service_name
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        # Counters recorded outside any span (e.g. on the HeyGen poller's loop)
+        self.unattributed: dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = _current_span.get()
+        span = Span(name, self.trace_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = 'error'
+            span.attributes['error'] = str(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            with self._lock:
+                self.spans.append(span)
+
+    def record_span(self, name: str, start_ns: int, end_ns: int, counters: Optional[dict] = None, **attributes) -> Span:
+        """Add a span measured elsewhere, e.g. a crew task reported through its callback."""
+        parent = _current_span.get()
+        span = Span(name, self.trace_id, parent.span_id if parent else None, attributes)
+        span.start_ns, span.end_ns = start_ns, end_ns
+        for counter, amount in (counters or {}).items():
+            span.add(counter, amount)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def add(self, counter: str, amount: float = 1) -> None:
+        span = _current_span.get()
+        if span is not None:
+            span.add(counter, amount)
+        else:
+            with self._lock:
+                self.unattributed[counter] += amount
+
+    def export_jsonl(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in sorted(self.spans, key=lambda s: s.start_ns):
+                f.write(json.dumps(span.to_dict(), default=str) + '\n')
+        return path
+
+    def export_otlp(self, path: str) -> str:
+        """Write spans as an OTLP/JSON ExportTraceServiceRequest, loadable by OpenTelemetry collectors."""
+        def attribute(key, value):
+            if isinstance(value, bool):
+                return {'key': key, 'value': {'boolValue': value}}
+            if isinstance(value, int):
+                return {'key': key, 'value': {'intValue': str(value)}}
+            if isinstance(value, float):
+                return {'key': key, 'value': {'doubleValue': value}}
+            return {'key': key, 'value': {'stringValue': str(value)}}
+
+        otlp_spans = []
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            otlp_span = {
+                'traceId': span.trace_id,
+                'spanId': span.span_id,
+                'name': span.name,
+                'kind': 1,
+                'startTimeUnixNano': str(span.start_ns),
+                'endTimeUnixNano': str(span.end_ns or span.start_ns),
+                'attributes': [attribute(k, v) for k, v in {**span.attributes, **span.counters}.items()],
+                'status': {'code': 2 if span.status == 'error' else 1},
+            }
+            if span.parent_id:
+                otlp_span['parentSpanId'] = span.parent_id
+            otlp_spans.append(otlp_span)
+        payload = {
+            'resourceSpans': [{
+                'resource': {'attributes': [attribute('service.name', self.service_name)]},
+                'scopeSpans': [{'scope': {'name': 'youtube.tracing'}, 'spans': otlp_spans}],
+            }]
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        return path
+
+    def export(self, trace_dir: str = DEFAULT_TRACE_DIR) -> tuple[str, str]:
+        stem = os.path.join(trace_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{self.trace_id[:8]}")
+        return self.export_jsonl(stem + '.jsonl'), self.export_otlp(stem + '.otlp.json')
+
+    def summary_table(self) -> str:
+        rows: dict[str, dict] = {}
+        for span in self.spans:
+            row = rows.setdefault(span.name, {'count': 0, 'wall': 0.0, **{c: 0.0 for c, _ in SUMMARY_COUNTERS}})
+            row['count'] += 1
+            row['wall'] += span.duration_s
+            for counter, _ in SUMMARY_COUNTERS:
+                row[counter] += span.counters.get(counter, 0)
+        if any(self.unattributed.values()):
+            rows['(outside spans)'] = {'count': 0, 'wall': 0.0, **{c: self.unattributed.get(c, 0) for c, _ in SUMMARY_COUNTERS}}
+
+        headers = ['span', 'n', 'wall s'] + [label for _, label in SUMMARY_COUNTERS]
+        lines = [[name, str(row['count']), f"{row['wall']:.2f}"] + [f"{row[c]:.0f}" for c, _ in SUMMARY_COUNTERS]
+                 for name, row in sorted(rows.items(), key=lambda item: -item[1]['wall'])]
+        totals = ['TOTAL', '', ''] + [f"{sum(row[c] for row in rows.values()):.0f}" for c, _ in SUMMARY_COUNTERS]
+        widths = [max(len(line[i]) for line in [headers, totals] + lines) for i in range(len(headers))]
+
+        def fmt(line):
+            return '  '.join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(line))
+
+        return '\n'.join([fmt(headers), fmt(['-' * w for w in widths])] + [fmt(line) for line in lines] + [fmt(totals)])
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str, **attributes):
+    return _tracer.span(name, **attributes)
+
+
+def add(counter: str, amount: float = 1) -> None:
+    _tracer.add(counter, amount)
+
+
+def traced(name: Optional[str] = None):
+    """Record every call of a tool's `_run` (or any method) as a span named after its class."""
+    def decorator(run):
+        @functools.wraps(run)
+        def wrapper(self, *args, **kwargs):
+            with _tracer.span(name or f"tool.{type(self).__name__}"):
+                return run(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def in_current_context(fn: Callable) -> Callable:
+    """Bind `fn` to a copy of the caller's context so work handed to a thread pool
+    keeps counting towards the span that started it."""
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+
+def instrument_crew(crew, tracer: Optional[Tracer] = None):
+    """Record a span with wall time and LLM token usage for every task the crew finishes.
+
+    Tasks of a sequential crew run back to back, so each task span starts
+    where the previous one ended (or at instrumentation, just before kickoff).
+    Token counts are the growth of the crew's usage metrics during the task.
+    """
+    tracer = tracer or _tracer
+    state = {'mark': time.time_ns(), 'usage': {}}
+
+    def on_task_done(output):
+        now = time.time_ns()
+        usage = crew.calculate_usage_metrics().model_dump()
+        delta = {f"llm.{key}": value - state['usage'].get(key, 0) for key, value in usage.items()}
+        tracer.record_span(
+            f"task.{getattr(output, 'name', None) or 'unnamed'}",
+            state['mark'], now, counters=delta, agent=str(getattr(output, 'agent', '')).strip(),
+        )
+        state['mark'], state['usage'] = now, usage
+
+    for task in crew.tasks:
+        previous = task.callback
+
+        def callback(output, previous=previous):
+            on_task_done(output)
+            if previous:
+                previous(output)
+
+        task.callback = callback
+    return crew
@@ -0,0 +1,62 @@
+import multiprocessing
+import os
+import time
+
+from youtube.tools.artifact_cache import PDFArtifactCache
+
+
+def store_books(root, worker, count):
+    cache = PDFArtifactCache(root)
+    for number in range(count):
+        cache.store_pages(f"{worker:02d}{number:062d}", [f"Page of book {number}."])
+
+
+def test_processes_sharing_cache_keep_every_update(tmp_path):
+    root = str(tmp_path / "cache")
+    workers = [multiprocessing.Process(target=store_books, args=(root, worker, 20)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    manifest = PDFArtifactCache(root)._load()
+
+    assert len(manifest['objects']) == 80
+    assert not [name for name in (tmp_path / "cache").iterdir() if name.suffix == ".part"]
+
+
+def test_eviction_drops_least_recently_used_books(tmp_path):
+    cache = PDFArtifactCache(str(tmp_path / "cache"), max_bytes=1)
+    cache.store_pages("a" * 64, ["Old book."])
+    cache.store_pages("b" * 64, ["New book."])
+
+    assert list(cache._load()['objects']) == ["b" * 64]
+    assert not (tmp_path / "cache" / f"{'a' * 64}.txt").exists()
+    assert (tmp_path / "cache" / f"{'b' * 64}.txt").exists()
+
+
+def add_book(cache, url, digest, text):
+    cache.store_pages(digest, [text])
+    with cache._locked():
+        manifest = cache._load()
+        manifest['urls'][url] = {'digest': digest, 'checked_at': time.time()}
+        cache._save(manifest)
+
+
+def test_fresh_lookup_records_use_without_rewriting_manifest(tmp_path):
+    cache = PDFArtifactCache(str(tmp_path / "cache"))
+    add_book(cache, "https://example.com/old.pdf", "a" * 64, "Old book.")
+    add_book(cache, "https://example.com/used.pdf", "b" * 64, "Used book.")
+    # Room for two books
+    cache.max_bytes = sum(entry['size'] for entry in cache._load()['objects'].values())
+    manifest_mtime = os.stat(cache.manifest_path).st_mtime_ns
+
+    assert cache.lookup_fresh("https://example.com/old.pdf") == cache.text_path("a" * 64)
+    assert cache.lookup_fresh("https://example.com/missing.pdf") is None
+    assert os.stat(cache.manifest_path).st_mtime_ns == manifest_mtime
+
+    # The logged use keeps the older book ahead of the one stored after it
+    cache.store_pages("c" * 64, ["New book."])
+
+    assert sorted(cache._load()['objects']) == ["a" * 64, "c" * 64]
+    assert not os.path.exists(cache.uses_path)
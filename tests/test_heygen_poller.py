@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from youtube.tools import heygen_poller
+from youtube.tools.heygen_poller import HeyGenJobFailed, HeyGenJobPoller
+
+
+class NoLimit:
+    async def acquire_async(self, url):
+        pass
+
+
+class ScriptedPoller(HeyGenJobPoller):
+    """Answers status checks from `statuses` (per video_id) and records the keys used."""
+
+    def __init__(self, statuses, **options):
+        super().__init__(initial_delay=0.001, max_delay=0.001, **options)
+        self.statuses = statuses
+        self.keys = []
+        self._keys_lock = threading.Lock()
+
+    def _fetch_status(self, video_id, api_key=None):
+        with self._keys_lock:
+            self.keys.append((video_id, api_key))
+        status = self.statuses[video_id].pop(0)
+        return {'data': {'id': video_id, 'status': status}}
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    monkeypatch.setattr(heygen_poller, "get_rate_limiter", lambda: NoLimit())
+
+
+def test_polls_until_completed_with_callers_key():
+    poller = ScriptedPoller({'v1': ['processing', 'processing', 'completed'], 'v2': ['completed']})
+
+    first = poller.submit('v1', deadline=5, api_key='key-a')
+    second = poller.submit('v2', deadline=5, api_key='key-b')
+
+    assert first.result(5)['data']['poll_iterations'] == 3
+    assert second.result(5)['data']['status'] == 'completed'
+    assert sorted(set(poller.keys)) == [('v1', 'key-a'), ('v2', 'key-b')]
+    assert poller.status_requests == 4
+
+
+def test_failed_render_raises():
+    poller = ScriptedPoller({'v1': ['failed']})
+    with pytest.raises(HeyGenJobFailed) as failure:
+        poller.submit('v1', deadline=5).result(5)
+    assert failure.value.video_id == 'v1'
+
+
+def test_gives_up_after_deadline():
+    poller = ScriptedPoller({'v1': ['processing'] * 1000})
+    with pytest.raises(TimeoutError):
+        poller.submit('v1', deadline=0.05).result(5)
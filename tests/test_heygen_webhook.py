@@ -0,0 +1,45 @@
+from youtube.tools.heygen_webhook import FAIL_EVENT, SUCCESS_EVENT, WebhookReceiver, sign, verify_signature
+
+SECRET = "webhook-secret"
+BODY = b'{"event_type": "avatar_video.success", "event_data": {"video_id": "v1"}}'
+
+
+def test_signature_of_body_verifies():
+    signature = sign(BODY, SECRET)
+    assert verify_signature(BODY, signature, SECRET)
+    # Header values may be padded or upper case
+    assert verify_signature(BODY, f" {signature.upper()} ", SECRET)
+
+
+def test_tampered_or_missing_signature_is_rejected():
+    signature = sign(BODY, SECRET)
+    assert not verify_signature(BODY.replace(b"v1", b"v2"), signature, SECRET)
+    assert not verify_signature(BODY, sign(BODY, "other-secret"), SECRET)
+    assert not verify_signature(BODY, None, SECRET)
+    assert not verify_signature(BODY, "", SECRET)
+
+
+class RecordingPoller:
+    webhook = None
+
+    def __init__(self):
+        self.notified = []
+
+    def notify(self, video_id, status_data=None):
+        self.notified.append((video_id, status_data))
+
+
+def test_events_wake_their_job():
+    poller = RecordingPoller()
+    receiver = WebhookReceiver(poller, SECRET)
+
+    receiver.handle_event({'event_type': SUCCESS_EVENT, 'event_data': {'video_id': 'v1'}})
+    receiver.handle_event({'event_type': FAIL_EVENT, 'event_data': {'video_id': 'v2', 'msg': 'bad avatar'}})
+    receiver.handle_event({'event_type': 'avatar_video_gif.success', 'event_data': {'video_id': 'v3'}})
+    receiver.handle_event({'event_type': SUCCESS_EVENT, 'event_data': {}})
+
+    assert poller.notified == [
+        ('v1', None),
+        ('v2', {'data': {'id': 'v2', 'status': 'failed', 'error': 'bad avatar'}}),
+    ]
+    assert receiver.events_received == 2
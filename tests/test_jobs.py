@@ -0,0 +1,59 @@
+import time
+
+from youtube.jobs import STAGES, JobQueue
+
+
+def expire_lease(queue, job_id):
+    conn = queue._connect()
+    conn.execute("UPDATE jobs SET lease_expires = ? WHERE id = ?", (time.time() - 1, job_id))
+    conn.close()
+
+
+def test_claim_leases_oldest_pending_job(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    first = queue.enqueue("https://example.com/a.pdf", {"title": "A"})
+    queue.enqueue("https://example.com/b.pdf")
+
+    job = queue.claim("worker-1")
+
+    assert (job.id, job.pdf_url, job.inputs, job.stage, job.attempts) == (first, "https://example.com/a.pdf", {"title": "A"}, STAGES[0], 0)
+    assert queue.claim("worker-2").id != first
+
+
+def test_stage_progress_survives_reclaim(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.enqueue("https://example.com/a.pdf")
+    queue.claim("worker-1")
+    queue.start_stage(job_id, "ingest")
+    queue.complete_stage(job_id, "worker-1", "ingest", {"text_path": "/tmp/a.txt"})
+    expire_lease(queue, job_id)
+
+    job = queue.claim("worker-2")
+
+    assert (job.stage, job.state) == ("summarize", {"text_path": "/tmp/a.txt"})
+
+
+def test_expired_lease_takeover_counts_as_attempt(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.enqueue("https://example.com/a.pdf")
+    assert queue.claim("worker-1", max_attempts=2).attempts == 0
+    expire_lease(queue, job_id)
+    assert queue.claim("worker-2", max_attempts=2).attempts == 1
+    expire_lease(queue, job_id)
+
+    # A job that keeps losing its worker is failed instead of reclaimed forever
+    assert queue.claim("worker-3", max_attempts=2) is None
+    conn = queue._connect()
+    status, attempts = conn.execute("SELECT status, attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    conn.close()
+    assert (status, attempts) == ("failed", 2)
+
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = queue.enqueue("https://example.com/a.pdf")
+    queue.claim("worker-1")
+    assert queue.fail(job_id, "worker-1", "ingest", "boom", max_attempts=2) == "pending"
+    queue.claim("worker-1")
+    assert queue.fail(job_id, "worker-1", "ingest", "boom", max_attempts=2) == "failed"
+    assert queue.claim("worker-1") is None
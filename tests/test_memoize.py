@@ -0,0 +1,107 @@
+import os
+import time
+
+import pytest
+from crewai.tools import BaseTool
+
+from youtube.tools import memoize
+from youtube.tools.memoize import ToolResultCache, memoized
+
+
+@pytest.fixture(autouse=True)
+def tool_cache(tmp_path, monkeypatch):
+    cache = ToolResultCache(str(tmp_path / "tool_cache.sqlite3"))
+    monkeypatch.setattr(memoize, "_shared_cache", cache)
+    monkeypatch.delenv(memoize.ENABLED_ENV, raising=False)
+    return cache
+
+
+# Paths CountingTool really read; not a field, since fields are part of the key
+calls = []
+
+
+class CountingTool(BaseTool):
+    name: str = "Counting Tool"
+    description: str = "Reads a file and counts how often it was really run."
+    suffix: str = ""
+
+    @memoized(ttl=60, file_args=('path',))
+    def _run(self, path: str, upper: bool = False) -> str:
+        calls.append(path)
+        if not os.path.exists(path):
+            return f"Error: {path} not found"
+        with open(path) as f:
+            text = f.read() + self.suffix
+        return text.upper() if upper else text
+
+
+@pytest.fixture
+def tool():
+    calls.clear()
+    return CountingTool()
+
+
+def test_repeated_call_is_served_from_cache(tmp_path, tool):
+    path = tmp_path / "book.txt"
+    path.write_text("hello")
+
+    assert tool._run(str(path)) == "hello"
+    # Defaults are bound before hashing, so spelling them out is the same call
+    assert tool._run(str(path), upper=False) == "hello"
+    assert tool._run(path=str(path)) == "hello"
+
+    assert len(calls) == 1
+
+
+def test_arguments_settings_and_files_change_the_key(tmp_path, tool):
+    path = tmp_path / "book.txt"
+    path.write_text("hello")
+    tool._run(str(path))
+
+    assert tool._run(str(path), upper=True) == "HELLO"
+    tool.suffix = "!"
+    assert tool._run(str(path)) == "hello!"
+    path.write_text("hello again")
+    assert tool._run(str(path)) == "hello again!"
+
+    assert len(calls) == 4
+
+
+def test_errors_are_not_cached(tmp_path, tool):
+    path = tmp_path / "later.txt"
+    assert tool._run(str(path)).startswith("Error")
+    path.write_text("there now")
+
+    assert tool._run(str(path)) == "there now"
+    assert len(calls) == 2
+
+
+def test_disabled_by_environment(tmp_path, tool, monkeypatch):
+    path = tmp_path / "book.txt"
+    path.write_text("hello")
+    monkeypatch.setenv(memoize.ENABLED_ENV, "0")
+
+    tool._run(str(path))
+    tool._run(str(path))
+
+    assert len(calls) == 2
+
+
+def test_entries_expire_after_ttl(tool_cache):
+    tool_cache.set("key", "Tool", {"value": 1}, ttl=0.01)
+    assert tool_cache.get("key") == (True, {"value": 1})
+    time.sleep(0.02)
+    assert tool_cache.get("key") == (False, None)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ToolResultCache(str(tmp_path / "small.sqlite3"), max_bytes=25)
+    cache.set("old", "Tool", "x" * 10, ttl=None)
+    cache.set("used", "Tool", "y" * 10, ttl=None)
+    cache.get("old")
+
+    cache.set("new", "Tool", "z" * 10, ttl=None)
+
+    assert cache.get("used") == (False, None)
+    assert cache.get("old") == (True, "x" * 10)
+    assert cache.get("new") == (True, "z" * 10)
@@ -0,0 +1,91 @@
+import random
+
+import numpy as np
+
+from youtube.tools.near_duplicates import (
+    MAX_CANDIDATES,
+    NUM_PERM,
+    PAGE,
+    ROWS,
+    SEGMENT,
+    NearDuplicateIndex,
+    minhash,
+    shingles,
+    similarity,
+)
+
+WORDS = [f"word{i}" for i in range(5000)]
+
+
+def page(seed, words=300):
+    rnd = random.Random(seed)
+    return " ".join(rnd.choice(WORDS) for _ in range(words))
+
+
+def edit(text, changes, seed=0):
+    rnd = random.Random(seed)
+    words = text.split()
+    for i in rnd.sample(range(len(words)), changes):
+        words[i] = rnd.choice(WORDS)
+    return " ".join(words)
+
+
+def test_shingles_ignore_case_punctuation_and_unicode_form():
+    assert shingles("The Buyer, said: hello world again!") == shingles("the buyer said hello world again")
+    assert shingles("ﬁnal offer") == shingles("final offer")
+    assert shingles("two words") == {"two words"}
+    assert shingles("  ") == set()
+    assert minhash("...") is None
+
+
+def test_similarity_estimates_jaccard():
+    text = page(1)
+    assert similarity(minhash(text), minhash(text)) == 1.0
+    assert similarity(minhash(text), minhash(edit(text, 2))) > 0.8
+    assert similarity(minhash(text), minhash(page(2))) < 0.1
+
+
+def test_query_finds_near_duplicates_of_same_kind(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite3"))
+    text = page(1)
+    assert index.add(SEGMENT, "render-key", 0, minhash(text))
+    assert not index.add(SEGMENT, "render-key", 0, minhash(text))
+
+    matches = index.query(SEGMENT, minhash(edit(text, 2)))
+
+    assert [(match.source, match.position) for match in matches] == [("render-key", 0)]
+    assert index.query(PAGE, minhash(text)) == []
+    assert index.query(SEGMENT, minhash(page(2))) == []
+    assert index.query(SEGMENT, minhash(text), exclude_source="render-key") == []
+
+
+def test_index_pages_counts_pages_repeated_from_other_books(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite3"))
+    first = [page(1), page(2), page(3)]
+    second = [edit(first[0], 2), page(4), first[2], ""]
+
+    assert index.index_pages("digest-1", first) == 0
+    assert index.index_pages("digest-2", second) == 2
+    # A book already indexed is left alone
+    assert index.index_pages("digest-1", first) is None
+    assert len(index) == 6
+
+
+def test_query_keeps_best_match_among_many_candidates(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite3"))
+    rng = np.random.default_rng(0)
+    probe = rng.integers(0, 2**32, size=NUM_PERM, dtype=np.uint32)
+    # More candidates than a query looks at in every band the match below is found by,
+    # each sharing three bands with the probe
+    decoys = rng.integers(0, 2**32, size=(2 * MAX_CANDIDATES, NUM_PERM), dtype=np.uint32)
+    decoys[:MAX_CANDIDATES, :3 * ROWS] = probe[:3 * ROWS]
+    decoys[MAX_CANDIDATES:, 3 * ROWS:6 * ROWS] = probe[3 * ROWS:6 * ROWS]
+    index.add_many(PAGE, [(f"decoy-{i}", 1, row) for i, row in enumerate(decoys)])
+    # The real near-duplicate shares all six of those bands; one value is changed in each of the others
+    near = probe.copy()
+    near[6 * ROWS::ROWS] += 1
+    index.add(PAGE, "original", 7, near)
+
+    matches = index.query(PAGE, probe)
+
+    assert [(match.source, match.position) for match in matches] == [("original", 7)]
@@ -0,0 +1,48 @@
+import os
+import threading
+import time
+
+from youtube.tools.page_store import PageStore, write_pages
+
+PAGES = [f"Page {number} of the book. " * 20 for number in range(1, 41)]
+
+
+def slow_pages(started):
+    started.wait()
+    for text in PAGES:
+        time.sleep(0.001)
+        yield text
+
+
+def test_concurrent_writers_of_one_book(tmp_path):
+    text_path = str(tmp_path / "book.txt")
+    started = threading.Event()
+    errors = []
+
+    def write():
+        try:
+            write_pages(slow_pages(started), text_path)
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write) for _ in range(2)]
+    for writer in writers:
+        writer.start()
+    started.set()
+    for writer in writers:
+        writer.join()
+
+    assert errors == []
+    with open(text_path, encoding='utf-8') as f:
+        assert f.read() == "".join(PAGES)
+    assert [record.text for record in PageStore.for_text(text_path).pages()] == PAGES
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+def test_page_store_reads_pages_and_character_ranges(tmp_path):
+    text_path = write_pages(["One. ", "Two. ", "Three."], str(tmp_path / "book.txt"))
+    store = PageStore.for_text(text_path)
+
+    assert len(store) == 3
+    assert store.page(2).text == "Two. "
+    assert store.read_chars(3, 8) == ". Two"
@@ -0,0 +1,75 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from common import make_pdf
+
+from youtube.tools import pdf_extraction
+from youtube.tools.pdf_extraction import SERIAL_PAGE_THRESHOLD, iter_page_texts, split_page_range
+
+
+def write_pdf(tmp_path, pages):
+    path = tmp_path / f"book_{pages}.pdf"
+    path.write_bytes(make_pdf(pages, lines_per_page=2))
+    return str(path)
+
+
+def page_numbers(texts):
+    return [int(text.split(".", 1)[0].split()[-1]) for text in texts]
+
+
+@pytest.mark.parametrize("page_count, parts, expected", [
+    (10, 3, [(0, 4), (4, 7), (7, 10)]),
+    (9, 3, [(0, 3), (3, 6), (6, 9)]),
+    # Fewer pages than ranges: one page each, no empty ranges
+    (2, 8, [(0, 1), (1, 2)]),
+    (5, 1, [(0, 5)]),
+    (5, 0, [(0, 5)]),
+    (0, 4, []),
+])
+def test_split_page_range(page_count, parts, expected):
+    assert split_page_range(page_count, parts) == expected
+
+
+class CountingPool(ProcessPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        type(self).submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+@pytest.fixture
+def counting_pool(monkeypatch):
+    CountingPool.submitted = 0
+    monkeypatch.setattr(pdf_extraction, "ProcessPoolExecutor", CountingPool)
+    return CountingPool
+
+
+def test_parallel_extraction_keeps_page_order(tmp_path, counting_pool):
+    path = write_pdf(tmp_path, SERIAL_PAGE_THRESHOLD + 6)
+
+    parallel = list(iter_page_texts(path, workers=3))
+
+    assert counting_pool.submitted == 3 * pdf_extraction.RANGES_PER_WORKER
+    assert page_numbers(parallel) == list(range(1, SERIAL_PAGE_THRESHOLD + 7))
+    assert parallel == list(iter_page_texts(path, workers=1))
+
+
+def test_short_books_are_extracted_serially(tmp_path, counting_pool):
+    path = write_pdf(tmp_path, SERIAL_PAGE_THRESHOLD - 1)
+
+    texts = list(iter_page_texts(path, workers=4))
+
+    assert counting_pool.submitted == 0
+    assert page_numbers(texts) == list(range(1, SERIAL_PAGE_THRESHOLD))
+
+
+def test_slow_consumer_holds_workers_back(tmp_path, counting_pool):
+    path = write_pdf(tmp_path, SERIAL_PAGE_THRESHOLD + 6)
+    pages = iter_page_texts(path, workers=2)
+
+    assert page_numbers([next(pages)]) == [1]
+    # The two ranges in flight plus the one submitted when the first came back
+    assert counting_pool.submitted == 3
+    pages.close()
+    assert counting_pool.submitted == 3
@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+import threading
+
+from youtube.settings import HeyGenSettings
+from youtube.tools.render_cache import RenderCache, render_key, render_profile_key
+
+
+def render(tmp_path, name, size=10):
+    path = tmp_path / f"{name}.mp4"
+    path.write_bytes(b"v" * size)
+    return str(path)
+
+
+def test_render_key_ignores_whitespace_but_not_profile():
+    settings = HeyGenSettings()
+    key = render_key("Qualify  early.\n", settings)
+    assert key == render_key("Qualify early.", settings)
+    assert key != render_key("Qualify late.", settings)
+    assert key != render_key("Qualify early.", settings.model_copy(update={'voice_speed': 1.2}))
+    # The API key does not change what a render looks like
+    assert render_profile_key(settings) == render_profile_key(settings.model_copy(update={'api_key': 'secret'}))
+
+
+def test_lookup_returns_stored_render(tmp_path):
+    cache = RenderCache(str(tmp_path / "renders"))
+    cache.store("k1", render(tmp_path, "one"), "", "video-1", "sha", text="Qualify early.")
+
+    entry = cache.lookup("k1")
+
+    assert (entry['video_id'], entry['text']) == ("video-1", "Qualify early.")
+    assert cache.lookup("missing") is None
+    cache.materialize("k1", str(tmp_path / "out" / "one.mp4"), str(tmp_path / "out" / "one.jpg"))
+    assert (tmp_path / "out" / "one.mp4").read_bytes() == b"v" * 10
+
+
+def test_lookup_records_use_without_rewriting_manifest(tmp_path):
+    cache = RenderCache(str(tmp_path / "renders"))
+    cache.store("k1", render(tmp_path, "one"), "", "video-1", "sha")
+    manifest_mtime = os.stat(cache.manifest_path).st_mtime_ns
+
+    cache.lookup("k1")
+    cache.lookup("k1")
+
+    assert os.stat(cache.manifest_path).st_mtime_ns == manifest_mtime
+    assert cache.entries()["k1"]['hits'] == 2
+
+
+def test_eviction_keeps_recently_used_renders(tmp_path):
+    cache = RenderCache(str(tmp_path / "renders"), max_bytes=25)
+    cache.store("old", render(tmp_path, "old"), "", "video-old", "sha")
+    cache.store("used", render(tmp_path, "used"), "", "video-used", "sha")
+    cache.lookup("old")
+
+    cache.store("new", render(tmp_path, "new"), "", "video-new", "sha")
+
+    assert sorted(cache.entries()) == ["new", "old"]
+    assert cache.lookup("used") is None
+
+
+def store_renders(root, source, worker, count):
+    cache = RenderCache(root)
+    for number in range(count):
+        cache.store(f"{worker}-{number}", source, "", f"video-{worker}-{number}", "sha")
+        cache.lookup(f"{worker}-{number}")
+
+
+def test_processes_sharing_cache_keep_every_update(tmp_path):
+    root = str(tmp_path / "renders")
+    source = render(tmp_path, "source")
+    workers = [multiprocessing.Process(target=store_renders, args=(root, source, worker, 20)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    entries = RenderCache(root).entries()
+
+    assert len(entries) == 80
+    assert all(entry['hits'] == 1 for entry in entries.values())
+
+
+def test_concurrent_materialize_of_one_render(tmp_path):
+    cache = RenderCache(str(tmp_path / "renders"))
+    cache.store("k1", render(tmp_path, "one", size=1 << 20), "", "video-1", "sha")
+    target = tmp_path / "out" / "one.mp4"
+    errors = []
+
+    def materialize():
+        try:
+            for _ in range(50):
+                cache.materialize("k1", str(target), str(tmp_path / "out" / "one.jpg"))
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=materialize) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert target.read_bytes() == b"v" * (1 << 20)
+    assert [path.name for path in target.parent.iterdir()] == ["one.mp4"]
@@ -0,0 +1,45 @@
+import pytest
+
+from youtube.tools.script_segmenter import iter_segments, segment_text, split_sentences, take_chars
+
+TEXT = (
+    "The buyer said hello world. Next, the conversation moves to pricing! "
+    "Why does the deal stall?  Procurement wants a \"final offer.\" "
+    "(Everyone agrees.) The rest is follow-up."
+)
+
+
+def test_split_sentences_normalizes_whitespace():
+    assert split_sentences("One.\n\nTwo  words!  Three?") == ["One.", "Two words!", "Three?"]
+
+
+@pytest.mark.parametrize("max_chars", [30, 60, 5000])
+@pytest.mark.parametrize("breaks", [
+    [21],  # mid-sentence, at the space before "world"
+    [22],  # mid-sentence, after the space
+    [40],  # mid-word, inside "conversation"
+    [27, 28],  # around a sentence end
+    [5, 40, 41, 90, 120],
+])
+def test_pages_segment_like_joined_text(breaks, max_chars):
+    pages = [TEXT[start:end] for start, end in zip([0, *breaks], [*breaks, len(TEXT)])]
+    assert list(iter_segments(pages, max_chars=max_chars)) == segment_text("".join(pages), max_chars=max_chars)
+
+
+def test_long_sentence_across_pages_keeps_word_breaks():
+    words = " ".join(f"word{i}" for i in range(100)) + "."
+    pages = [words[:101], words[101:333], words[333:]]
+    segments = list(iter_segments(pages, max_chars=50))
+    assert segments == segment_text(words, max_chars=50)
+    assert all(len(segment) <= 50 for segment in segments)
+    assert " ".join(segments) == words
+
+
+def test_segments_pack_sentences_up_to_limit():
+    segments = segment_text(TEXT, max_chars=60)
+    assert all(len(segment) <= 60 for segment in segments)
+    assert " ".join(segments) == " ".join(split_sentences(TEXT))
+
+
+def test_take_chars_stops_at_limit():
+    assert "".join(take_chars(["abc", "def", "ghi"], 5)) == "abcde"
@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+from youtube.settings import HeyGenSettings, SettingsError, SettingsFile
+
+
+def write(path, text):
+    path.write_text(text)
+    # Make every rewrite visible to the mtime/size check, however fast the test runs
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_missing_file_gives_defaults(tmp_path):
+    settings = SettingsFile(str(tmp_path / "missing.json"), HeyGenSettings, 'HEYGEN_').get()
+    assert settings == HeyGenSettings()
+
+
+def test_json_and_yaml_files(tmp_path):
+    json_path, yaml_path = tmp_path / "heygen.json", tmp_path / "heygen.yaml"
+    write(json_path, json.dumps({'voice_speed': 1.25, 'caption': False}))
+    write(yaml_path, "voice_speed: 1.25\ncaption: false\n")
+
+    from_json = SettingsFile(str(json_path), HeyGenSettings).get()
+    from_yaml = SettingsFile(str(yaml_path), HeyGenSettings).get()
+
+    assert from_json == from_yaml
+    assert (from_json.voice_speed, from_json.caption) == (1.25, False)
+
+
+def test_environment_overrides_file(tmp_path, monkeypatch):
+    path = tmp_path / "heygen.json"
+    write(path, json.dumps({'api_key': 'from-file', 'width': 640}))
+    monkeypatch.setenv('HEYGEN_API_KEY', 'from-env')
+    monkeypatch.setenv('HEYGEN_WIDTH', '1920')
+
+    settings = SettingsFile(str(path), HeyGenSettings, 'HEYGEN_').get()
+
+    assert (settings.api_key, settings.width) == ('from-env', 1920)
+
+
+def test_reloads_only_when_file_changes(tmp_path):
+    path = tmp_path / "heygen.json"
+    write(path, json.dumps({'voice_speed': 1.1}))
+    settings_file = SettingsFile(str(path), HeyGenSettings)
+
+    first = settings_file.get()
+    assert settings_file.get() is first
+
+    write(path, json.dumps({'voice_speed': 1.3}))
+    assert settings_file.get().voice_speed == 1.3
+
+
+@pytest.mark.parametrize("text", [
+    "{not json",
+    "[1, 2]",
+    json.dumps({'voice_speed': 0}),
+    json.dumps({'background_color': 'green'}),
+    json.dumps({'unknown_field': 1}),
+])
+def test_invalid_settings_raise_settings_error(tmp_path, text):
+    path = tmp_path / "heygen.json"
+    write(path, text)
+    with pytest.raises(SettingsError):
+        SettingsFile(str(path), HeyGenSettings).get()
+
+
+def test_settings_are_frozen():
+    with pytest.raises(Exception):
+        HeyGenSettings().voice_speed = 2.0
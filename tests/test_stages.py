@@ -0,0 +1,66 @@
+import pytest
+
+from youtube.jobs import Job
+from youtube.stages import PipelineStages
+from youtube.tools.heygen_poller import HeyGenJobFailed
+
+
+class FakeGenerator:
+    """Renders segments instantly; video_ids listed in `failing` fail once."""
+
+    max_concurrency = 2
+
+    def __init__(self, segments, tmp_path, failing=()):
+        self.segments = segments
+        self.tmp_path = tmp_path
+        self.failing = set(failing)
+        self.submitted = []
+        self.fetched = []
+
+    def read_segments(self, path):
+        return self.segments
+
+    def render_key(self, text):
+        return f"key:{text}"
+
+    def cached_segment(self, index, key, text=None):
+        return None
+
+    def submit_segment(self, text):
+        video_id = f"video-{len(self.submitted)}"
+        self.submitted.append(text)
+        return video_id
+
+    def fetch_segment(self, index, video_id, cache_key=None, text=''):
+        self.fetched.append((video_id, cache_key, text))
+        if video_id in self.failing:
+            self.failing.discard(video_id)
+            raise HeyGenJobFailed(video_id, {'data': {'status': 'failed'}})
+        path = self.tmp_path / f"{video_id}.mp4"
+        path.write_bytes(b"video")
+        return {'data': {'video_id': video_id, 'local_video_path': str(path), 'local_thumbnail_path': ''}}
+
+
+def job(state, stage):
+    return Job(id=1, pdf_url="https://example.com/a.pdf", inputs={}, state=state, stage=stage, attempts=0)
+
+
+def test_failed_render_is_resubmitted_on_retry(tmp_path):
+    generator = FakeGenerator(["One.", "Two.", "Three."], tmp_path, failing={"video-1"})
+    stages = PipelineStages(video_generator=generator)
+    saved = []
+    state = stages.render(job({'text_path': 'book.txt'}, 'render'), saved.append)
+
+    with pytest.raises(HeyGenJobFailed):
+        stages.download(job(state, 'download'), saved.append)
+    state = saved[-1]
+    assert state['video_ids'] == ["video-0", None, "video-2"]
+
+    state = stages.download(job(state, 'download'), saved.append)
+
+    assert generator.submitted == ["One.", "Two.", "Three.", "Two."]
+    assert state['video_ids'] == ["video-0", "video-3", "video-2"]
+    assert [segment['video_id'] for segment in state['segments']] == state['video_ids']
+    # Downloads carry each segment's text and key; finished ones are not fetched again
+    assert generator.fetched[-1] == ("video-3", "key:Two.", "Two.")
+    assert [video_id for video_id, _, _ in generator.fetched].count("video-0") == 1
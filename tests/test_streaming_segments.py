@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from youtube.tools.custom_tool import HeyGenVideoGeneratorTool
+from youtube.tools.page_store import write_pages
+
+PAGES = [
+    "Chapter one. The buyer said hello ",
+    "world and asked about pricing. Every conver",
+    "sation starts with a question! Qualify early.\n\n",
+    "Procurement wants a \"final offer.\" (Everyone agrees.)",
+    " Straße und Café: the deal closes in Zürich. " * 12,
+]
+
+
+@pytest.fixture
+def generator(tmp_path):
+    settings_path = tmp_path / "heygen_settings.json"
+    settings_path.write_text(json.dumps({}))
+    return HeyGenVideoGeneratorTool(
+        settings_path=str(settings_path),
+        render_cache_dir=str(tmp_path / "renders"),
+        near_duplicate_index_path=str(tmp_path / "near_duplicates.sqlite3"),
+        segment_chars=120,
+    )
+
+
+@pytest.mark.parametrize("max_script_chars", [None, 50, 300])
+def test_streamed_pages_render_like_text_file(tmp_path, generator, max_script_chars):
+    generator.max_script_chars = max_script_chars
+    text_path = write_pages(PAGES, str(tmp_path / "book.txt"))
+
+    direct = generator.read_segments(text_path)
+    streamed = list(generator.stream_segments(PAGES))
+
+    assert streamed == direct
+    assert [generator.render_key(text) for text in streamed] == [generator.render_key(text) for text in direct]
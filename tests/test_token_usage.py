@@ -0,0 +1,58 @@
+from youtube import tracing
+from youtube.jobs import STAGES
+from youtube.pipeline import run_direct
+from youtube.tools.memoize import ToolResultCache
+from youtube.tools.page_store import iter_page_records
+from youtube.tools.summarizer import ScriptSummarizer
+
+
+class CountingCompletion:
+    """Answers every prompt and reports 10 prompt and 2 completion tokens per call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, prompt):
+        self.calls += 1
+        return f"Summary {self.calls}."
+
+    def token_usage(self):
+        return {'prompt_tokens': 10 * self.calls, 'completion_tokens': 2 * self.calls, 'total_tokens': 12 * self.calls}
+
+
+def test_summary_reports_its_tokens(tmp_path):
+    completion = CountingCompletion()
+    completion("warm-up call before this summary")
+    summarizer = ScriptSummarizer(completion, chunk_tokens=50, cache=ToolResultCache(str(tmp_path / "cache.sqlite3")))
+    pages = iter_page_records([f"Page {number}. " + "Qualify early. " * 20 for number in range(6)])
+
+    with tracing.span("test.summarize") as span:
+        summarizer.summarize_pages(pages, episode_minutes=1)
+
+    calls = completion.calls - 1
+    assert calls > 2
+    assert summarizer.token_usage == {'prompt_tokens': 10 * calls, 'completion_tokens': 2 * calls, 'total_tokens': 12 * calls}
+    assert span.counters['llm.total_tokens'] == 12 * calls
+
+
+def test_run_direct_adds_summary_tokens_to_describe_tokens(tmp_path):
+    text_path = tmp_path / "book.txt"
+    text_path.write_text("A short book.")
+
+    def stage(name):
+        def run(job, save):
+            if name == 'summarize':
+                tracing.add('llm.calls', 3)
+                tracing.add('llm.prompt_tokens', 300)
+                tracing.add('llm.total_tokens', 360)
+            return {**job.state, 'text_path': str(text_path), name: True}
+        return run
+
+    def describe(excerpt):
+        return {'title': 'Episode', 'token_usage': {'prompt_tokens': 50, 'total_tokens': 70}}
+
+    result = run_direct({'pdf_url': 'book.pdf'}, describe=describe, log=lambda message: None,
+                        stages={name: stage(name) for name in STAGES})
+
+    assert result['token_usage'] == {'prompt_tokens': 350, 'total_tokens': 430}
+    assert result['inputs']['title'] == 'Episode'
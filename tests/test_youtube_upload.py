@@ -0,0 +1,88 @@
+import pytest
+
+from youtube.tools import youtube_upload
+from youtube.tools.youtube_upload import CHUNK_GRANULARITY, ResumableUploader, UploadError
+
+
+class Response:
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+        self.text = str(body)
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+
+class ScriptedSession:
+    """Starts every upload and answers chunk PUTs with `answer(content_range)`."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.ranges = []
+
+    def post(self, url, **kwargs):
+        return Response(200, {'Location': 'https://upload.example.com/session'})
+
+    def put(self, url, headers, data=None):
+        self.ranges.append(headers['Content-Range'])
+        return self.answer(headers['Content-Range'])
+
+
+@pytest.fixture
+def uploader(tmp_path):
+    return ResumableUploader("token", str(tmp_path / "sessions"), chunk_size=CHUNK_GRANULARITY)
+
+
+def video(tmp_path, size):
+    path = tmp_path / "episode.mp4"
+    path.write_bytes(b"v" * size)
+    return str(path)
+
+
+def test_uploads_in_chunks_from_acknowledged_offset(tmp_path, uploader, monkeypatch):
+    def answer(content_range):
+        end = int(content_range.split('-')[1].split('/')[0])
+        if end + 1 == 2 * CHUNK_GRANULARITY + 10:
+            return Response(200, body={'id': 'video-1'})
+        return Response(308, {'Range': f"bytes=0-{end}"})
+
+    session = ScriptedSession(answer)
+    monkeypatch.setattr(youtube_upload, "get_session", lambda: session)
+
+    assert uploader.upload_video(video(tmp_path, 2 * CHUNK_GRANULARITY + 10), {'snippet': {}})['id'] == 'video-1'
+    assert session.ranges == [
+        f"bytes 0-{CHUNK_GRANULARITY - 1}/{2 * CHUNK_GRANULARITY + 10}",
+        f"bytes {CHUNK_GRANULARITY}-{2 * CHUNK_GRANULARITY - 1}/{2 * CHUNK_GRANULARITY + 10}",
+        f"bytes {2 * CHUNK_GRANULARITY}-{2 * CHUNK_GRANULARITY + 9}/{2 * CHUNK_GRANULARITY + 10}",
+    ]
+
+
+def test_repeated_range_raises_instead_of_looping(tmp_path, uploader, monkeypatch):
+    session = ScriptedSession(lambda content_range: Response(308, {'Range': "bytes=0-99"}))
+    monkeypatch.setattr(youtube_upload, "get_session", lambda: session)
+
+    with pytest.raises(UploadError, match="no progress"):
+        uploader.upload_video(video(tmp_path, 2 * CHUNK_GRANULARITY), {'snippet': {}})
+    assert len(session.ranges) == 2
+
+
+def test_range_past_end_of_file_raises(tmp_path, uploader, monkeypatch):
+    size = CHUNK_GRANULARITY + 10
+    session = ScriptedSession(lambda content_range: Response(308, {'Range': f"bytes=0-{size - 1}"}))
+    monkeypatch.setattr(youtube_upload, "get_session", lambda: session)
+
+    with pytest.raises(UploadError, match=f"byte {size}"):
+        uploader.upload_video(video(tmp_path, size), {'snippet': {}})
+
+
+def test_empty_file_is_rejected_before_starting_a_session(tmp_path, uploader, monkeypatch):
+    session = ScriptedSession(lambda content_range: pytest.fail("no chunk should be sent"))
+    monkeypatch.setattr(youtube_upload, "get_session", lambda: session)
+
+    with pytest.raises(UploadError, match="empty"):
+        uploader.upload_video(video(tmp_path, 0), {'snippet': {}})